@@ -0,0 +1,129 @@
+"""월별 분석용 집계 큐브 (연 × 월 × 요일 × 날짜유형)
+
+월별 페이지는 매 실행마다 일별 데이터를 groupby하고, 공휴일 열을
+문자열로 훑어 추석/설날 여부를 찾았다. 이 모듈은 칸별 합계·개수·명절
+일수를 데이터 버전마다 한 번만 계산해 두고, 페이지는 큐브를 잘라
+다시 합치기만 한다 (일 수가 아니라 연 × 12 × 칸 수에 비례).
+
+데이터에 날짜가 뒤에 추가된 경우에는 이전에 반영한 행의 지문이 같은지
+확인한 뒤 새 행만 집계해 더한다. 기존 행이 바뀌었으면 전체를 다시 만든다.
+큐브는 data/cache/<파일명>/cube.pkl에 저장해 프로세스 재시작 후에도 쓴다.
+"""
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from calendar_table import DAY_TYPES, day_type
+from columnar_cache import cache_dir_for, pickle_cache
+from data_store import DATA_PATH, SUPPLY_COLUMNS, dataset_version, get_daily
+
+CUBE_KEYS = ['연', '월', '요일코드', '날짜유형']
+CUBE_FILE = "cube.pkl"
+
+
+@dataclass
+class CubeState:
+    """큐브와 반영한 행 범위 (증분 갱신 확인용)"""
+    cube: pd.DataFrame
+    through: pd.Timestamp  # 반영한 마지막 날짜
+    rows: int              # 반영한 행 수
+    fingerprint: str       # 반영한 행 내용의 해시
+
+
+def _fingerprint(rows):
+    """날짜·기온·공급량 값의 해시"""
+    digest = hashlib.sha256()
+    digest.update(rows['날짜'].to_numpy().astype('datetime64[D]').tobytes())
+    digest.update(rows[['평균기온'] + SUPPLY_COLUMNS].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()
+
+
+def build_cube(rows):
+    """일별 행 → 칸별 합계/개수 (평균은 합계/개수로 나중에 계산)"""
+    holiday = rows['공휴일'].astype(object).fillna("").astype(str)
+    frame = pd.DataFrame({
+        '연': rows['연'].to_numpy(),
+        '월': rows['월'].to_numpy(),
+        '요일코드': rows['요일코드'].to_numpy(),
+        '날짜유형': day_type(rows),
+        '일수': 1,
+        '기온일수': rows['평균기온'].notna().to_numpy(dtype='int64'),
+        '기온합계': rows['평균기온'].to_numpy(dtype='float64'),
+        '공급량(M3)': rows['공급량(M3)'].to_numpy(dtype='float64'),
+        '공급량(MJ)': rows['공급량(MJ)'].to_numpy(dtype='float64'),
+        '추석일수': holiday.str.contains('추석').to_numpy(dtype='int64'),
+        '설날일수': holiday.str.contains('설날').to_numpy(dtype='int64'),
+    })
+    return _sum_cells(frame)
+
+
+def _sum_cells(frame):
+    # NaN은 0으로 더해진다 (기존 groupby().sum()과 같은 동작)
+    cube = frame.groupby(CUBE_KEYS, sort=True).sum(min_count=0).reset_index()
+    cube['날짜유형'] = pd.Categorical(cube['날짜유형'], categories=DAY_TYPES)
+    return cube
+
+
+def _merge(cube, addition):
+    """두 큐브를 칸별로 더함"""
+    both = pd.concat([cube, addition], ignore_index=True)
+    both['날짜유형'] = both['날짜유형'].astype(str)
+    return _sum_cells(both)
+
+
+_cache = pickle_cache()
+
+
+def update_cube(data, state=None):
+    """일별 데이터 → 새 CubeState (state에 반영한 행이 그대로면 뒤에 추가된 행만 집계)"""
+    dates = data['날짜']
+    cube = None
+    if state is not None:
+        old = data[dates <= state.through]
+        if len(old) == state.rows and _fingerprint(old) == state.fingerprint:
+            cube = _merge(state.cube, build_cube(data[dates > state.through]))
+    if cube is None:
+        cube = build_cube(data)
+    return CubeState(cube=cube, through=dates.max(), rows=len(data), fingerprint=_fingerprint(data))
+
+
+def get_cube(path=DATA_PATH):
+    """데이터 버전별 집계 큐브 (새 날짜만 추가된 경우 증분 갱신)"""
+    state = _cache.get(
+        cache_dir_for(path) / CUBE_FILE, dataset_version(path),
+        lambda previous: update_cube(get_daily(path), previous),
+    )
+    return state.cube
+
+
+def _slice(cube, years=None, months=None):
+    mask = np.ones(len(cube), dtype=bool)
+    if years is not None:
+        mask &= cube['연'].isin(years).to_numpy()
+    if months is not None:
+        mask &= cube['월'].isin(months).to_numpy()
+    return cube[mask]
+
+
+def _finish(grouped):
+    """합계 → 평균기온/명절 라벨 컬럼"""
+    out = pd.DataFrame({
+        '평균기온': grouped['기온합계'] / grouped['기온일수'].where(grouped['기온일수'] > 0),
+        '공급량_M3': grouped['공급량(M3)'],
+        '공급량_MJ': grouped['공급량(MJ)'],
+        '일수': grouped['일수'],
+        '공휴일': np.where(grouped['추석일수'] > 0, '추석', np.where(grouped['설날일수'] > 0, '설날', '')),
+    }, index=grouped.index)
+    return out.reset_index()
+
+
+def monthly_summary(cube, years=None, months=None):
+    """연/월별 평균기온, 공급량 합계, 일수, 명절(추석 우선, 다음 설날) 라벨"""
+    return _finish(_slice(cube, years, months).groupby(['연', '월']).sum(numeric_only=True))
+
+
+def yearly_summary(cube, years=None, months=None):
+    """연도별 평균기온, 공급량 합계, 일수, 명절 라벨"""
+    return _finish(_slice(cube, years, months).groupby('연').sum(numeric_only=True))
@@ -0,0 +1,226 @@
+"""공급량 모델 백테스트 (rolling-origin 교차검증)
+
+매월 1일을 예측 기준일(origin)로 두고, 기준일 이전 lookback년 데이터로
+모든 모델을 학습해 그 달 한 달을 예측한다. 기준일 × 학습 조건(필터)
+하나가 fold 하나이며, fold들은 프로세스 풀에서 동시에 실행된다.
+
+fold 결과는 학습/검증 행 내용의 해시를 키로 모델 저장소에 캐시하므로
+데이터가 하루 늘어나도 마지막 달 fold만 다시 계산된다.
+
+입력은 features의 피처 묶음 중 하나('기온': 평균기온만, '기온+달력': 운영 모델과
+같은 입력(기본), '확장': 시차 기온/HDD/달력, '확장+전일공급량': 확장 + 전날 공급량)이며,
+모든 fold가 데이터 버전별로 캐시된 같은 피처 행렬을 잘라 쓴다.
+fold 모델은 운영 모델과 같은 경로로 만든다: 다항회귀는 운영과 같은 설계행렬(첫 피처인
+평균기온만 3차, 나머지는 선형)을 최소제곱으로 풀고, 나머지 모델은 supply_models._fit으로
+표준화 없이 학습한다.
+전날 공급량은 검증 달 안에서도 실제값을 쓰므로 그 묶음(DAY_AHEAD_SETS)의 결과는
+한 달 앞이 아니라 하루 앞 예측 오차이며, 오차표의 '예측범위' 컬럼에 따로 표시한다.
+
+사용 예)
+    python backtest.py                  # 최근 12개월, 기본 필터 전체
+    python backtest.py --folds 24 --lookback 2
+    python backtest.py --features 확장
+    python backtest.py --features 확장+전일공급량   # 하루 앞 예측
+"""
+import argparse
+import hashlib
+
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib import Parallel, delayed
+
+from calendar_table import DAY_TYPES, WEEKDAY_NAMES, day_type
+from data_quality import valid_rows
+from features import DAY_AHEAD_SETS, FEATURE_SETS, INPUT_FEATURES, get_feature_matrix, input_features
+from model_registry import get_registry, make_key
+from online_models import fit_design, supply_design
+from supply_models import MODEL_FACTORIES, N_JOBS, ONLINE_MODELS, TARGETS, _fit, model_params
+
+DEFAULT_FOLDS = 12
+DEFAULT_LOOKBACK = 3
+DEFAULT_FEATURE_SET = '기온+달력'
+# 학습·검증에 함께 적용하는 조건 (이름 → 월/요일)
+FILTERS = {
+    '전체': {'months': list(range(1, 13)), 'days': list(WEEKDAY_NAMES)},
+    '동절기(11~3월)': {'months': [11, 12, 1, 2, 3], 'days': list(WEEKDAY_NAMES)},
+    '평일': {'months': list(range(1, 13)), 'days': WEEKDAY_NAMES[:5]},
+}
+
+
+def horizon(feature_set):
+    """피처 묶음의 예측 범위 라벨 (검증 달 안의 실제 공급량을 쓰면 하루 앞)"""
+    return '1일 앞' if feature_set in DAY_AHEAD_SETS else '1개월 앞'
+
+
+def fold_origins(data, n_folds=DEFAULT_FOLDS):
+    """공급량이 있는 마지막 달까지 최근 n_folds개 월의 1일"""
+    last = valid_rows(data).dropna(subset=list(TARGETS.values()))['날짜'].max()
+    return list(pd.date_range(end=last.to_period('M').to_timestamp(), periods=n_folds, freq='MS'))
+
+
+def fold_rows(data, origin, model_filter, lookback=DEFAULT_LOOKBACK, matrix=None, columns=None):
+    """기준일 기준 (학습 행, 검증 행) 선택 (품질 검사를 통과하고 피처/공급량이 모두 있는 행만)
+
+    반환 행에는 피처 행렬에서 자른 columns 값이 같은 이름의 컬럼으로 붙는다.
+    운영 모델 입력(INPUT_FEATURES)에 있는 컬럼은 운영과 같은 값이 되도록 float32 행렬 대신
+    input_features로 다시 만든다 (KNN 등이 기온 반올림 오차로 달라지지 않게).
+    """
+    matrix = matrix or get_feature_matrix()
+    columns = columns or FEATURE_SETS[DEFAULT_FEATURE_SET]
+    data = valid_rows(data)
+    rows = data[data['월'].isin(model_filter['months']) & data['요일'].isin(model_filter['days'])]
+    X = matrix.take(rows['날짜'], columns)
+    values = {col: X[:, i].astype('float64') for i, col in enumerate(columns)}
+    inputs = input_features(rows['날짜'], rows['평균기온'])
+    values.update({col: inputs[col].to_numpy(dtype='float64') for col in columns if col in INPUT_FEATURES})
+    rows = rows.assign(**values)
+    rows = rows[np.isfinite(X).all(axis=1)].dropna(subset=list(TARGETS.values()))
+    dates = rows['날짜']
+    train = rows[(dates >= origin - pd.DateOffset(years=lookback)) & (dates < origin)]
+    test = rows[(dates >= origin) & (dates < origin + pd.offsets.MonthBegin(1))]
+    return train, test
+
+
+def _fingerprint(columns, *frames):
+    """fold 입력 행 내용의 해시 (날짜·피처·공급량)"""
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(frame['날짜'].to_numpy().astype('datetime64[D]').tobytes())
+        digest.update(frame[columns + list(TARGETS.values())].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()
+
+
+def fold_key(train, test, columns):
+    return make_key(
+        kind='backtest_fold',
+        rows=_fingerprint(columns, train, test),
+        features=columns,
+        params=model_params(),
+        online=ONLINE_MODELS,
+        design=supply_design.__name__,
+        sklearn=sklearn.__version__,
+    )
+
+
+def fold_models(X_train, y_train):
+    """fold 학습 행(피처 데이터프레임, 단위별 공급량 배열)으로 운영과 같은 구성의 모델 × 단위 학습"""
+    models = {}
+    for name in MODEL_FACTORIES:
+        for i, unit in enumerate(TARGETS):
+            if name in ONLINE_MODELS:
+                models[f"{name}_{unit}"] = fit_design(list(X_train.columns), supply_design, X_train, y_train[:, i])
+            else:
+                key, model = _fit(name, unit, X_train, y_train[:, i])
+                models[key] = model
+    return models
+
+
+def _run_fold(X_train, y_train, X_test):
+    """워커 프로세스에서 fold 하나의 모델 × 단위를 학습/예측, {키: 예측 배열} 반환"""
+    return {key: model.predict(X_test) for key, model in fold_models(X_train, y_train).items()}
+
+
+def _fold_frame(test, predictions, filter_name, origin):
+    """fold 예측을 (날짜 × 모델 × 단위) long 형식 오차표로 변환"""
+    frames = []
+    for key, predicted in predictions.items():
+        name, unit = key.rsplit('_', 1)
+        actual = test[TARGETS[unit]].to_numpy(dtype='float64')
+        frames.append(pd.DataFrame({
+            '날짜': test['날짜'].to_numpy(),
+            '기준월': origin,
+            '필터': filter_name,
+            '모델': name,
+            '단위': unit,
+            '실제': actual,
+            '예측': predicted,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_backtest(data, n_folds=DEFAULT_FOLDS, lookback=DEFAULT_LOOKBACK, filters=None,
+                 n_jobs=N_JOBS, registry=None, force=False, feature_set=DEFAULT_FEATURE_SET, matrix=None):
+    """모든 fold × 필터를 평가해 행 단위 오차표 반환 (캐시된 fold는 다시 계산하지 않음)
+
+    feature_set: features.FEATURE_SETS의 이름, matrix: 피처 행렬 (기본: 기본 CSV의 캐시 행렬)
+    """
+    registry = registry or get_registry()
+    filters = filters or FILTERS
+    matrix = matrix or get_feature_matrix()
+    columns = FEATURE_SETS[feature_set]
+
+    tasks, cached = [], []
+    for filter_name, model_filter in filters.items():
+        for origin in fold_origins(data, n_folds):
+            train, test = fold_rows(data, origin, model_filter, lookback, matrix, columns)
+            if len(train) == 0 or len(test) == 0:
+                continue
+            key = fold_key(train, test, columns)
+            result = None if force else registry.load(key)
+            if result is None:
+                tasks.append((key, filter_name, origin, train, test))
+            else:
+                cached.append(result)
+
+    outputs = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(_run_fold)(
+            train[columns].astype('float64'),
+            train[list(TARGETS.values())].to_numpy(dtype='float64'),
+            test[columns].astype('float64'),
+        )
+        for _, _, _, train, test in tasks
+    )
+    computed = []
+    for (key, filter_name, origin, _, test), predictions in zip(tasks, outputs):
+        computed.append(registry.save(key, _fold_frame(test, predictions, filter_name, origin)))
+
+    if not cached and not computed:
+        return pd.DataFrame(columns=['날짜', '기준월', '필터', '모델', '단위', '실제', '예측', '예측범위'])
+    errors = pd.concat(cached + computed, ignore_index=True)
+    dates = pd.DatetimeIndex(errors['날짜'])
+    calendar = data.set_index('날짜').reindex(dates)
+    errors['월'] = dates.month
+    errors['날짜유형'] = pd.Categorical(day_type(calendar), categories=DAY_TYPES)
+    errors['절대오차'] = (errors['예측'] - errors['실제']).abs()
+    errors['절대백분율오차'] = errors['절대오차'] / errors['실제'].where(errors['실제'] != 0) * 100
+    errors['예측범위'] = horizon(feature_set)
+    return errors.sort_values(['필터', '단위', '모델', '날짜'], ignore_index=True)
+
+
+def summarize(errors, by=None):
+    """(필터, 단위, [by], 모델)별 MAE / MAPE(%) / 검증 일수"""
+    keys = ['필터', '단위'] + ([by] if by else []) + ['모델']
+    return errors.groupby(keys, observed=True).agg(
+        MAE=('절대오차', 'mean'),
+        MAPE=('절대백분율오차', 'mean'),
+        일수=('절대오차', 'size'),
+    ).reset_index()
+
+
+def metric_table(errors, by, metric='MAPE', filter_name='전체', unit='m3'):
+    """by(월/날짜유형) × 모델 지표표"""
+    summary = summarize(errors[(errors['필터'] == filter_name) & (errors['단위'] == unit)], by)
+    return summary.pivot(index=by, columns='모델', values=metric).reindex(columns=list(MODEL_FACTORIES))
+
+
+if __name__ == "__main__":
+    from data_store import get_daily
+
+    parser = argparse.ArgumentParser(description="공급량 모델 rolling-origin 백테스트")
+    parser.add_argument("--folds", type=int, default=DEFAULT_FOLDS, help="검증할 최근 개월 수")
+    parser.add_argument("--lookback", type=int, default=DEFAULT_LOOKBACK, help="학습에 쓸 기준일 이전 연수")
+    parser.add_argument("--features", choices=list(FEATURE_SETS), default=DEFAULT_FEATURE_SET, help="입력 피처 묶음")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 모든 fold 재계산")
+    args = parser.parse_args()
+
+    errors = run_backtest(get_daily(), args.folds, args.lookback, force=args.force, feature_set=args.features)
+    pd.set_option('display.width', 200)
+    print(f"✅ 피처 묶음: {args.features} ({horizon(args.features)} 예측)")
+    for unit in TARGETS:
+        print(f"\n✅ 전체 MAPE(%) - {unit}")
+        print(summarize(errors[errors['단위'] == unit]).pivot(index='필터', columns='모델', values='MAPE')[list(MODEL_FACTORIES)].round(2))
+        print(f"\n✅ 월별 MAPE(%) - 전체 필터, {unit}")
+        print(metric_table(errors, '월', unit=unit).round(2))
+        print(f"\n✅ 날짜유형별 MAPE(%) - 전체 필터, {unit}")
+        print(metric_table(errors, '날짜유형', unit=unit).round(2))
@@ -0,0 +1,101 @@
+"""날짜별 달력 피처 테이블 (2000~2040)
+
+공휴일명/공휴일 여부/징검다리 휴일/설날·추석까지 남은 일수/요일 코드를
+날짜 키 하나로 미리 계산해 둔다. 페이지와 모델은 행마다 파이썬 함수를
+부르는 대신 이 테이블을 한 번의 벡터 병합으로 붙여 쓴다.
+"""
+from functools import lru_cache
+
+import holidays
+import numpy as np
+import pandas as pd
+
+START_YEAR = 2000
+END_YEAR = 2040
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+CALENDAR_COLUMNS = [
+    '요일', '요일코드', '공휴일', '공휴일여부', '휴무일', '징검다리',
+    '설날까지', '설날이후', '추석까지', '추석이후',
+]
+DAY_TYPES = ['평일', '주말', '공휴일', '징검다리']
+
+
+def _days_to_next(dates, anchors):
+    """각 날짜에서 다음 기준일까지 남은 일수 (없으면 -1)"""
+    idx = np.searchsorted(anchors, dates, side='left')
+    valid = idx < len(anchors)
+    out = np.full(len(dates), -1, dtype='int16')
+    out[valid] = (anchors[idx[valid]] - dates[valid]).astype('timedelta64[D]').astype('int16')
+    return out
+
+
+def _days_since_prev(dates, anchors):
+    """각 날짜가 직전 기준일로부터 지난 일수 (없으면 -1)"""
+    idx = np.searchsorted(anchors, dates, side='right') - 1
+    valid = idx >= 0
+    out = np.full(len(dates), -1, dtype='int16')
+    out[valid] = (dates[valid] - anchors[idx[valid]]).astype('timedelta64[D]').astype('int16')
+    return out
+
+
+def _has_holiday(names, name):
+    """공휴일명 중 name이 있는 날 (겹친 날은 '개천절; 추석'처럼 '; '로 이어져 있음)"""
+    return names.str.contains(rf"(?:^|; ){name}(?:;|$)").to_numpy(bool)
+
+
+@lru_cache(maxsize=None)
+def build_calendar(start_year=START_YEAR, end_year=END_YEAR):
+    """날짜를 인덱스로 하는 달력 피처 테이블 생성 (프로세스당 한 번)"""
+    dates = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-31", freq='D')
+    kr_holidays = holidays.KR(years=range(start_year, end_year + 1))
+    names = pd.Series(
+        list(kr_holidays.values()),
+        index=pd.to_datetime(list(kr_holidays.keys())),
+        dtype='object',
+    ).reindex(dates, fill_value="")
+
+    weekday = dates.weekday.to_numpy().astype('int8')
+    is_holiday = (names != "").to_numpy()
+    is_off = is_holiday | (weekday >= 5)
+    # 징검다리: 앞뒤가 모두 휴무일인 평일
+    prev_off = np.r_[False, is_off[:-1]]
+    next_off = np.r_[is_off[1:], False]
+    is_bridge = ~is_off & prev_off & next_off
+
+    day_values = dates.to_numpy().astype('datetime64[D]')
+    seollal = day_values[_has_holiday(names, "설날")]
+    chuseok = day_values[_has_holiday(names, "추석")]
+
+    calendar = pd.DataFrame({
+        '요일': pd.Categorical.from_codes(weekday, categories=WEEKDAY_NAMES),
+        '요일코드': weekday,
+        '공휴일': names.to_numpy(),
+        '공휴일여부': is_holiday,
+        '휴무일': is_off,
+        '징검다리': is_bridge,
+        '설날까지': _days_to_next(day_values, seollal),
+        '설날이후': _days_since_prev(day_values, seollal),
+        '추석까지': _days_to_next(day_values, chuseok),
+        '추석이후': _days_since_prev(day_values, chuseok),
+    }, index=pd.DatetimeIndex(dates, name='날짜'))
+    calendar['공휴일'] = calendar['공휴일'].astype('category')
+    return calendar
+
+
+def join_calendar(df, date_col='날짜'):
+    """데이터프레임에 달력 피처를 한 번의 병합으로 추가 (기존 컬럼은 복사하지 않음)"""
+    calendar = build_calendar()
+    features = calendar.reindex(pd.DatetimeIndex(df[date_col]))
+    df = df.copy(deep=False)
+    for col in CALENDAR_COLUMNS:
+        df[col] = features[col].values
+    return df
+
+
+def day_type(df):
+    """날짜 유형 배열: 공휴일 > 징검다리 > 주말(휴무일) > 평일 순으로 분류"""
+    return np.select(
+        [df['공휴일여부'].to_numpy(bool), df['징검다리'].to_numpy(bool), df['휴무일'].to_numpy(bool)],
+        [DAY_TYPES[2], DAY_TYPES[3], DAY_TYPES[1]],
+        DAY_TYPES[0],
+    )
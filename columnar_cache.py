@@ -0,0 +1,260 @@
+"""CSV 원본의 바이너리 컬럼 캐시 (메모리 매핑 NumPy)
+
+따옴표로 감싼 문자열 CSV를 매번 파싱하지 않도록 컬럼별 .npy 파일로
+변환해 둔다. 캐시는 원본 CSV의 해시별 디렉토리에 저장되고
+`current.json` 포인터를 원자적으로 교체해 갱신하므로, 여러 워커가
+같은 파일을 mmap으로 공유(zero-copy)하면서도 재빌드 중 깨진 캐시를
+읽지 않는다.
+
+같은 캐시 디렉토리에 데이터 버전별 파생 결과(보간, 피처 행렬, 집계 큐브,
+품질 보고서 등)를 저장할 때 쓰는 공용 도구(atomic_write, VersionedCache)도 둔다.
+
+사용 예)
+    python columnar_cache.py            # 원본이 바뀐 경우에만 재빌드
+    python columnar_cache.py --force    # 강제 재빌드
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 원본 CSV 컬럼별 저장 dtype
+# 기온은 float32, 공급량은 억 단위라 float64 유지
+COLUMN_DTYPES = {
+    'date': 'datetime64[D]',
+    'avg_temp': 'float32',
+    'max_temp': 'float32',
+    'min_temp': 'float32',
+    'supply_mj': 'float64',
+    'supply_m3': 'float64',
+}
+POINTER_NAME = "current.json"
+# 새로 만드는 파일/디렉토리 권한 (mkstemp/mkdtemp 기본값 0600/0700이면
+# 다른 사용자로 도는 워커나 서비스가 읽지 못함)
+FILE_MODE = 0o644
+DIR_MODE = 0o755
+
+
+def cache_dir_for(csv_path):
+    """원본 CSV에 대응하는 캐시 루트 디렉토리 (data/cache/<파일명>)"""
+    csv_path = Path(csv_path)
+    return csv_path.parent / "cache" / csv_path.stem
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """파일 내용의 sha256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """path를 임시 파일로 열어 주고, 블록이 끝나면 rename으로 교체
+
+    기존 파일이 있으면 그 권한을, 없으면 FILE_MODE를 쓴다.
+    블록 안에서 예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둔다.
+    """
+    path = Path(path)
+    try:
+        file_mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        file_mode = FILE_MODE
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.chmod(tmp, file_mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def make_build_dir(parent):
+    """다 채운 뒤 rename으로 공개할 임시 디렉토리 (권한 DIR_MODE)"""
+    tmp_dir = Path(tempfile.mkdtemp(dir=parent, prefix=".build-"))
+    os.chmod(tmp_dir, DIR_MODE)
+    return tmp_dir
+
+
+class VersionedCache:
+    """버전이 같을 때만 재사용하는 "메모리 → 디스크 → 새로 계산" 캐시
+
+    파일(target)마다 마지막 (버전, 값)을 메모리에 두고 디스크에는 load/dump로 저장한다.
+      load(f) → (버전, 값), dump(f, 버전, 값)  (f는 바이너리 파일 객체)
+    버전이 다르면 compute(이전 값 또는 None)로 새로 만든다 (이전 값은 증분 갱신용).
+    디스크를 읽거나 쓰지 못하면 경고만 남기고 계산한 값을 그대로 쓴다.
+    """
+
+    READ_ERRORS = (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError, ImportError,
+                   pickle.UnpicklingError)
+
+    def __init__(self, load, dump):
+        self.load = load
+        self.dump = dump
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def get(self, target, version, compute):
+        """target에 저장된 version의 값, 없거나 버전이 다르면 compute()로 만들어 저장"""
+        target = Path(target)
+        with self._lock:
+            cached = self._memory.get(target)
+            if cached is None or cached[0] != version:
+                cached = self._read(target) or cached
+            if cached is None or cached[0] != version:
+                cached = (version, compute(cached[1] if cached else None))
+                self._write(target, *cached)
+            self._memory[target] = cached
+            return cached[1]
+
+    def _read(self, target):
+        try:
+            with open(target, 'rb') as f:
+                return self.load(f)
+        except FileNotFoundError:
+            return None
+        except self.READ_ERRORS as e:
+            warnings.warn(f"캐시를 읽지 못해 새로 만듭니다 ({target}): {e!r}", RuntimeWarning)
+            return None
+
+    def _write(self, target, version, value):
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(target, 'wb') as f:
+                self.dump(f, version, value)
+        except OSError as e:
+            warnings.warn(f"캐시를 저장하지 못했습니다 ({target}): {e!r}", RuntimeWarning)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+
+def npz_cache():
+    """{'이름': 배열} dict를 .npz 한 파일에 저장하는 VersionedCache"""
+    def load(f):
+        with np.load(f) as saved:
+            return str(saved['version']), {key: saved[key] for key in saved.files if key != 'version'}
+
+    return VersionedCache(load, lambda f, version, arrays: np.savez(f, version=version, **arrays))
+
+
+def pickle_cache(load=pickle.load, dump=pickle.dump):
+    """임의 객체를 (버전, 값) 튜플로 pickle 저장하는 VersionedCache (load/dump로 joblib 등 사용 가능)"""
+    def load_pair(f):
+        version, value = load(f)
+        return version, value
+
+    return VersionedCache(load_pair, lambda f, version, value: dump((version, value), f))
+
+
+def _write_json_atomic(path, payload):
+    with atomic_write(path, encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def _read_pointer(root):
+    try:
+        with open(root / POINTER_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build(csv_path, root=None):
+    """CSV를 읽어 컬럼별 .npy 캐시를 만들고 포인터를 갱신"""
+    csv_path = Path(csv_path)
+    root = Path(root) if root else cache_dir_for(csv_path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    stat = os.stat(csv_path)
+    digest = file_hash(csv_path)
+    version_dir = root / digest[:16]
+
+    if not version_dir.exists():
+        df = pd.read_csv(csv_path, encoding='utf-8', sep=',')
+        tmp_dir = make_build_dir(root)
+        for col, dtype in COLUMN_DTYPES.items():
+            if col == 'date':
+                values = pd.to_datetime(df[col]).to_numpy().astype(dtype)
+            else:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=dtype)
+            np.save(tmp_dir / f"{col}.npy", values)
+        try:
+            os.rename(tmp_dir, version_dir)
+        except OSError:
+            # 다른 워커가 먼저 같은 버전을 만든 경우
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    pointer = {
+        'version': version_dir.name,
+        'sha256': digest,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+    }
+    _write_json_atomic(root / POINTER_NAME, pointer)
+
+    # 이전 버전 정리 (이미 mmap 중인 워커는 unlink 후에도 계속 읽을 수 있음)
+    for old in root.iterdir():
+        if old.is_dir() and old.name != version_dir.name and not old.name.startswith("."):
+            shutil.rmtree(old, ignore_errors=True)
+    return pointer
+
+
+def ensure(csv_path, root=None, force=False):
+    """캐시가 원본과 일치하는지 확인하고 필요하면 재빌드, 현재 포인터 반환
+
+    mtime/크기가 같으면 해시 계산 없이 통과하고, 다르면 해시를 비교해
+    내용이 실제로 바뀐 경우에만 재빌드한다.
+    """
+    csv_path = Path(csv_path)
+    root = Path(root) if root else cache_dir_for(csv_path)
+    pointer = _read_pointer(root)
+    stat = os.stat(csv_path)
+
+    if not force and pointer and (root / pointer['version']).is_dir():
+        if pointer['mtime_ns'] == stat.st_mtime_ns and pointer['size'] == stat.st_size:
+            return pointer
+        if pointer['sha256'] == file_hash(csv_path):
+            pointer.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_json_atomic(root / POINTER_NAME, pointer)
+            return pointer
+    return build(csv_path, root)
+
+
+def load_columns(csv_path, root=None):
+    """캐시된 컬럼을 읽기 전용 memmap 배열 dict로 반환"""
+    csv_path = Path(csv_path)
+    root = Path(root) if root else cache_dir_for(csv_path)
+    pointer = ensure(csv_path, root)
+    version_dir = root / pointer['version']
+    return {
+        col: np.load(version_dir / f"{col}.npy", mmap_mode='r')
+        for col in COLUMN_DTYPES
+    }
+
+
+if __name__ == "__main__":
+    from data_store import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="weather_supply.csv 바이너리 캐시 빌드")
+    parser.add_argument("csv", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--force", action="store_true", help="원본 변경 여부와 관계없이 재빌드")
+    args = parser.parse_args()
+
+    info = ensure(args.csv, force=args.force)
+    print(f"✅ 캐시 준비 완료: {cache_dir_for(args.csv) / info['version']}")
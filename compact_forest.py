@@ -0,0 +1,111 @@
+"""기온 랜덤포레스트의 2차원 룩업 격자 압축
+
+temp_model_rf는 입력이 최고기온/최저기온 두 개뿐인 기본 RandomForest
+(제한 없는 트리 100개)라 파일이 수십 MB이고 로드와 예측이 느리다.
+현실적인 기온 범위를 0.1℃ 간격 격자로 한 번 평가해 float32 표로
+바꾸면 1~2MB로 줄고, 예측은 격자 위 쌍선형 보간(gather)이 된다.
+관측 기온은 0.1℃ 단위이므로 격자점 위 입력은 원래 모델과 같은 값을 낸다.
+
+사용 예)
+    python compact_forest.py          # 현재 rf 모델을 압축하고 정확도 보고서 출력
+"""
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+MAX_TEMP_RANGE = (-15.0, 42.0)
+MIN_TEMP_RANGE = (-25.0, 32.0)
+GRID_STEP = 0.1
+
+
+class GridRegressor:
+    """(최고기온, 최저기온) 격자 위 예측값을 쌍선형 보간하는 회귀기
+
+    sklearn 모델과 같은 predict() 인터페이스를 가지며, 격자 밖 입력은
+    가장 가까운 경계값으로 잘라 계산한다.
+    """
+
+    def __init__(self, feature_names, origin, step, values):
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.origin = tuple(float(v) for v in origin)
+        self.step = float(step)
+        self.values = np.ascontiguousarray(values, dtype='float32')
+
+    def _positions(self, x, axis):
+        size = self.values.shape[axis]
+        pos = np.clip(np.round((x - self.origin[axis]) / self.step, 6), 0, size - 1)
+        lower = np.minimum(np.floor(pos).astype(np.intp), size - 2)
+        return lower, pos - lower
+
+    def predict(self, X):
+        X = np.asarray(X, dtype='float64')
+        i, wi = self._positions(X[:, 0], 0)
+        j, wj = self._positions(X[:, 1], 1)
+        v = self.values
+        return (
+            v[i, j] * (1 - wi) * (1 - wj) + v[i + 1, j] * wi * (1 - wj)
+            + v[i, j + 1] * (1 - wi) * wj + v[i + 1, j + 1] * wi * wj
+        ).astype('float64')
+
+
+def compile_forest(model, feature_names, max_range=MAX_TEMP_RANGE, min_range=MIN_TEMP_RANGE, step=GRID_STEP):
+    """학습된 2입력 모델을 격자에서 한 번 평가해 GridRegressor로 변환"""
+    axis_max = np.round(np.arange(max_range[0], max_range[1] + step / 2, step), 10)
+    axis_min = np.round(np.arange(min_range[0], min_range[1] + step / 2, step), 10)
+    grid_max, grid_min = np.meshgrid(axis_max, axis_min, indexing='ij')
+    X_grid = pd.DataFrame({feature_names[0]: grid_max.ravel(), feature_names[1]: grid_min.ravel()})
+    values = model.predict(X_grid).reshape(grid_max.shape)
+    return GridRegressor(feature_names, (axis_max[0], axis_min[0]), step, values)
+
+
+def accuracy_report(original, compact, X):
+    """원래 모델 대비 압축 모델 오차와 크기/속도 비교"""
+    import pickle
+
+    expected = original.predict(X)
+    start = time.perf_counter()
+    actual = compact.predict(X)
+    compact_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    original.predict(X)
+    original_seconds = time.perf_counter() - start
+
+    error = actual - expected
+    return {
+        'rows': int(len(X)),
+        'mae': float(np.abs(error).mean()),
+        'rmse': float(np.sqrt((error ** 2).mean())),
+        'max_abs_error': float(np.abs(error).max()),
+        'original_bytes': len(pickle.dumps(original)),
+        'compact_bytes': len(pickle.dumps(compact)),
+        'original_predict_seconds': original_seconds,
+        'compact_predict_seconds': compact_seconds,
+    }
+
+
+if __name__ == "__main__":
+    import temp_models
+    from data_store import get_daily
+
+    data = get_daily()
+    # 서비스용 모델(temp_models.train_and_save_models)과 같은 학습 행 (품질이상 제외)
+    data_clean = temp_models.training_rows(data)
+    X = data_clean[temp_models.FEATURES]
+    rf = temp_models.MODEL_FACTORIES['rf']().fit(X, data_clean[temp_models.TARGET])
+    compact = compile_forest(rf, temp_models.FEATURES)
+
+    # 격자점 사이 임의 입력(최고기온 ≥ 최저기온)에 대한 보간 오차도 함께 확인
+    rng = np.random.default_rng(42)
+    random_max = rng.uniform(*MAX_TEMP_RANGE, 20000)
+    random_min = random_max - rng.uniform(0, 20, 20000)
+    keep = random_min >= MIN_TEMP_RANGE[0]
+    X_random = pd.DataFrame({temp_models.FEATURES[0]: random_max[keep], temp_models.FEATURES[1]: random_min[keep]})
+
+    report = {
+        '관측 데이터': accuracy_report(rf, compact, X),
+        '임의 입력': accuracy_report(rf, compact, X_random),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,184 @@
+"""일별 기온/공급량 분석 페이지의 차트 데이터 준비
+
+선택한 연/월 행을 한 번에 골라 연도별로 나누고, 트레이스마다 필요한
+배열(x축 '월-일' 키, 요일/공휴일 라벨, 마커 크기, 누적 공급량)을
+행 반복 없이 numpy 연산으로 만든다.
+
+여러 해 × 전체 월을 고르면 트레이스마다 수천 개 점과 라벨이 JSON으로
+브라우저에 넘어간다. 장기간 모드(is_long_range)에서는 reduce_series로
+서버에서 점을 줄이고(선: LTTB, 막대: 구간별 최소/최대, 산점도: 격자 칸당
+한 점), 점이 많으면 라벨을 공휴일만 남기거나 뺀 뒤 Scattergl(WebGL)로 그린다.
+"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+HOLIDAY_MARKER_SIZE = 12
+DEFAULT_MARKER_SIZE = 8
+# 선택된 전체 일수가 이보다 많으면 장기간 모드
+LONG_RANGE_POINTS = 1500
+# 장기간 모드에서 차트 하나(모든 연도 합계)에 남길 점 수와 트레이스당 최소 점 수
+POINTS_PER_CHART = 800
+MIN_POINTS_PER_TRACE = 60
+# 기온-공급량 산점도를 줄일 때 쓰는 격자 칸 수 (축마다)
+SCATTER_BINS = 20
+# 트레이스 하나에 표시할 최대 라벨 수
+LABEL_DENSITY_LIMIT = 60
+# '월-일' 문자열 조회표 (월 * 32 + 일 → "월-일")
+_MONTH_DAY_KEYS = np.array([f"{m}-{d}" for m in range(13) for d in range(32)], dtype=object)
+
+
+@dataclass
+class YearSeries:
+    """연도 하나의 트레이스 배열"""
+    year: int
+    x: np.ndarray            # '월-일' 키
+    temperature: np.ndarray  # 평균기온
+    supply: np.ndarray       # 공급량
+    cumulative: np.ndarray   # 연도 내 누적 공급량
+    texts: np.ndarray        # 공휴일이면 공휴일명, 아니면 요일 (표시 안 함이면 "")
+    sizes: np.ndarray        # 공휴일이면 크게
+    codes: np.ndarray        # 월 * 32 + 일 (x축 정렬용)
+
+    def take(self, index):
+        """index 위치의 점만 남긴 YearSeries"""
+        return replace(
+            self, x=self.x[index], temperature=self.temperature[index], supply=self.supply[index],
+            cumulative=self.cumulative[index], texts=self.texts[index], sizes=self.sizes[index],
+            codes=self.codes[index],
+        )
+
+
+def prepare_daily_series(data, years, months, show_day_info=True, supply_col='공급량(M3)'):
+    """선택한 연도 순서대로 YearSeries 목록 반환 (데이터가 없는 연도는 빈 배열)"""
+    selected = data[data['연'].isin(years) & data['월'].isin(months)]
+    order = np.lexsort((selected['날짜'].to_numpy(), selected['연'].to_numpy()))
+    year_values = selected['연'].to_numpy()[order]
+
+    supply = selected[supply_col].to_numpy(dtype='float64')[order]
+    holiday = selected['공휴일'].astype(object).fillna("").to_numpy()[order]
+    is_holiday = holiday != ""
+    if show_day_info:
+        texts = np.where(is_holiday, holiday, selected['요일'].to_numpy(dtype=object)[order])
+    else:
+        texts = np.full(len(order), "", dtype=object)
+    sizes = np.where(show_day_info & is_holiday, HOLIDAY_MARKER_SIZE, DEFAULT_MARKER_SIZE)
+
+    # 연도별 누적합: 전체 누적합에서 각 연도 시작 직전 값을 빼고, 결측 위치는 결측으로 유지
+    running = np.cumsum(np.nan_to_num(supply))
+    starts = np.searchsorted(year_values, year_values, side='left')
+    offsets = np.where(starts > 0, running[starts - 1], 0.0)
+    cumulative = np.where(np.isnan(supply), np.nan, running - offsets)
+
+    codes = selected['월'].to_numpy(dtype=np.intp)[order] * 32 + selected['일'].to_numpy(dtype=np.intp)[order]
+    x = _MONTH_DAY_KEYS[codes]
+    # 관측 기온은 0.1℃ 단위 (float32 → float64 변환 잔여 자릿수가 JSON에 실리지 않도록 반올림)
+    temperature = np.round(selected['평균기온'].to_numpy(dtype='float64')[order], 1)
+
+    series = []
+    for year in years:
+        part = slice(np.searchsorted(year_values, year, side='left'), np.searchsorted(year_values, year, side='right'))
+        series.append(YearSeries(
+            year=int(year),
+            x=x[part],
+            temperature=temperature[part],
+            supply=supply[part],
+            cumulative=cumulative[part],
+            texts=texts[part],
+            sizes=sizes[part],
+            codes=codes[part],
+        ))
+    return series
+
+
+def is_long_range(year_series, threshold=LONG_RANGE_POINTS):
+    """선택된 전체 점 수가 threshold보다 많으면 True"""
+    return sum(len(series.x) for series in year_series) > threshold
+
+
+def points_per_trace(year_series, total=POINTS_PER_CHART, minimum=MIN_POINTS_PER_TRACE):
+    """연도 트레이스 수에 맞춘 트레이스당 점 예산 (연도가 많을수록 촘촘히 줄임)"""
+    traces = max(sum(1 for series in year_series if len(series.x)), 1)
+    return max(total // traces, minimum)
+
+
+def category_array(year_series):
+    """모든 연도의 '월-일' 키를 날짜 순으로 (점을 줄여도 x축 순서 유지용)"""
+    codes = np.unique(np.concatenate([series.codes for series in year_series] or [np.array([], dtype=np.intp)]))
+    return _MONTH_DAY_KEYS[codes]
+
+
+def lttb_indices(y, n_out):
+    """Largest-Triangle-Three-Buckets: 모양을 유지하며 n_out개 점의 위치 선택"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y = np.nan_to_num(np.asarray(y, dtype='float64'), nan=np.nanmean(y) if np.isfinite(y).any() else 0.0)
+    x = np.arange(n, dtype='float64')
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return np.unique(selected)
+
+
+def minmax_indices(y, n_out):
+    """n_out/2개 구간마다 최소·최대 점 위치 선택 (막대의 최고/최저를 보존)"""
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.intp)
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    picks = [
+        (lo + int(np.argmin(low[lo:hi])), lo + int(np.argmax(high[lo:hi])))
+        for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo
+    ]
+    return np.unique(np.asarray(picks, dtype=np.intp).ravel())
+
+
+def scatter_indices(x, y, bins=SCATTER_BINS):
+    """x/y 범위를 bins × bins 격자로 나눠 칸마다 첫 점만 선택 (산점도 분포 모양 유지)"""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) <= bins:
+        return valid
+
+    def to_bin(v):
+        span = v.max() - v.min()
+        return np.minimum(((v - v.min()) / (span or 1) * bins).astype(np.intp), bins - 1)
+
+    cells = to_bin(x[valid]) * bins + to_bin(y[valid])
+    _, first = np.unique(cells, return_index=True)
+    return np.sort(valid[first])
+
+
+def thin_labels(series, limit=LABEL_DENSITY_LIMIT):
+    """라벨이 limit개를 넘으면 공휴일 라벨만 남기고, 그래도 많으면 모두 뺀다"""
+    labelled = series.texts != ""
+    if labelled.sum() <= limit:
+        return series
+    holidays_only = np.where(series.sizes == HOLIDAY_MARKER_SIZE, series.texts, "")
+    if (holidays_only != "").sum() > limit:
+        holidays_only = np.full(len(series.texts), "", dtype=object)
+    return replace(series, texts=holidays_only)
+
+
+def reduce_series(series, field, max_points, method='lttb', label_limit=LABEL_DENSITY_LIMIT):
+    """장기간 모드용: field('temperature'/'supply'/'cumulative') 기준으로 점을 줄이고 라벨을 솎아냄"""
+    pick = lttb_indices if method == 'lttb' else minmax_indices
+    return thin_labels(series.take(pick(getattr(series, field), max_points)), label_limit)
+
+
+def reduce_scatter(series, bins=SCATTER_BINS, label_limit=LABEL_DENSITY_LIMIT):
+    """장기간 모드용: 기온-공급량 산점도 점을 격자 칸당 하나로 줄이고 라벨을 솎아냄"""
+    return thin_labels(series.take(scatter_indices(series.temperature, series.supply, bins)), label_limit)
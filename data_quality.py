@@ -0,0 +1,194 @@
+"""일별 데이터 품질 검사 (수집 시점 + 로드 시점)
+
+행마다 아래 규칙을 numpy 벡터 연산으로 한 번에 검사한다.
+- 기온범위: 기온이 TEMP_RANGE 밖
+- 기온순서: 최저 ≤ 평균 ≤ 최고가 아님
+- 공급량범위: 공급량이 0 이하
+- 열량비: MJ/M3 비율이 전체 중앙값에서 RATIO_TOLERANCE 넘게 벗어남
+- 날짜중복: 같은 날짜가 앞에 이미 있음
+하나라도 걸린 행은 data_store가 '품질이상' 컬럼에 표시하고, 모델/백테스트
+학습에서는 valid_rows()로 뺀다. 값이 비어 있는 것(결측)은 이상으로 보지 않는다.
+날짜 연속성(빠진 날짜 구간)은 행 단위가 아니라 보고서에 기록한다.
+
+quality_report()는 데이터 버전별로 data/cache/<파일명>/quality.json에 저장된다.
+수집(temp_API) 때 검사에 걸려 저장하지 않은 날짜는 CSV에 남지 않으므로
+data/cache/<파일명>/rejected.json에 날짜별 위반 규칙과 값을 따로 기록한다.
+
+사용 예)
+    python data_quality.py            # 기본 CSV 품질 보고서 출력
+"""
+import argparse
+import hashlib
+import json
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from columnar_cache import VersionedCache, atomic_write, cache_dir_for
+
+TEMP_RANGE = (-35.0, 45.0)
+# 도시가스 열량(MJ/m3)은 연도별로 1~2% 안쪽으로 움직이므로 4% 넘게 벗어나면 이상
+RATIO_TOLERANCE = 0.04
+CHECKS = ['기온범위', '기온순서', '공급량범위', '열량비', '날짜중복']
+# 규칙이 바뀌면 학습 캐시 키도 바뀌도록
+RULES = {'temp_range': list(TEMP_RANGE), 'ratio_tolerance': RATIO_TOLERANCE, 'checks': CHECKS}
+RULES_TAG = hashlib.sha256(json.dumps(RULES, sort_keys=True).encode()).hexdigest()[:8]
+BASE_VALUE_COLUMNS = ['평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']
+REPORT_FILE = "quality.json"
+REJECTED_FILE = "rejected.json"
+MAX_REPORTED_DATES = 100
+
+
+def _values(df, col):
+    return df[col].to_numpy(dtype='float64')
+
+
+def check_rows(df):
+    """규칙별 위반 여부 (행 × CHECKS 불리언 데이터프레임, 결측은 위반 아님)"""
+    avg, high, low = _values(df, '평균기온'), _values(df, '최고기온'), _values(df, '최저기온')
+    m3, mj = _values(df, '공급량(M3)'), _values(df, '공급량(MJ)')
+    temps = np.column_stack([avg, high, low])
+
+    # NaN과의 비교는 모두 False라 결측은 자동으로 통과
+    out_of_range = ((temps < TEMP_RANGE[0]) | (temps > TEMP_RANGE[1])).any(axis=1)
+    disordered = (low > avg) | (avg > high) | (low > high)
+    bad_supply = (m3 <= 0) | (mj <= 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(m3 > 0, mj / m3, np.nan)
+    reference = np.nanmedian(ratio) if np.isfinite(ratio).any() else np.nan
+    ratio_outlier = np.abs(ratio / reference - 1) > RATIO_TOLERANCE
+
+    dates = df['날짜'].to_numpy().astype('datetime64[D]')
+    duplicated = np.ones(len(dates), dtype=bool)
+    duplicated[np.unique(dates, return_index=True)[1]] = False
+
+    return pd.DataFrame(
+        np.column_stack([out_of_range, disordered, bad_supply, ratio_outlier, duplicated]),
+        columns=CHECKS, index=df.index,
+    )
+
+
+def invalid_mask(df):
+    """규칙을 하나라도 어긴 행 (불리언 배열)"""
+    return check_rows(df).to_numpy().any(axis=1)
+
+
+def valid_rows(data):
+    """학습에 쓸 수 있는 행만 ('품질이상' 컬럼이 없으면 바로 검사)"""
+    flags = data['품질이상'].to_numpy() if '품질이상' in data else invalid_mask(data)
+    return data[~flags]
+
+
+def date_gaps(dates):
+    """정렬된 날짜 사이에 빠진 구간 [(시작, 끝)] (datetime64[D])"""
+    dates = np.unique(np.asarray(dates, dtype='datetime64[D]'))
+    steps = np.diff(dates).astype(int)
+    breaks = np.flatnonzero(steps > 1)
+    return [(dates[i] + 1, dates[i + 1] - 1) for i in breaks]
+
+
+def build_report(df, version=None):
+    """품질 보고서 dict (규칙별 위반 수/날짜, 남은 결측 수, 보간 수, 빠진 날짜 구간)"""
+    flags = check_rows(df)
+    dates = pd.to_datetime(df['날짜'])
+    gaps = date_gaps(dates.to_numpy())
+    return {
+        'version': version,
+        'rows': int(len(df)),
+        'start': str(dates.min().date()) if len(df) else None,
+        'end': str(dates.max().date()) if len(df) else None,
+        'invalid_rows': int(flags.to_numpy().any(axis=1).sum()),
+        'checks': {
+            name: {
+                'count': int(flags[name].sum()),
+                'dates': dates[flags[name].to_numpy()].dt.strftime('%Y-%m-%d').tolist()[:MAX_REPORTED_DATES],
+            }
+            for name in CHECKS
+        },
+        'missing': {col: int(df[col].isna().sum()) for col in BASE_VALUE_COLUMNS},
+        'imputed': {col: int(df[f"{col}_보간"].sum()) for col in BASE_VALUE_COLUMNS if f"{col}_보간" in df},
+        'gaps': [[str(start), str(end)] for start, end in gaps],
+        'rules': RULES,
+    }
+
+
+def _load_report(f):
+    report = json.load(f)
+    return report['version'], report
+
+
+def _dump_report(f, version, report):
+    f.write(json.dumps(report, ensure_ascii=False, indent=1).encode('utf-8'))
+
+
+_cache = VersionedCache(_load_report, _dump_report)
+
+
+def quality_report(path=None):
+    """데이터 버전 + 규칙별 품질 보고서 (data/cache/<파일명>/quality.json에 저장해 재사용)"""
+    from data_store import DATA_PATH, dataset_version, get_daily
+
+    path = path or DATA_PATH
+    version = f"{dataset_version(path)}-{RULES_TAG}"
+    return _cache.get(
+        cache_dir_for(path) / REPORT_FILE, version,
+        lambda previous: build_report(get_daily(path), version),
+    )
+
+
+def rejected_days(path):
+    """수집 때 품질 검사로 저장하지 않은 날짜 기록 {날짜: {'checks', 'values', 'fetched'}} (없으면 빈 dict)"""
+    try:
+        with open(cache_dir_for(path) / REJECTED_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        warnings.warn(f"수집 품질 기록({path})을 읽지 못했습니다: {e}", RuntimeWarning)
+        return {}
+
+
+def record_rejected(path, df, flags, accepted=()):
+    """수집한 행 중 검사에 걸린 날짜(flags 행이 하나라도 True)를 기록하고, 이번에 저장한 날짜는 지움
+
+    df: 한국어 컬럼의 수집 행, flags: check_rows(df), accepted: 저장한 날짜 문자열들
+    """
+    log = rejected_days(path)
+    for day in accepted:
+        log.pop(day, None)
+    fetched = datetime.now().isoformat(timespec='seconds')
+    rejected = flags.to_numpy().any(axis=1)
+    values = [col for col in BASE_VALUE_COLUMNS if col in df]
+    for day, row, checks in zip(df['날짜'][rejected], df[values][rejected].to_numpy(dtype='float64'),
+                                flags[rejected].to_numpy()):
+        log[str(day)] = {
+            'checks': [name for name, failed in zip(CHECKS, checks) if failed],
+            'values': {col: (None if np.isnan(value) else float(value)) for col, value in zip(values, row)},
+            'fetched': fetched,
+        }
+    target = cache_dir_for(path) / REJECTED_FILE
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(target, encoding='utf-8') as f:
+        json.dump(dict(sorted(log.items())), f, ensure_ascii=False, indent=1)
+    return log
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일별 데이터 품질 보고서")
+    parser.add_argument("--csv", help="검사할 CSV (기본: weather_supply.csv)")
+    args = parser.parse_args()
+
+    report = quality_report(args.csv)
+    print(f"✅ {report['start']} ~ {report['end']}: {report['rows']}행, 이상 {report['invalid_rows']}행")
+    for name, result in report['checks'].items():
+        print(f"  - {name}: {result['count']}행 {', '.join(result['dates'][:10])}")
+    print(f"  - 결측: {report['missing']}")
+    print(f"  - 보간: {report['imputed']}")
+    print(f"  - 빠진 날짜 구간: {len(report['gaps'])}개 {report['gaps'][:10]}")
+    from data_store import DATA_PATH
+    rejected = rejected_days(args.csv or DATA_PATH)
+    reasons = [f"{day}({'/'.join(entry['checks'])})" for day, entry in list(rejected.items())[:10]]
+    print(f"  - 수집 때 제외(다시 받을 날짜): {len(rejected)}개 {', '.join(reasons)}")
@@ -0,0 +1,131 @@
+"""일별 기온·공급량 공용 데이터 저장소
+
+모든 페이지가 같은 일별 데이터프레임을 프로세스당 한 번만 읽고,
+연/월/일/요일/공휴일 컬럼을 미리 계산해 압축 dtype으로 보관한다.
+페이지에는 얕은 복사(읽기 전용 뷰)만 넘겨 원본이 오염되지 않게 한다.
+"""
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+import columnar_cache
+import imputation
+from calendar_table import join_calendar
+from data_quality import invalid_mask
+
+# ✅ 프로젝트 루트 디렉토리 기준 경로 설정
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+DATA_PATH = DATA_DIR / "weather_supply.csv"
+DEFAULT_STATION = '143'  # 대구 지점번호 (공급량이 있는 기본 지점)
+
+COLUMN_MAPPING = {
+    'date': '날짜',
+    'avg_temp': '평균기온',
+    'max_temp': '최고기온',
+    'min_temp': '최저기온',
+    'supply_m3': '공급량(M3)',
+    'supply_mj': '공급량(MJ)',
+}
+BASE_COLUMNS = ['날짜', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']
+TEMP_COLUMNS = ['평균기온', '최고기온', '최저기온']
+SUPPLY_COLUMNS = ['공급량(M3)', '공급량(MJ)']
+
+# 페이지에는 공용 원본의 얕은 복사를 넘기므로, 한 페이지가 .loc 등으로 값을 바꿔도
+# 원본 배열에 쓰지 않고 그 뷰만 복사되도록 copy-on-write 사용 (pandas 3부터는 항상 켜져 있음)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def station_csv_path(station):
+    """지점별 저장 경로 (대구 143은 기존 weather_supply.csv)"""
+    if str(station) == DEFAULT_STATION:
+        return DATA_PATH
+    return DATA_DIR / f"weather_{station}.csv"
+
+
+def read_csv(path=DATA_PATH):
+    """CSV 파일에서 데이터 로드 및 컬럼명 한국어로 변경"""
+    df = pd.read_csv(path, encoding='utf-8', sep=',')
+    df.rename(columns=COLUMN_MAPPING, inplace=True)
+    return df[BASE_COLUMNS]
+
+
+def add_columns(df):
+    """데이터프레임에 연, 월, 일, 품질이상 및 달력 피처(요일, 공휴일 등) 컬럼 추가 (압축 dtype)
+
+    얕은 복사 위에서 컬럼 단위로 교체하므로, 이미 목표 dtype인 컬럼
+    (read_cached()의 memmap 컬럼 등)은 복사되지 않는다.
+    """
+    df = df.copy(deep=False)
+    df['날짜'] = pd.to_datetime(df['날짜'])
+    # 기온은 소수 첫째 자리까지라 float32로 충분하지만,
+    # 공급량은 억 단위라 float32 정밀도(약 7자리)를 넘으므로 float64 유지
+    for col in TEMP_COLUMNS:
+        df[col] = df[col].astype('float32')
+    for col in SUPPLY_COLUMNS:
+        df[col] = df[col].astype('float64')
+
+    df['연'] = df['날짜'].dt.year.astype('int16')
+    df['월'] = df['날짜'].dt.month.astype('int8')
+    df['일'] = df['날짜'].dt.day.astype('int8')
+    # 품질 규칙 위반 행 (학습에서 제외, data_quality 참고)
+    df['품질이상'] = invalid_mask(df)
+
+    # 요일/공휴일 등 달력 피처는 미리 계산된 테이블에서 한 번에 병합
+    return join_calendar(df)
+
+
+def read_cached(path=DATA_PATH):
+    """바이너리 컬럼 캐시에서 데이터 로드 (캐시를 쓸 수 없으면 CSV 파싱)"""
+    try:
+        columns = columnar_cache.load_columns(path)
+    except OSError:
+        return read_csv(path)
+    # ndarray dict를 그대로 넘기면 같은 dtype 컬럼이 2차원 블록으로 합쳐지며 복사되므로
+    # 컬럼마다 Series로 감싸 memmap을 그대로 쓴다 (날짜만 pandas 해상도로 변환되며 복사)
+    df = pd.DataFrame(
+        {COLUMN_MAPPING[col]: pd.Series(values, copy=False) for col, values in columns.items()},
+        copy=False,
+    )
+    return df[BASE_COLUMNS]
+
+
+def load_daily(path=DATA_PATH):
+    """프로세스 공용 일별 데이터프레임 반환 (결측 보간 포함, 원본 파일이 바뀌면 다시 로드)
+
+    보간으로 값이 채워진 컬럼을 빼면 값 컬럼은 바이너리 캐시의 memmap을 그대로 쓴다.
+    """
+    path = Path(path)
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, imputation.apply(add_columns(read_cached(path)), path))
+            _cache[path] = cached
+    return cached[1]
+
+
+def get_daily(path=DATA_PATH):
+    """페이지용 읽기 전용 뷰 반환
+
+    얕은 복사 + copy-on-write라 컬럼을 추가/교체하거나 .loc으로 값을 바꿔도
+    공용 원본에는 영향이 없다.
+    """
+    return load_daily(path).copy(deep=False)
+
+
+def clear_cache():
+    """공용 캐시 비우기 (데이터 갱신 직후 강제 재로드용)"""
+    with _lock:
+        _cache.clear()
+
+
+def dataset_version(path=DATA_PATH):
+    """데이터 버전 (CSV 내용 해시 앞 16자리 + 보간 규칙 해시), 모델/집계 캐시 키로 사용"""
+    return f"{columnar_cache.ensure(path)['version']}-{imputation.RULES_TAG}"
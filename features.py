@@ -0,0 +1,161 @@
+"""공급량 모델용 피처 행렬 (데이터 버전별 캐시)
+
+일별 데이터에서 아래 피처를 한 번에 계산해 (날짜 × 피처) float32 행렬로 만든다.
+- 기온: 평균/최고/최저, 1·2일 전 평균기온, 3·7일 이동평균
+- 난방도일(HDD): max(HDD_BASE - 평균기온, 0)과 전날 값
+- 달력: 요일 원-핫(일요일 기준), 공휴일/징검다리, 설·추석 연휴(당일 ±2일)
+- 전날 공급량(M3/MJ) (품질이상 행의 공급량은 쓰지 않음)
+시차/이동평균은 달력 날짜 기준이라 중간에 빠진 날이 있으면 해당 값은 NaN이다.
+
+운영 모델(supply_models)은 예측 시점에 날짜와 평균기온만 주어지므로
+input_features()로 그 둘에서 만들 수 있는 피처(기온, HDD, 달력)만 쓴다.
+전날 공급량은 실제값이 있어야 하므로 하루 앞 예측(DAY_AHEAD_SETS)에만 쓴다.
+
+행렬은 데이터 버전마다 한 번만 만들어 data/cache/<파일명>/features.npz에
+저장하고, 백테스트와 모델은 take()로 필요한 날짜 × 피처만 잘라 쓴다.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from calendar_table import WEEKDAY_NAMES, build_calendar
+from columnar_cache import cache_dir_for, npz_cache
+from data_store import DATA_PATH, dataset_version, get_daily
+
+HDD_BASE = 18.0
+HOLIDAY_WINDOW = 2
+TEMP_FEATURES = [
+    '평균기온', '최고기온', '최저기온', '평균기온_1일전', '평균기온_2일전',
+    '평균기온_3일평균', '평균기온_7일평균', 'HDD', 'HDD_1일전',
+]
+CALENDAR_FEATURES = [f"요일_{name}" for name in WEEKDAY_NAMES[:-1]] + ['공휴일여부', '징검다리', '명절연휴']
+LAG_FEATURES = ['전일공급량(M3)', '전일공급량(MJ)']
+FEATURE_COLUMNS = TEMP_FEATURES + CALENDAR_FEATURES + LAG_FEATURES
+# 날짜와 평균기온만으로 만들 수 있는 피처 (운영 모델 입력)
+INPUT_FEATURES = ['평균기온', 'HDD'] + CALENDAR_FEATURES
+# 모델/백테스트에서 고르는 피처 묶음
+FEATURE_SETS = {
+    '기온': ['평균기온'],
+    '기온+달력': INPUT_FEATURES,
+    '확장': TEMP_FEATURES + CALENDAR_FEATURES,
+    '확장+전일공급량': FEATURE_COLUMNS,
+}
+# 전날 실제 공급량이 필요해 하루 앞 예측으로만 평가할 수 있는 묶음
+DAY_AHEAD_SETS = ['확장+전일공급량']
+FEATURES_FILE = "features.npz"
+FEATURES_TAG = hashlib.sha256(
+    json.dumps({'columns': FEATURE_COLUMNS, 'hdd': HDD_BASE, 'holiday': HOLIDAY_WINDOW}, ensure_ascii=False).encode()
+).hexdigest()[:8]
+
+
+@dataclass
+class FeatureMatrix:
+    """날짜순 피처 행렬"""
+    version: str
+    dates: np.ndarray    # datetime64[D], 정렬·중복 없음
+    columns: list
+    values: np.ndarray   # float32 (날짜 × 피처)
+
+    def take(self, dates, columns=None):
+        """dates 행 × columns 열 float32 배열 (행렬에 없는 날짜는 NaN)"""
+        cols = [self.columns.index(col) for col in (columns or self.columns)]
+        dates = np.asarray(dates).astype('datetime64[D]')
+        pos = np.minimum(np.searchsorted(self.dates, dates), max(len(self.dates) - 1, 0))
+        found = self.dates[pos] == dates if len(self.dates) else np.zeros(len(dates), dtype=bool)
+        out = np.full((len(dates), len(cols)), np.nan, dtype='float32')
+        out[found] = self.values[np.ix_(pos[found], cols)]
+        return out
+
+
+@lru_cache(maxsize=None)
+def _calendar_feature_table():
+    """달력 전체 범위의 CALENDAR_FEATURES 행렬 (첫 날짜, 날짜 × 피처 bool), 프로세스당 한 번"""
+    calendar = build_calendar()
+
+    def near(until, since):
+        until, since = calendar[until].to_numpy(), calendar[since].to_numpy()
+        return ((until >= 0) & (until <= HOLIDAY_WINDOW)) | ((since >= 0) & (since <= HOLIDAY_WINDOW))
+
+    weekday = calendar['요일코드'].to_numpy()
+    table = np.column_stack([
+        *(weekday == i for i in range(len(WEEKDAY_NAMES) - 1)),
+        calendar['공휴일여부'].to_numpy(bool),
+        calendar['징검다리'].to_numpy(bool),
+        near('설날까지', '설날이후') | near('추석까지', '추석이후'),
+    ])
+    return calendar.index[0].to_datetime64().astype('datetime64[D]'), table
+
+
+def calendar_features(dates):
+    """날짜 → CALENDAR_FEATURES 컬럼 dict (bool 배열), 달력 범위 밖 날짜면 ValueError"""
+    first, table = _calendar_feature_table()
+    # datetime64 배열은 그대로, 그 밖(Series, 문자열 목록 등)은 pandas로 변환
+    values = dates if isinstance(dates, np.ndarray) and dates.dtype.kind == 'M' else pd.DatetimeIndex(dates).to_numpy()
+    days = (values.astype('datetime64[D]') - first).astype('int64')
+    if ((days < 0) | (days >= len(table))).any():
+        last = first + (len(table) - 1)
+        raise ValueError(f"달력 범위({first}~{last}) 밖의 날짜가 있습니다.")
+    rows = table[days]
+    return {col: rows[:, i] for i, col in enumerate(CALENDAR_FEATURES)}
+
+
+def input_features(dates, temps):
+    """(날짜, 평균기온) → INPUT_FEATURES 데이터프레임 (운영 모델 학습·예측 공용)"""
+    temps = np.asarray(temps, dtype='float64')
+    # dict 순서가 INPUT_FEATURES 순서 (열을 다시 고르지 않음)
+    return pd.DataFrame({
+        '평균기온': temps,
+        'HDD': np.maximum(HDD_BASE - temps, 0),
+        **calendar_features(dates),
+    })
+
+
+def build_features(data):
+    """일별 데이터프레임 → (날짜 배열, 피처 행렬)"""
+    frame = data.drop_duplicates('날짜').sort_values('날짜')
+    observed = pd.DatetimeIndex(frame['날짜'])
+    full = pd.date_range(observed.min(), observed.max(), freq='D')
+    daily = frame.set_index('날짜').reindex(full)
+
+    temp = daily['평균기온'].astype('float64')
+    hdd = (HDD_BASE - temp).clip(lower=0)
+    # 품질이상 행의 공급량은 전날 공급량 피처로 넘기지 않음
+    suspect = daily['품질이상'].eq(True) if '품질이상' in daily else pd.Series(False, index=full)
+    supply = daily[['공급량(M3)', '공급량(MJ)']].astype('float64').mask(suspect, axis=0)
+
+    features = pd.DataFrame({
+        '평균기온': temp,
+        '최고기온': daily['최고기온'].astype('float64'),
+        '최저기온': daily['최저기온'].astype('float64'),
+        '평균기온_1일전': temp.shift(1),
+        '평균기온_2일전': temp.shift(2),
+        '평균기온_3일평균': temp.rolling(3, min_periods=3).mean(),
+        '평균기온_7일평균': temp.rolling(7, min_periods=5).mean(),
+        'HDD': hdd,
+        'HDD_1일전': hdd.shift(1),
+        **calendar_features(full),
+        '전일공급량(M3)': supply['공급량(M3)'].shift(1),
+        '전일공급량(MJ)': supply['공급량(MJ)'].shift(1),
+    }, index=full)[FEATURE_COLUMNS]
+
+    keep = full.isin(observed)
+    return full[keep].to_numpy().astype('datetime64[D]'), features[keep].to_numpy(dtype='float32')
+
+
+_cache = npz_cache()
+
+
+def get_feature_matrix(path=DATA_PATH):
+    """데이터 버전별 피처 행렬 (메모리 → 디스크 캐시 → 새로 계산)"""
+    version = f"{dataset_version(path)}-{FEATURES_TAG}"
+
+    def compute(previous):
+        dates, values = build_features(get_daily(path))
+        return {'dates': dates, 'values': values}
+
+    arrays = _cache.get(cache_dir_for(path) / FEATURES_FILE, version, compute)
+    return FeatureMatrix(version, arrays['dates'], list(FEATURE_COLUMNS), arrays['values'])
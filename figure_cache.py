@@ -0,0 +1,68 @@
+"""분석 페이지 Plotly 그림 캐시
+
+분석 페이지는 위젯 하나만 바뀌어도 모든 그림을 처음부터 다시 만든다.
+이 모듈은 (데이터 버전, 차트 종류, 그림에 영향을 주는 필터 값)을 키로
+완성된 Figure를 프로세스 공용 LRU에 보관해, 다른 세션이 같은 조건을
+보거나 그 그림과 무관한 위젯만 바뀐 경우 다시 그리지 않게 한다.
+그림마다 자신에게 영향을 주는 값만 키에 넣는다 (예: 라벨이 없는 막대는
+요일/공휴일 표시 여부를 키에 넣지 않음).
+"""
+import threading
+from collections import OrderedDict
+
+from data_store import dataset_version
+from model_registry import make_key
+
+MAX_FIGURES = 128
+
+
+class FigureCache:
+    """키별 Figure LRU (세션 간 공유, 스레드 안전)"""
+
+    def __init__(self, max_items=MAX_FIGURES):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """캐시된 그림이 있으면 반환, 없으면 build()로 만들어 저장
+
+        반환된 Figure는 여러 세션이 공유하므로 호출한 쪽에서 수정하면 안 된다.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        fig = build()
+        with self._lock:
+            self._items[key] = fig
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_cache = FigureCache()
+
+
+def get_figure_cache():
+    """프로세스 공용 그림 캐시"""
+    return _cache
+
+
+def cached_figure(chart, build, version=None, **params):
+    """(데이터 버전, 차트 종류, params)별로 build()가 만든 Figure를 재사용
+
+    version: 데이터 버전 (기본값: 기본 CSV의 dataset_version())
+    params: 그림 내용에 영향을 주는 필터 값 (연도/월/단위/라벨 표시 등)
+    """
+    key = make_key(kind='figure', chart=chart, dataset=version or dataset_version(), **params)
+    return _cache.get_or_build(key, build)
@@ -0,0 +1,349 @@
+"""Streamlit 없이 쓰는 공급량/기온 예측 서비스 (HTTP + CLI)
+
+학습된 공급량 모델(모델 저장소)과 기온 모델(temp_models 아티팩트)을
+처음 쓸 때 한 번 불러와 메모리에 유지하고, 동시에 들어온 요청을
+짧은 시간 창(micro-batch)으로 모아 모델별로 한 번만 예측한다.
+큐에 요청이 하나뿐이면 기다리지 않고 바로 예측한다.
+요청 검증과 모델 준비는 요청 스레드에서 끝내고, 배처는 예측만 한다.
+기본 조건 외의 학습 조건은 모델 저장소에 이미 학습돼 있어야 하며
+(일공급량 예측 페이지 등에서 학습), 없으면 400으로 거절한다.
+
+사용 예)
+    python forecast_service.py serve --port 8765
+    curl -X POST localhost:8765/supply -d '{"dates": ["2025-01-06", "2025-01-07"], "temps": [-2.5, 0.3]}'
+    python forecast_service.py supply --start 2025-01-06 --temps -2.5 0.3 4.1
+    python forecast_service.py temperature --max 5.2 --min -3.1
+
+요청 형식)
+    POST /supply       {"dates": [...], "temps": [...], "models": ["KNN_m3", ...], "filter": {"years": [...], "months": [...], "days": [...]}}
+    POST /temperature  {"max_temp": [...], "min_temp": [...]}
+    GET  /health
+공급량 모델은 날짜의 요일/공휴일도 입력으로 쓰므로 dates는 temps와 같은 길이여야 한다.
+응답은 JSON이며, Accept: application/vnd.apache.arrow.stream 이고 pyarrow가
+설치돼 있으면 Arrow IPC 스트림으로 돌려준다.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import temp_models
+from calendar_table import WEEKDAY_NAMES
+from data_store import dataset_version, get_daily
+from features import input_features
+from model_registry import get_registry
+from response_tables import get_response_table, predict as predict_from_table
+from supply_models import MODEL_NAMES, TARGETS, get_trained_models, normalize_filter, registry_key
+
+BATCH_WINDOW = 0.002  # 요청이 몰릴 때 2ms 동안 들어온 요청을 한 번에 처리
+MAX_BATCH = 256
+VERSION_TTL = 1.0  # 데이터 버전(파일 확인)을 다시 확인하는 간격 (초)
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+SUPPLY_KEYS = [f"{name}_{unit}" for name in MODEL_NAMES for unit in TARGETS]
+FILTER_FIELDS = ('years', 'months', 'days')
+
+
+def default_filter(data):
+    """일공급량 예측 페이지 기본값과 같은 학습 조건 (최근 3년, 전체 월/요일)"""
+    return {
+        'years': sorted(int(y) for y in data['연'].unique())[-3:],
+        'months': list(range(1, 13)),
+        'days': list(WEEKDAY_NAMES),
+    }
+
+
+def validate_supply_request(dates, temps, names, model_filter):
+    """공급량 요청 검증·정리, (입력 피처 프레임, 모델 이름, 필터) 반환, 잘못된 값이면 ValueError"""
+    temps = np.asarray(temps, dtype='float64')
+    if temps.ndim != 1 or not np.isfinite(temps).all():
+        raise ValueError("temps는 유한한 숫자 목록이어야 합니다.")
+    try:
+        dates = np.asarray(dates, dtype='datetime64[D]')
+    except (TypeError, ValueError):
+        raise ValueError("dates는 YYYY-MM-DD 형식의 날짜 목록이어야 합니다.") from None
+    if dates.shape != temps.shape or np.isnat(dates).any():
+        raise ValueError("dates는 temps와 같은 길이의 날짜 목록이어야 합니다.")
+    X = input_features(dates, temps)
+    names = list(names or SUPPLY_KEYS)
+    unknown = sorted(set(names) - set(SUPPLY_KEYS))
+    if unknown:
+        raise ValueError(f"알 수 없는 모델: {unknown}")
+    if model_filter is not None:
+        if not isinstance(model_filter, dict) or set(model_filter) - set(FILTER_FIELDS):
+            raise ValueError(f"filter는 {list(FILTER_FIELDS)} 키만 쓸 수 있습니다.")
+        if any(not model_filter[field] for field in model_filter):
+            raise ValueError("filter 값이 비어 있습니다.")
+        cast = {'years': int, 'months': int, 'days': str}
+        model_filter = {field: [cast[field](v) for v in values] for field, values in model_filter.items()}
+        if any(m not in range(1, 13) for m in model_filter.get('months', [])):
+            raise ValueError("months는 1~12 사이여야 합니다.")
+        if any(d not in WEEKDAY_NAMES for d in model_filter.get('days', [])):
+            raise ValueError(f"days는 {WEEKDAY_NAMES} 중에서 골라야 합니다.")
+    return X, names, model_filter
+
+
+class ModelCache:
+    """학습 조건별 공급량 모델과 기온 모델을 메모리에 유지
+
+    데이터 버전이 바뀌면 일별 데이터를 다시 읽고, 모델 키도 그 스냅샷의 버전으로 만든다.
+    버전 확인은 파일을 읽으므로 version_ttl초에 한 번만 한다.
+    """
+
+    def __init__(self, version_ttl=VERSION_TTL):
+        self._lock = threading.Lock()
+        self._supply = {}
+        self._temperature_models = None
+        self.version = None
+        self.version_ttl = version_ttl
+        self._checked = (float('-inf'), None)  # (확인 시각, 확인한 버전)
+
+    @property
+    def temperature_models(self):
+        """기온 모델 (처음 쓸 때 불러옴)"""
+        with self._lock:
+            if self._temperature_models is None:
+                self._temperature_models, problems = temp_models.load_models()
+                for problem in problems:
+                    print(f"⚠️ {problem}")
+            return self._temperature_models
+
+    def _current_version(self):
+        checked_at, version = self._checked
+        now = time.monotonic()
+        if now - checked_at >= self.version_ttl:
+            version = dataset_version()
+            self._checked = (now, version)
+        return version
+
+    def _reload_if_changed(self):
+        version = self._current_version()
+        with self._lock:
+            if version != self.version:
+                self.data = get_daily()
+                self.default_filter = default_filter(self.data)
+                self.version = version
+                self._supply.clear()
+            return self.data, self.default_filter, self.version
+
+    def supply(self, model_filter=None):
+        """(키, 모델 dict, 응답표) 반환
+
+        기본 조건은 없으면 학습하고, 다른 조건은 모델 저장소에 있을 때만 불러온다.
+        """
+        data, defaults, version = self._reload_if_changed()
+        model_filter = {**defaults, **(model_filter or {})}
+        years, months, days = (model_filter[field] for field in FILTER_FIELDS)
+        key = registry_key(years, months, days, version=version)
+        with self._lock:
+            cached = self._supply.get(key)
+        if cached is not None:
+            return (key, *cached)
+
+        if normalize_filter(years, months, days) == normalize_filter(*defaults.values()):
+            models = get_trained_models(data, years, months, days)
+        else:
+            models = get_registry().load(key)
+            if models is None:
+                raise ValueError("학습된 모델이 없는 조건입니다. 일공급량 예측 페이지에서 먼저 학습하세요.")
+        entry = (models, get_response_table(key, models))
+        with self._lock:
+            if version == self.version:
+                self._supply[key] = entry
+        return (key, *entry)
+
+
+class MicroBatcher:
+    """짧은 시간 창 동안 모인 공급량 요청을 학습 조건별로 묶어 한 번에 예측"""
+
+    def __init__(self, cache, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.cache = cache
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True, name="micro-batcher").start()
+
+    def submit(self, dates, temps, names=None, model_filter=None):
+        """요청을 검증하고 모델을 준비한 뒤 큐에 넣음 (잘못된 요청은 여기서 ValueError)"""
+        X, names, model_filter = validate_supply_request(dates, temps, names, model_filter)
+        key, models, table = self.cache.supply(model_filter)
+        future = Future()
+        self._queue.put((X, names, (key, models, table), future))
+        return future
+
+    def _drain(self, batch):
+        """이미 큐에 있는 요청을 기다리지 않고 batch에 추가"""
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            self._drain(batch)
+            # 혼자 온 요청은 바로 처리하고, 요청이 몰릴 때만 시간 창 동안 더 모음
+            deadline = time.monotonic() + (self.window if len(batch) > 1 else 0)
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[2][0], []).append(item)
+            for items in groups.values():
+                self._run_group(items)
+
+    def _run_group(self, items):
+        """같은 모델 키의 요청을 한 번에 예측, 실패하면 요청마다 따로 예측해 각자 결과/예외 전달"""
+        _, models, table = items[0][2]
+        try:
+            names = sorted({name for _, item_names, _, _ in items for name in item_names})
+            X = pd.concat([item[0] for item in items], ignore_index=True)
+            predictions = predict_from_table(table, models, X, names)
+        except Exception:
+            for item_X, item_names, _, future in items:
+                try:
+                    future.set_result(predict_from_table(table, models, item_X, item_names))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for item_X, item_names, _, future in items:
+            end = offset + len(item_X)
+            future.set_result({name: predictions[name][offset:end] for name in item_names})
+            offset = end
+
+
+class ForecastService:
+    """HTTP 핸들러와 CLI가 공유하는 예측 진입점"""
+
+    def __init__(self, warm=True):
+        self.cache = ModelCache()
+        self.batcher = MicroBatcher(self.cache)
+        # 서비스는 기본 조건 모델을 시작 시 미리 준비 (첫 요청 지연 방지)
+        if warm:
+            self.cache.supply()
+
+    def supply(self, dates, temps, models=None, model_filter=None):
+        return self.batcher.submit(dates, temps, models, model_filter).result()
+
+    def temperature(self, max_temp, min_temp):
+        max_temp, min_temp = np.asarray(max_temp, dtype='float64'), np.asarray(min_temp, dtype='float64')
+        if max_temp.ndim != 1 or max_temp.shape != min_temp.shape:
+            raise ValueError("max_temp와 min_temp는 같은 길이의 숫자 목록이어야 합니다.")
+        X = pd.DataFrame({'최고기온': max_temp, '최저기온': min_temp})
+        return {name: model.predict(X) for name, model in self.cache.temperature_models.items()}
+
+
+def encode(result, accept=""):
+    """예측 결과 dict → (본문, Content-Type)"""
+    if ARROW_MIME in accept:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            pass
+        else:
+            table = pa.table({name: np.asarray(values) for name, values in result.items()})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes(), ARROW_MIME
+    body = json.dumps({name: np.asarray(values).round(3).tolist() for name, values in result.items()}, ensure_ascii=False)
+    return body.encode('utf-8'), "application/json; charset=utf-8"
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type="application/json; charset=utf-8"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'))
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, b'{"status": "ok"}')
+            else:
+                self._error(404, "not found")
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/supply":
+                    result = service.supply(payload['dates'], payload['temps'], payload.get('models'), payload.get('filter'))
+                elif self.path == "/temperature":
+                    result = service.temperature(payload['max_temp'], payload['min_temp'])
+                else:
+                    return self._error(404, "not found")
+            except (KeyError, ValueError, TypeError) as e:
+                return self._error(400, f"잘못된 요청: {e}")
+            self._send(200, *encode(result, self.headers.get("Accept", "")))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=8765):
+    service = ForecastService()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"✅ 예측 서비스 시작: http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공급량/기온 예측 서비스")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="HTTP 서비스 실행")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    supply_parser = sub.add_parser("supply", help="날짜별 평균기온으로 공급량 예측")
+    supply_parser.add_argument("--start", default=pd.Timestamp.today().strftime('%Y-%m-%d'), help="첫 기온의 날짜 (이후 하루씩, 기본: 오늘)")
+    supply_parser.add_argument("--temps", type=float, nargs="+", required=True)
+    supply_parser.add_argument("--models", nargs="+", help="예: KNN_m3 다항회귀_mj (기본: 전체)")
+
+    temp_parser = sub.add_parser("temperature", help="최고/최저기온으로 평균기온 예측")
+    temp_parser.add_argument("--max", type=float, nargs="+", required=True)
+    temp_parser.add_argument("--min", type=float, nargs="+", required=True)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args.host, args.port)
+    else:
+        if args.command == "temperature" and len(args.max) != len(args.min):
+            parser.error("--max와 --min의 개수가 같아야 합니다.")
+        service = ForecastService(warm=False)
+        if args.command == "supply":
+            dates = pd.date_range(args.start, periods=len(args.temps), freq='D')
+            result = service.supply(dates, args.temps, args.models)
+        else:
+            result = service.temperature(args.max, args.min)
+        print(encode(result)[0].decode('utf-8'))
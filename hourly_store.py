@@ -0,0 +1,269 @@
+"""시간별 기온/공급량 저장소 (ASOS 시간자료 수집 + 시간별 공급량 가져오기)
+
+시간 자료는 일자료의 24배라 CSV/데이터프레임 한 덩어리로 다루지 않는다.
+data/hourly/stn=<지점>/<연도>/<연-월>.npy에 월마다 (시간 수 × 3) float32
+배열 하나를 저장하고, 행 위치가 곧 '월 시작부터 몇 번째 시간'이라 시각은
+따로 저장하지 않는다 (없는 시간은 NaN). 한 달 파일은 최대 744 × 3 × 4바이트.
+
+- 수집: 월 단위로 API를 받아 해당 월 파일만 고쳐 쓴다
+- 공급량 가져오기: CSV를 청크로 읽어 월 파일에 나눠 쓴다
+- 일/월 집계: 월 파일을 하나씩 memmap으로 열어 (일 × 24) 모양으로 접어 계산하므로
+  전체 시간 자료를 한 번에 메모리에 올리지 않는다
+
+사용 예)
+    python hourly_store.py ingest --start 2024-01-01 --end 2024-03-31
+    python hourly_store.py import-supply hourly_supply.csv   # datetime,supply_m3,supply_mj
+    python hourly_store.py rollup --start 2024-01-01 --end 2024-03-31 --out daily_from_hourly.csv
+"""
+import argparse
+import calendar
+import warnings
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+
+from columnar_cache import atomic_write
+from data_store import BASE_COLUMNS, COLUMN_MAPPING, DATA_DIR, DEFAULT_STATION
+from temp_API import PAGE_SIZE, TIMEOUT, parse_response, service_key
+
+HOURLY_DIR = DATA_DIR / "hourly"
+HOURLY_URL = "http://apis.data.go.kr/1360000/AsosHourlyInfoService/getWthrDataList"
+HOURLY_COLUMNS = ['기온', '공급량(M3)', '공급량(MJ)']
+TEMP, SUPPLY_M3, SUPPLY_MJ = range(len(HOURLY_COLUMNS))
+SUPPLY_CHUNK_ROWS = 100_000
+
+
+# ---------------------------------------------------------------- 월 파티션
+
+def month_path(year, month, station=DEFAULT_STATION, root=HOURLY_DIR):
+    return root / f"stn={station}" / f"{year:04d}" / f"{year:04d}-{month:02d}.npy"
+
+
+def hours_in_month(year, month):
+    return calendar.monthrange(year, month)[1] * 24
+
+
+def iter_months(start, end):
+    """start~end 날짜 구간이 걸친 (연, 월) 순서대로"""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def read_month(year, month, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """월 배열(시간 × 컬럼)을 읽기 전용 memmap으로, 파일이 없으면 None"""
+    path = month_path(year, month, station, root)
+    if not path.exists():
+        return None
+    return np.load(path, mmap_mode='r')
+
+
+def _write_month(path, values):
+    """임시 파일에 쓴 뒤 rename으로 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(values, dtype='float32'))
+
+
+def update_month(year, month, hours, column, values, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """월 파일의 지정 시간(월 시작 기준 오프셋) 위치에 한 컬럼 값을 써 넣음"""
+    current = read_month(year, month, station, root)
+    if current is None:
+        updated = np.full((hours_in_month(year, month), len(HOURLY_COLUMNS)), np.nan, dtype='float32')
+    else:
+        updated = np.array(current)
+    updated[np.asarray(hours, dtype=np.intp), column] = values
+    _write_month(month_path(year, month, station, root), updated)
+
+
+def _split_by_month(timestamps):
+    """datetime64[h] 배열 → {(연, 월): (원래 위치, 월 내 시간 오프셋)}"""
+    months = timestamps.astype('datetime64[M]')
+    groups = {}
+    for month in np.unique(months):
+        positions = np.flatnonzero(months == month)
+        offsets = (timestamps[positions] - month.astype('datetime64[h]')).astype(np.intp)
+        year, month_no = int(str(month)[:4]), int(str(month)[5:7])
+        groups[(year, month_no)] = (positions, offsets)
+    return groups
+
+
+def write_hourly(timestamps, column, values, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """시각 배열과 값 배열을 월별로 나눠 저장, 고친 월 수 반환"""
+    timestamps = np.asarray(timestamps, dtype='datetime64[h]')
+    values = np.asarray(values, dtype='float32')
+    groups = _split_by_month(timestamps)
+    for (year, month), (positions, offsets) in groups.items():
+        update_month(year, month, offsets, column, values[positions], station, root)
+    return len(groups)
+
+
+# ---------------------------------------------------------------- 수집
+
+def build_hourly_params(day_start, day_end, page_no=1, station=DEFAULT_STATION, page_size=PAGE_SIZE):
+    """ASOS 시간자료 요청 파라미터 (YYYYMMDD, 00~23시)"""
+    return {
+        'serviceKey': service_key,
+        'pageNo': str(page_no),
+        'numOfRows': str(page_size),
+        'dataType': 'JSON',
+        'dataCd': 'ASOS',
+        'dateCd': 'HR',
+        'startDt': day_start,
+        'startHh': '00',
+        'endDt': day_end,
+        'endHh': '23',
+        'stnIds': station,
+    }
+
+
+def fetch_hourly(start, end, station=DEFAULT_STATION, session=None):
+    """start~end(날짜) 시간자료를 페이지 단위로 받아 (시각 배열, 기온 배열) 반환"""
+    session = session or requests.Session()
+    items, page_no = [], 1
+    while True:
+        params = build_hourly_params(start.strftime('%Y%m%d'), end.strftime('%Y%m%d'), page_no, station)
+        response = session.get(HOURLY_URL, params=params, timeout=TIMEOUT)
+        response.raise_for_status()
+        page_items, total = parse_response(response.json())
+        items.extend(page_items)
+        if not page_items or len(items) >= total:
+            break
+        page_no += 1
+    timestamps = pd.to_datetime([item['tm'] for item in items]).to_numpy().astype('datetime64[h]')
+    temps = pd.to_numeric(pd.Series([item.get('ta') for item in items], dtype=object), errors='coerce')
+    return timestamps, temps.to_numpy(dtype='float32')
+
+
+def ingest_hourly(start, end, station=DEFAULT_STATION, root=HOURLY_DIR, session=None):
+    """start~end를 월 단위로 받아 월 파일에 기온을 기록, 저장한 시간 수 반환"""
+    session = session or requests.Session()
+    saved = 0
+    for year, month in iter_months(start, end):
+        month_start = max(start, date(year, month, 1))
+        month_end = min(end, date(year, month, calendar.monthrange(year, month)[1]))
+        timestamps, temps = fetch_hourly(month_start, month_end, station, session)
+        if len(timestamps):
+            write_hourly(timestamps, TEMP, temps, station, root)
+            saved += len(timestamps)
+            print(f"✅ {year}-{month:02d}: {len(timestamps)}시간 저장")
+    return saved
+
+
+def import_supply(csv_path, station=DEFAULT_STATION, root=HOURLY_DIR, chunk_rows=SUPPLY_CHUNK_ROWS):
+    """시간별 공급량 CSV(datetime, supply_m3, supply_mj)를 청크 단위로 월 파일에 기록"""
+    imported = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        timestamps = pd.to_datetime(chunk['datetime']).to_numpy().astype('datetime64[h]')
+        for column, name in [(SUPPLY_M3, 'supply_m3'), (SUPPLY_MJ, 'supply_mj')]:
+            if name in chunk:
+                write_hourly(timestamps, column, pd.to_numeric(chunk[name], errors='coerce'), station, root)
+        imported += len(chunk)
+    return imported
+
+
+# ---------------------------------------------------------------- 집계
+
+def _nan_reduce(func, values, axis):
+    """NaN을 빼고 집계 (모두 NaN인 칸은 0이 아니라 NaN)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        out = func(values.astype('float64'), axis=axis)
+    return np.where(np.isnan(values).all(axis=axis), np.nan, out)
+
+
+def daily_rollup(start, end, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """시간 자료 → 일별 표 (weather_supply.csv와 같은 컬럼, 기온은 0.1℃ 단위), 한 번에 한 달씩 계산"""
+    frames = []
+    for year, month in iter_months(start, end):
+        values = read_month(year, month, station, root)
+        if values is None:
+            continue
+        days = values.reshape(-1, 24, len(HOURLY_COLUMNS))
+        temps = days[:, :, TEMP]
+        frame = pd.DataFrame({
+            '날짜': pd.date_range(date(year, month, 1), periods=len(days), freq='D'),
+            '평균기온': np.round(_nan_reduce(np.nanmean, temps, 1), 1),
+            '최고기온': np.round(_nan_reduce(np.nanmax, temps, 1), 1),
+            '최저기온': np.round(_nan_reduce(np.nanmin, temps, 1), 1),
+            '공급량(M3)': _nan_reduce(np.nansum, days[:, :, SUPPLY_M3], 1),
+            '공급량(MJ)': _nan_reduce(np.nansum, days[:, :, SUPPLY_MJ], 1),
+        })
+        frames.append(frame[(frame['날짜'] >= pd.Timestamp(start)) & (frame['날짜'] <= pd.Timestamp(end))])
+    if not frames:
+        return pd.DataFrame(columns=BASE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[BASE_COLUMNS]
+
+
+def monthly_rollup(start, end, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """시간 자료 → 월별 평균기온/공급량 합계 (공급량이 하루도 없는 달은 0이 아니라 NaN)"""
+    daily = daily_rollup(start, end, station, root)
+    dates = pd.DatetimeIndex(daily['날짜'])
+    grouped = daily.groupby([dates.year.rename('연'), dates.month.rename('월')])
+    return pd.DataFrame({
+        '평균기온': grouped['평균기온'].mean(),
+        '공급량_M3': grouped['공급량(M3)'].sum(min_count=1),
+        '공급량_MJ': grouped['공급량(MJ)'].sum(min_count=1),
+    }).reset_index()
+
+
+def hourly_profile(start, end, column=SUPPLY_M3, station=DEFAULT_STATION, root=HOURLY_DIR):
+    """시간대(0~23시)별 평균값 (예: 공급량 부하 형태), 한 달씩 누적"""
+    total = np.zeros(24)
+    count = np.zeros(24)
+    start_ts, end_ts = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    for year, month in iter_months(start, end):
+        values = read_month(year, month, station, root)
+        if values is None:
+            continue
+        days = values[:, column].reshape(-1, 24)
+        day_dates = np.datetime64(f"{year:04d}-{month:02d}-01") + np.arange(len(days))
+        days = days[(day_dates >= start_ts) & (day_dates <= end_ts)]
+        valid = ~np.isnan(days)
+        total += np.where(valid, days, 0).sum(axis=0)
+        count += valid.sum(axis=0)
+    with np.errstate(invalid='ignore'):
+        return pd.Series(total / np.where(count > 0, count, np.nan), index=pd.RangeIndex(24, name='시'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시간별 기온/공급량 저장소")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    yesterday = (datetime.today() - timedelta(days=1)).strftime('%Y-%m-%d')
+    ingest_parser = sub.add_parser("ingest", help="ASOS 시간자료 수집")
+    ingest_parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    ingest_parser.add_argument("--end", default=yesterday, help="YYYY-MM-DD (기본: 어제)")
+    ingest_parser.add_argument("--station", default=DEFAULT_STATION)
+
+    supply_parser = sub.add_parser("import-supply", help="시간별 공급량 CSV 가져오기 (datetime,supply_m3,supply_mj)")
+    supply_parser.add_argument("csv")
+    supply_parser.add_argument("--station", default=DEFAULT_STATION)
+
+    rollup_parser = sub.add_parser("rollup", help="시간 자료를 일별 표로 집계")
+    rollup_parser.add_argument("--start", required=True)
+    rollup_parser.add_argument("--end", default=yesterday)
+    rollup_parser.add_argument("--station", default=DEFAULT_STATION)
+    rollup_parser.add_argument("--out", help="일별 CSV 저장 경로 (weather_supply.csv 스키마)")
+
+    args = parser.parse_args()
+    if args.command == "import-supply":
+        print(f"✅ 공급량 {import_supply(Path(args.csv), args.station)}행 가져옴")
+    else:
+        start = datetime.strptime(args.start, '%Y-%m-%d').date()
+        end = datetime.strptime(args.end, '%Y-%m-%d').date()
+        if args.command == "ingest":
+            print(f"✅ 총 {ingest_hourly(start, end, args.station)}시간 저장")
+        else:
+            daily = daily_rollup(start, end, args.station)
+            if args.out:
+                daily.rename(columns={v: k for k, v in COLUMN_MAPPING.items()}).assign(
+                    date=lambda df: df['date'].dt.strftime('%Y-%m-%d')
+                ).to_csv(args.out, index=False, encoding='utf-8')
+                print(f"✅ {len(daily)}일 저장: {args.out}")
+            else:
+                print(daily.to_string(index=False))
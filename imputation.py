@@ -0,0 +1,119 @@
+"""결측 공급량/기온 보간
+
+- 공급량: MJ만 있는 날(2013년 초 등)은 주변 RATIO_WINDOW일의 열량비(MJ/M3)
+  이동 중앙값으로 M3를 계산하고, 반대로 M3만 있는 날은 MJ를 계산한다
+- 기온: 앞뒤 관측 사이가 MAX_TEMP_GAP일 이하인 짧은 공백만 날짜 간격 기준
+  선형 보간한다 (긴 공백은 그대로 결측)
+보간한 칸은 '<컬럼>_보간' 마스크 컬럼에 True로 표시된다.
+
+보간 결과는 원본 CSV 전체를 기준으로 데이터 버전마다 한 번만 계산해
+data/cache/<파일명>/imputed.npz에 저장하고, apply()는 날짜로 맞춰 붙이기만
+하므로 전체 데이터프레임과 파티션에서 읽은 일부 구간 모두 같은 값을 받는다.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+import columnar_cache
+
+MAX_TEMP_GAP = 3
+RATIO_WINDOW = 61  # 열량비 이동 중앙값 창 (일, 가운데 정렬)
+RATIO_MIN_PERIODS = 7
+IMPUTED_FILE = "imputed.npz"
+# 원본 컬럼 → 데이터프레임 컬럼
+TEMP_FIELDS = {'avg_temp': '평균기온', 'max_temp': '최고기온', 'min_temp': '최저기온'}
+SUPPLY_FIELDS = {'supply_m3': '공급량(M3)', 'supply_mj': '공급량(MJ)'}
+MASK_COLUMNS = [f"{col}_보간" for col in [*TEMP_FIELDS.values(), *SUPPLY_FIELDS.values()]]
+RULES = {'max_temp_gap': MAX_TEMP_GAP, 'ratio_window': RATIO_WINDOW, 'ratio_min_periods': RATIO_MIN_PERIODS}
+# 보간 규칙이 바뀌면 dataset_version()이 바뀌어 모든 캐시가 새로 만들어지도록
+RULES_TAG = hashlib.sha256(json.dumps(RULES, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def fill_short_gaps(dates, values, max_gap=MAX_TEMP_GAP):
+    """날짜순 values의 NaN 중 앞뒤 관측 사이 빠진 날이 max_gap일 이하인 것만 선형 보간
+
+    반환값: (보간한 값, 보간 여부 마스크)
+    """
+    values = np.asarray(values, dtype='float64')
+    day = np.asarray(dates, dtype='datetime64[D]').astype('int64')
+    observed = np.flatnonzero(~np.isnan(values))
+    missing = np.flatnonzero(np.isnan(values))
+    mask = np.zeros(len(values), dtype=bool)
+    if len(observed) < 2 or len(missing) == 0:
+        return values, mask
+
+    nxt = np.searchsorted(observed, missing)
+    inside = (nxt > 0) & (nxt < len(observed))
+    missing, nxt = missing[inside], nxt[inside]
+    prev_day, next_day = day[observed[nxt - 1]], day[observed[nxt]]
+    short = next_day - prev_day - 1 <= max_gap
+    fill = missing[short]
+
+    filled = values.copy()
+    filled[fill] = np.round(np.interp(day[fill], day[observed], values[observed]), 1)
+    mask[fill] = True
+    return filled, mask
+
+
+def calorific_ratio(dates, m3, mj, window=RATIO_WINDOW, min_periods=RATIO_MIN_PERIODS):
+    """날짜별 열량비(MJ/M3) 이동 중앙값 (두 값이 모두 있는 날 기준, 양 끝은 가장 가까운 값)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where((m3 > 0) & (mj > 0), mj / m3, np.nan)
+    series = pd.Series(ratio, index=pd.DatetimeIndex(dates))
+    rolling = series.rolling(f"{window}D", center=True, min_periods=min_periods).median()
+    return rolling.ffill().bfill().to_numpy()
+
+
+def impute_columns(columns):
+    """원본 컬럼 dict(columnar_cache) → 날짜순 보간 값/마스크 dict"""
+    order = np.argsort(columns['date'], kind='stable')
+    dates = np.asarray(columns['date'])[order]
+    out = {'date': dates}
+
+    for raw in TEMP_FIELDS:
+        out[raw], out[f"{raw}_mask"] = fill_short_gaps(dates, np.asarray(columns[raw])[order])
+
+    m3 = np.asarray(columns['supply_m3'], dtype='float64')[order]
+    mj = np.asarray(columns['supply_mj'], dtype='float64')[order]
+    ratio = calorific_ratio(dates, m3, mj)
+    usable = np.isfinite(ratio) & (ratio > 0)
+    m3_mask = np.isnan(m3) & (mj > 0) & usable
+    mj_mask = np.isnan(mj) & (m3 > 0) & usable
+    out['supply_m3'] = np.where(m3_mask, np.round(mj / np.where(usable, ratio, 1)), m3)
+    out['supply_mj'] = np.where(mj_mask, np.round(m3 * np.where(usable, ratio, 1)), mj)
+    out['supply_m3_mask'], out['supply_mj_mask'] = m3_mask, mj_mask
+    return out
+
+
+_cache = columnar_cache.npz_cache()
+
+
+def get_imputed(path):
+    """원본 CSV 버전별 보간 결과 (메모리 → 디스크 캐시 → 새로 계산)"""
+    version = f"{columnar_cache.ensure(path)['version']}-{RULES_TAG}"
+    return _cache.get(
+        columnar_cache.cache_dir_for(path) / IMPUTED_FILE, version,
+        lambda previous: impute_columns(columnar_cache.load_columns(path)),
+    )
+
+
+def apply(df, path):
+    """df의 결측 칸을 path 기준 보간 값으로 채우고 '<컬럼>_보간' 마스크 컬럼 추가"""
+    imputed = get_imputed(path)
+    dates = df['날짜'].to_numpy().astype('datetime64[D]')
+    known = imputed['date']
+    pos = np.minimum(np.searchsorted(known, dates), max(len(known) - 1, 0))
+    found = (known[pos] == dates) if len(known) else np.zeros(len(dates), dtype=bool)
+
+    df = df.copy(deep=False)
+    for raw, col in {**TEMP_FIELDS, **SUPPLY_FIELDS}.items():
+        mask = np.zeros(len(df), dtype=bool)
+        mask[found] = imputed[f"{raw}_mask"][pos[found]]
+        if mask.any():
+            values = df[col].to_numpy(copy=True)
+            values[mask] = imputed[raw][pos[mask]]
+            df[col] = values
+        df[f"{col}_보간"] = mask
+    return df
@@ -0,0 +1,126 @@
+"""엑셀 원본(weather_suply.xlsx)을 공용 데이터 저장소 형식으로 변환
+
+`일별기온공급량` 시트를 openpyxl read-only 모드로 한 행씩 읽어
+필요한 컬럼만 weather_supply.csv와 같은 스키마의 CSV로 저장하고,
+바이너리 컬럼 캐시까지 미리 만들어 둔다. 페이지는 요청 시점에
+openpyxl을 전혀 사용하지 않는다.
+
+변환 결과(weather_supply_excel.csv)는 저장소에 커밋하지 않는 생성물이며,
+엑셀 파일이 더 새로우면 ensure_converted()가 다시 만든다. 일별 데이터의
+기준은 weather_supply.csv(temp_API.py로 갱신)이고, 엑셀 쪽은 월별_공급량
+페이지 전용이다. 두 파일의 차이는 compare()로 확인한다.
+
+사용 예)
+    python ingest_excel.py             # 변환 + weather_supply.csv와 비교
+    python ingest_excel.py --strict    # 불일치가 있으면 종료 코드 1
+"""
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+import columnar_cache
+from data_store import COLUMN_MAPPING, DATA_DIR, DATA_PATH, read_csv
+
+EXCEL_PATH = DATA_DIR / "weather_suply.xlsx"
+EXCEL_SHEET = "일별기온공급량"
+EXCEL_DATA_PATH = DATA_DIR / "weather_supply_excel.csv"
+
+# 엑셀 헤더(한국어) → 저장 컬럼(영어) 순서
+OUTPUT_COLUMNS = ['date', 'avg_temp', 'max_temp', 'min_temp', 'supply_mj', 'supply_m3']
+SOURCE_COLUMNS = {korean: english for english, korean in COLUMN_MAPPING.items()}
+
+
+def _format(value):
+    """엑셀 셀 값을 CSV 문자열로 변환 (빈 셀은 빈 문자열)"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    return str(float(value))
+
+
+def convert(excel_path=EXCEL_PATH, output_path=EXCEL_DATA_PATH, sheet_name=EXCEL_SHEET):
+    """엑셀 시트를 스트리밍으로 읽어 CSV로 저장 (임시 파일 후 rename), 저장한 행 수 반환"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows)
+        positions = {SOURCE_COLUMNS[name]: idx for idx, name in enumerate(header) if name in SOURCE_COLUMNS}
+        missing = set(OUTPUT_COLUMNS) - set(positions)
+        if missing:
+            raise ValueError(f"엑셀 시트에 필요한 컬럼이 없습니다: {sorted(missing)}")
+
+        count = 0
+        with columnar_cache.atomic_write(output_path, encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            writer.writerow(OUTPUT_COLUMNS)
+            for row in rows:
+                if row[positions['date']] is None:
+                    continue
+                writer.writerow([_format(row[positions[col]]) for col in OUTPUT_COLUMNS])
+                count += 1
+    finally:
+        wb.close()
+
+    columnar_cache.ensure(output_path)
+    return count
+
+
+def ensure_converted(excel_path=EXCEL_PATH, output_path=EXCEL_DATA_PATH):
+    """변환 CSV가 없거나 엑셀보다 오래됐으면 다시 변환, CSV 경로 반환"""
+    try:
+        fresh = os.stat(output_path).st_mtime_ns >= os.stat(excel_path).st_mtime_ns
+    except FileNotFoundError:
+        fresh = False
+    if not fresh:
+        convert(excel_path, output_path)
+    return output_path
+
+
+def compare(excel_csv=EXCEL_DATA_PATH, reference_csv=DATA_PATH, tolerance=1e-6):
+    """변환 결과와 weather_supply.csv를 날짜 기준으로 비교해 불일치 요약 반환"""
+    left = read_csv(excel_csv).set_index('날짜')
+    right = read_csv(reference_csv).set_index('날짜')
+    common = left.index.intersection(right.index)
+
+    report = {
+        '엑셀에만 있는 날짜': left.index.difference(right.index).tolist(),
+        'CSV에만 있는 날짜': right.index.difference(left.index).tolist(),
+    }
+    a = left.loc[common]
+    b = right.loc[common]
+    for col in a.columns:
+        x = a[col].to_numpy(dtype='float64')
+        y = b[col].to_numpy(dtype='float64')
+        both_nan = np.isnan(x) & np.isnan(y)
+        close = np.isclose(x, y, rtol=tolerance, atol=tolerance) | both_nan
+        report[f'{col} 불일치'] = common[~close].tolist()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="weather_suply.xlsx → weather_supply_excel.csv 변환")
+    parser.add_argument("--excel", default=str(EXCEL_PATH))
+    parser.add_argument("--output", default=str(EXCEL_DATA_PATH))
+    parser.add_argument("--strict", action="store_true", help="weather_supply.csv와 불일치가 있으면 실패 처리")
+    args = parser.parse_args()
+
+    count = convert(args.excel, args.output)
+    print(f"✅ {count}행 변환 완료: {args.output}")
+
+    report = compare(args.output)
+    mismatched = False
+    for name, dates in report.items():
+        if dates:
+            mismatched = True
+            preview = ", ".join(map(str, dates[:5])) + (" ..." if len(dates) > 5 else "")
+            print(f"⚠️ {name}: {len(dates)}건 ({preview})")
+    if not mismatched:
+        print("✅ weather_supply.csv와 일치합니다.")
+    sys.exit(1 if mismatched and args.strict else 0)
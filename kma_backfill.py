@@ -0,0 +1,157 @@
+"""기상청 ASOS 일자료 비동기 병렬 백필
+
+여러 지점(stnIds) × 여러 해의 빈 구간을 연 단위 조각으로 나눠 동시에
+요청한다.
+- 연결 풀을 공유하는 requests.Session을 asyncio 스레드로 실행
+- 동시 요청 수 상한(세마포어) + 토큰 버킷 속도 제한
+- 실패 시 지수 백오프(지터 포함) 재시도
+- 완료된 조각은 지점별로 날짜 순서가 이어지는 대로 바로 저장
+
+사용 예)
+    python kma_backfill.py --start 2013-01-01 --stations 143 159 --concurrency 8 --rate 5
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import temp_API
+from data_store import station_csv_path
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 5.0  # 초당 요청 수
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (asyncio용)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def make_session(concurrency):
+    """동시 요청 수만큼 연결을 재사용하는 세션"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def split_by_year(start, end):
+    """[start, end] 구간을 연 단위 조각으로 분할"""
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, date(start.year, 12, 31))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def plan(stations, start, end):
+    """지점별 저장되지 않은 구간을 연 단위 조각 목록으로 반환 {지점: [(시작, 끝), ...]}"""
+    jobs = {}
+    for station in stations:
+        sorted_dates = temp_API.existing_dates(station_csv_path(station))
+        chunks = []
+        for range_start, range_end in temp_API.missing_ranges(sorted_dates, start, end):
+            chunks.extend(split_by_year(range_start, range_end))
+        jobs[station] = chunks
+    return jobs
+
+
+async def fetch_chunk(session, bucket, semaphore, station, start, end, max_retries=MAX_RETRIES):
+    """한 조각을 재시도/속도 제한을 지키며 받아 데이터프레임으로 반환
+
+    조각 하나가 여러 페이지일 수 있으므로 토큰은 조각이 아니라 페이지 요청마다 받는다.
+    """
+    loop = asyncio.get_running_loop()
+    throttle = lambda: asyncio.run_coroutine_threadsafe(bucket.acquire(), loop).result()
+    for attempt in range(max_retries + 1):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(temp_API.fetch_range, start, end, station, session, throttle)
+            except (requests.RequestException, temp_API.ApiError, ValueError) as e:
+                if attempt == max_retries:
+                    raise
+                error = e
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random())
+        print(f"⚠️ {station} {start}~{end} 재시도 {attempt + 1}/{max_retries} ({delay:.1f}초 후): {error}")
+        await asyncio.sleep(delay)
+
+
+async def backfill(stations, start, end, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """여러 지점의 빈 구간을 동시에 받아 저장, 지점별 추가된 행 수 반환"""
+    jobs = plan(stations, start, end)
+    session = make_session(concurrency)
+    bucket = TokenBucket(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(station, idx, chunk_start, chunk_end):
+        df_new = await fetch_chunk(session, bucket, semaphore, station, chunk_start, chunk_end)
+        return station, idx, df_new
+
+    tasks = [
+        asyncio.create_task(run(station, idx, chunk_start, chunk_end))
+        for station, chunks in jobs.items()
+        for idx, (chunk_start, chunk_end) in enumerate(chunks)
+    ]
+
+    # 지점별로 앞 조각부터 순서대로 저장해야 append 경로(O(새 행))를 탈 수 있으므로,
+    # 먼저 끝난 뒷 조각은 앞 조각이 도착할 때까지 보관
+    pending = {station: {} for station in jobs}
+    next_idx = {station: 0 for station in jobs}
+    added = {station: 0 for station in jobs}
+    try:
+        for finished in asyncio.as_completed(tasks):
+            station, idx, df_new = await finished
+            pending[station][idx] = df_new
+            while next_idx[station] in pending[station]:
+                chunk_df = pending[station].pop(next_idx[station])
+                chunk_start, chunk_end = jobs[station][next_idx[station]]
+                count = await asyncio.to_thread(temp_API.append_rows, chunk_df, station_csv_path(station))
+                print(f"✅ {station} {chunk_start} ~ {chunk_end}: {count}행 추가")
+                added[station] += count
+                next_idx[station] += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        session.close()
+    return added
+
+
+if __name__ == "__main__":
+    parse_date = lambda s: datetime.strptime(s, '%Y-%m-%d').date()
+    parser = argparse.ArgumentParser(description="기상청 ASOS 일자료 병렬 백필")
+    parser.add_argument("--start", type=parse_date, required=True, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, default=(datetime.now() - timedelta(days=1)).date(), help="종료일 (기본: 어제)")
+    parser.add_argument("--stations", nargs="+", default=[temp_API.DEFAULT_STATION], help="지점번호 목록")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 요청 수 상한")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="초당 최대 요청 수")
+    args = parser.parse_args()
+
+    result = asyncio.run(backfill(args.stations, args.start, args.end, args.concurrency, args.rate))
+    for station, count in result.items():
+        print(f"✅ {station}: 총 {count}행 추가")
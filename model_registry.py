@@ -0,0 +1,118 @@
+"""디스크 기반 학습 모델 저장소
+
+학습 조건(필터), 데이터 버전, 하이퍼파라미터를 해시한 키로 모델을
+joblib 파일에 저장해 세션과 워커 사이에서 공유한다. 읽을 때는
+memmap으로 열어 큰 배열(트리 노드 등)을 복사하지 않으며, 전체 크기가
+상한을 넘으면 가장 오래 쓰지 않은 항목부터 지운다(LRU).
+"""
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+
+from columnar_cache import VersionedCache, atomic_write
+from data_store import BASE_DIR
+
+REGISTRY_DIR = BASE_DIR / "models" / "registry"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+MEMORY_ITEMS = 8
+
+
+def make_key(**parts):
+    """키 구성 요소(dict/list/str 등)를 정렬된 JSON으로 직렬화해 sha256 해시"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class ModelRegistry:
+    """joblib 파일 기반 모델 저장소 (프로세스 내 메모리 LRU + 디스크 LRU)"""
+
+    def __init__(self, root=REGISTRY_DIR, max_bytes=DEFAULT_MAX_BYTES, memory_items=MEMORY_ITEMS):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        return self.root / f"{key}.joblib"
+
+    def load(self, key):
+        """키에 해당하는 모델 반환, 없거나 읽을 수 없으면(깨진 파일 등) None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self.path_for(key)
+        try:
+            obj = joblib.load(path, mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        except VersionedCache.READ_ERRORS as e:
+            warnings.warn(f"저장된 모델을 읽지 못해 다시 만듭니다 ({path}): {e!r}", RuntimeWarning)
+            return None
+        # 접근 시각을 갱신해 디스크 LRU 순서로 사용 (다른 사용자의 파일이면 건너뜀)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._remember(key, obj)
+        return obj
+
+    def save(self, key, obj):
+        """모델을 임시 파일에 쓴 뒤 rename으로 교체하고, 용량 초과분 정리"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path_for(key), 'wb') as f:
+            joblib.dump(obj, f)
+        self._remember(key, obj)
+        self.evict()
+        return obj
+
+    def get_or_create(self, key, build):
+        """저장된 모델이 있으면 반환, 없으면 build()로 만들어 저장"""
+        obj = self.load(key)
+        if obj is None:
+            obj = self.save(key, build())
+        return obj
+
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 쓰지 않은 파일 삭제"""
+        entries = []
+        for path in self.root.glob("*.joblib"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._memory.pop(path.stem, None)
+            total -= size
+
+    def _remember(self, key, obj):
+        with self._lock:
+            self._memory[key] = obj
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+
+_default_registry = None
+
+
+def get_registry():
+    """프로세스 공용 기본 저장소"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
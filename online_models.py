@@ -0,0 +1,230 @@
+"""선형/다항 모델의 증분(온라인) 갱신
+
+선형·다항 회귀는 충분통계량 XᵀX, Xᵀy만 있으면 다시 풀 수 있다.
+충분통계량을 (연, 월, 요일) 칸별로 누적해 두면
+- 새 날짜 하루 추가 = 해당 칸에 외적 하나 더하기 (O(1))
+- 사이드바 필터(연/월/요일 조합)별 모델 = 선택된 칸의 합을 풀기 (O(칸 수))
+가 되어 데이터가 늘어도 갱신 비용이 일정하다. 이미 반영한 날짜의 값이
+나중에 바뀌면(예: 공급량이 뒤늦게 채워짐) 옛 기여분을 빼고 새 값을 더한다.
+
+트리 모델은 증분 갱신이 어려우므로 `python online_models.py`를 데이터
+수집(temp_API.py) 뒤에 스케줄로 실행해 통계량 갱신과 함께 기본 조건의
+트리 모델을 요청 경로 밖에서 미리 다시 학습해 둔다.
+"""
+import hashlib
+
+import joblib
+import numpy as np
+
+from columnar_cache import pickle_cache
+from data_quality import valid_rows
+from data_store import BASE_DIR
+from features import input_features
+
+STATS_DIR = BASE_DIR / "models" / "online"
+BASE_YEAR = 2000
+MAX_YEARS = 60
+CELLS = MAX_YEARS * 12 * 7
+# 다항식 항의 크기를 맞춰 정규방정식의 조건수를 낮추기 위한 기온 스케일
+TEMP_SCALE = 10.0
+
+
+def poly_design(temps, degree=3):
+    """평균기온 → [1, t, t², t³] (t = 기온/10)"""
+    t = np.asarray(temps, dtype='float64') / TEMP_SCALE
+    return np.vander(t, degree + 1, increasing=True)
+
+
+def supply_design(X):
+    """[평균기온, HDD, 달력...] → [1, t, t², t³, HDD, 달력...] (기온만 3차 다항식)"""
+    X = np.asarray(X, dtype='float64')
+    return np.column_stack([poly_design(X[:, 0]), X[:, 1:]])
+
+
+def linear_design(X):
+    """[최고기온, 최저기온] → [1, 최고기온, 최저기온]"""
+    X = np.asarray(X, dtype='float64')
+    return np.column_stack([np.ones(len(X)), X])
+
+
+class OnlineLinearModel:
+    """충분통계량에서 푼 계수로 예측하는 회귀 모델 (sklearn predict 인터페이스)"""
+
+    def __init__(self, feature_names, design, coef):
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.design = design
+        self.coef_ = coef
+
+    def predict(self, X):
+        X = np.asarray(X, dtype='float64')
+        features = X[:, 0] if self.design is poly_design else X
+        return self.design(features) @ self.coef_
+
+
+def fit_design(feature_names, design, X, y):
+    """입력 배열 전체로 설계행렬을 만들어 최소제곱으로 바로 푼 모델 (칸별 누적 없이, 백테스트 fold용)"""
+    X = np.asarray(X, dtype='float64')
+    phi = design(X[:, 0] if design is poly_design else X)
+    coef = np.linalg.lstsq(phi, np.asarray(y, dtype='float64'), rcond=None)[0]
+    return OnlineLinearModel(feature_names, design, coef)
+
+
+class SufficientStats:
+    """(연, 월, 요일) 칸별 XᵀX / Xᵀy 누적 통계량
+
+    feature_cols: 설계행렬을 만들 입력 컬럼, target_cols: 목표 컬럼들
+    design: 입력 배열 → 설계행렬 함수 (poly_design / supply_design / linear_design)
+    """
+
+    def __init__(self, feature_cols, target_cols, design):
+        self.feature_cols = list(feature_cols)
+        self.target_cols = list(target_cols)
+        self.design = design
+        p = design(np.zeros(1) if design is poly_design else np.zeros((1, len(feature_cols)))).shape[1]
+        self.xtx = np.zeros((CELLS, p, p))
+        self.xty = np.zeros((CELLS, p, len(target_cols)))
+        self.count = np.zeros(CELLS, dtype='int64')
+        # 반영된 행 기록 (값이 바뀐 행을 찾아 되돌리기 위함)
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.values = np.empty((0, len(feature_cols) + len(target_cols)))
+
+    @staticmethod
+    def cell_index(years, months, weekdays):
+        years = np.asarray(years, dtype='int64')
+        if ((years < BASE_YEAR) | (years >= BASE_YEAR + MAX_YEARS)).any():
+            raise ValueError(f"{BASE_YEAR}~{BASE_YEAR + MAX_YEARS - 1}년 범위를 벗어난 데이터입니다.")
+        return ((years - BASE_YEAR) * 12 + (np.asarray(months) - 1)) * 7 + np.asarray(weekdays)
+
+    def _features(self, values):
+        x = values[:, :len(self.feature_cols)]
+        return self.design(x[:, 0] if self.design is poly_design else x)
+
+    def _accumulate(self, cells, values, sign):
+        if len(cells) == 0:
+            return
+        phi = self._features(values)
+        y = values[:, len(self.feature_cols):]
+        np.add.at(self.xtx, cells, sign * phi[:, :, None] * phi[:, None, :])
+        np.add.at(self.xty, cells, sign * phi[:, :, None] * y[:, None, :])
+        np.add.at(self.count, cells, sign)
+
+    def refresh(self, data):
+        """data 기준으로 통계량을 맞춤: 새 행은 더하고, 값이 바뀌었거나 사라진(품질이상 포함) 행은 뺀다
+
+        반환값: (추가된 행 수, 제거된 행 수)
+        """
+        columns = self.feature_cols + self.target_cols
+        complete = valid_rows(data).dropna(subset=columns)
+        dates = complete['날짜'].to_numpy().astype('datetime64[D]')
+        values = complete[columns].to_numpy(dtype='float64')
+        cells = self.cell_index(complete['연'], complete['월'], complete['요일코드'])
+
+        order = np.argsort(dates)
+        dates, values, cells = dates[order], values[order], cells[order]
+
+        # 기존 기록과 날짜로 맞춰 비교 (정렬 배열 이진 탐색)
+        if len(self.dates):
+            pos = np.minimum(np.searchsorted(self.dates, dates), len(self.dates) - 1)
+            known = self.dates[pos] == dates
+        else:
+            pos = np.zeros(len(dates), dtype=np.intp)
+            known = np.zeros(len(dates), dtype=bool)
+        unchanged = known.copy()
+        unchanged[known] = np.all(self.values[pos[known]] == values[known], axis=1)
+
+        keep_old = np.zeros(len(self.dates), dtype=bool)
+        keep_old[pos[unchanged]] = True
+        if (~keep_old).any():
+            old_dates = self.dates[~keep_old]
+            old_values = self.values[~keep_old]
+            old_cells = self.cell_index(
+                old_dates.astype('datetime64[Y]').astype(int) + 1970,
+                old_dates.astype('datetime64[M]').astype(int) % 12 + 1,
+                (old_dates.astype('int64') + 3) % 7,  # 1970-01-01은 목요일(3)
+            )
+            self._accumulate(old_cells, old_values, -1)
+
+        added = ~unchanged
+        self._accumulate(cells[added], values[added], 1)
+        self.dates, self.values = dates, values
+        return int(added.sum()), int((~keep_old).sum())
+
+    def solve(self, years, months, weekdays, target):
+        """선택한 연/월/요일 칸을 합쳐 목표 컬럼의 계수 계산"""
+        y_idx = self.target_cols.index(target)
+        grid = np.array(np.meshgrid(years, months, weekdays, indexing='ij')).reshape(3, -1)
+        cells = self.cell_index(*grid) if grid.size else np.array([], dtype='int64')
+        if self.count[cells].sum() == 0:
+            raise ValueError("선택한 조건에 학습할 데이터가 없습니다.")
+        xtx = self.xtx[cells].sum(axis=0)
+        xty = self.xty[cells, :, y_idx].sum(axis=0)
+        return np.linalg.lstsq(xtx, xty, rcond=None)[0]
+
+    def model(self, years, months, weekdays, target):
+        return OnlineLinearModel(self.feature_cols, self.design, self.solve(years, months, weekdays, target))
+
+    def all_cells(self, target):
+        """필터 없이 전체 데이터로 푼 모델"""
+        y_idx = self.target_cols.index(target)
+        if self.count.sum() == 0:
+            raise ValueError("학습할 데이터가 없습니다.")
+        coef = np.linalg.lstsq(self.xtx.sum(axis=0), self.xty[:, :, y_idx].sum(axis=0), rcond=None)[0]
+        return OnlineLinearModel(self.feature_cols, self.design, coef)
+
+
+_cache = pickle_cache(joblib.load, joblib.dump)
+
+
+def fingerprint(data, columns):
+    """통계량에 반영될 행(날짜 + 값)의 해시, 같은 data면 갱신을 건너뛰는 키"""
+    rows = valid_rows(data).dropna(subset=columns)
+    digest = hashlib.sha256(rows['날짜'].to_numpy().astype('datetime64[D]').tobytes())
+    digest.update(rows[columns].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()[:16]
+
+
+def get_stats(name, data, feature_cols, target_cols, design):
+    """이름별 통계량을 디스크에서 불러와 data에 맞춰 갱신 후 반환 (같은 내용의 data면 한 번만)"""
+    def compute(stats):
+        if stats is None or stats.feature_cols != list(feature_cols) or stats.target_cols != list(target_cols):
+            stats = SufficientStats(feature_cols, target_cols, design)
+        stats.refresh(data)
+        return stats
+
+    version = fingerprint(data, list(feature_cols) + list(target_cols))
+    return _cache.get(STATS_DIR / f"{name}.joblib", version, compute)
+
+
+def supply_stats(data):
+    """평균기온(3차) + HDD/달력 → 공급량(M3/MJ) 통계량"""
+    from supply_models import FEATURES, TARGETS
+    X = input_features(data['날짜'], data['평균기온'])
+    data = data.assign(**{col: X[col].to_numpy() for col in FEATURES})
+    return get_stats('supply_poly3', data, FEATURES, list(TARGETS.values()), supply_design)
+
+
+def temperature_stats(data):
+    """최고/최저기온 → 평균기온 선형 통계량"""
+    from temp_models import FEATURES, TARGET
+    return get_stats('temperature_linear', data, FEATURES, [TARGET], linear_design)
+
+
+def scheduled_refresh():
+    """데이터 갱신 후 실행: 통계량 증분 반영 + 기본 조건 트리 모델을 미리 재학습"""
+    from calendar_table import WEEKDAY_NAMES
+    from data_store import get_daily
+    from supply_models import get_trained_models
+
+    data = get_daily()
+    for name, stats_fn in [('공급량 다항식', supply_stats), ('기온 선형', temperature_stats)]:
+        stats = stats_fn(data)
+        print(f"✅ {name} 통계량 갱신 완료 (반영 행 {len(stats.dates)}개)")
+
+    years = sorted(int(y) for y in data['연'].unique())[-3:]
+    get_trained_models(data, years, list(range(1, 13)), WEEKDAY_NAMES)
+    print(f"✅ 기본 조건({years[0]}~{years[-1]}년) 공급량 모델 준비 완료")
+
+
+if __name__ == "__main__":
+    scheduled_refresh()
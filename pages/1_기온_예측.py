@@ -1,84 +1,47 @@
-import os
 import streamlit as st
 import pandas as pd
-import holidays
-import pickle
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
 from datetime import datetime, timedelta
-from pathlib import Path
+import temp_models
+from data_store import get_daily
 
 st.set_page_config(layout="wide")
 st.title("일별 기온 예측")
 
-# ✅ 프로젝트 루트 디렉토리 기준 상대경로 설정
-BASE_DIR = Path(os.getcwd())
-DATA_PATH = BASE_DIR / "data" / "weather_supply.csv"
-
-# ✅ 1️⃣ 데이터 로드 함수 (CSV 파일 사용, 컬럼명을 한국어로 변경)
-@st.cache_data
-def load_data():
-    """CSV 파일에서 데이터 로드 및 컬럼명 한국어로 변경"""
-    df = pd.read_csv(DATA_PATH, encoding='utf-8', sep=',')
-    
-    column_mapping = {
-        'date': '날짜',
-        'avg_temp': '평균기온',
-        'max_temp': '최고기온',
-        'min_temp': '최저기온',
-        'supply_m3': '공급량(M3)',
-        'supply_mj': '공급량(MJ)',
-    }
-    
-    df.rename(columns=column_mapping, inplace=True)
-    return df[['날짜', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']]
-
-# ✅ 2️⃣ 컬럼 추가 함수
-def add_columns(df):
-    """데이터프레임에 연, 월, 일, 요일, 공휴일 컬럼 추가"""
-    df = df.copy()
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    df['연'] = df['날짜'].dt.year
-    df['월'] = df['날짜'].dt.month
-    df['일'] = df['날짜'].dt.day
-
-    weekday_map = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
-    df['요일'] = df['날짜'].dt.weekday.map(weekday_map)
-    
-    kr_holidays = holidays.KR(years=df['연'].unique())
-    df['공휴일'] = df['날짜'].apply(lambda x: kr_holidays.get(x, ""))
-
-    return df
-
-# ✅ 데이터 로드 및 컬럼 추가 적용
-data = load_data()
-data = add_columns(data)
-
-def train_and_save_models():
-    data_clean = data[['최고기온', '최저기온', '평균기온']].dropna()
-    X_temp = data_clean[['최고기온', '최저기온']]
-    y_temp = data_clean['평균기온']
-
-    temp_model_linear = LinearRegression().fit(X_temp, y_temp)
-    with open('temp_model_linear.pkl', 'wb') as f:
-        pickle.dump(temp_model_linear, f)
-
-    temp_model_rf = RandomForestRegressor(random_state=42).fit(X_temp, y_temp)
-    with open('temp_model_rf.pkl', 'wb') as f:
-        pickle.dump(temp_model_rf, f)
-
-    return temp_model_linear, temp_model_rf
-
-try:
-    with open('temp_model_linear.pkl', 'rb') as f:
-        temp_model_linear = pickle.load(f)
-    with open('temp_model_rf.pkl', 'rb') as f:
-        temp_model_rf = pickle.load(f)
-    st.success("✅ 모델 로드 완료")
-except:
-    st.warning("⚠️ 모델 파일이 없어 훈련을 시작합니다...")
-    temp_model_linear, temp_model_rf = train_and_save_models()
-    st.success("✅ 모델 훈련 및 저장 완료!")
+# ✅ 공용 데이터 저장소에서 일별 데이터 로드 (연/월/일/요일/공휴일 포함)
+data = get_daily()
+
+# ✅ 모델 로드 (프로세스당 한 번, 아티팩트 버전이 바뀌면 다시 로드)
+@st.cache_resource
+def load_temperature_models(version):
+    """버전별 기온 예측 모델 로드 (해시/형태 검증 포함)"""
+    return temp_models.load_models()
+
+temperature_models, load_problems = load_temperature_models(temp_models.current_version())
+for problem in load_problems:
+    st.warning(f"⚠️ {problem}")
+
+# ✅ 재학습은 버튼으로만, 백그라운드에서 실행
+if st.sidebar.button("모델 다시 학습하기"):
+    temp_models.start_retrain(data)
+
+@st.fragment(run_every=1)
+def retrain_progress():
+    """재학습이 끝나면 페이지를 다시 실행해 새 모델 반영"""
+    future = temp_models.retrain_future()
+    if future.done():
+        st.rerun()
+    st.info("⏳ 모델 재학습 중... (기존 모델로 계속 예측할 수 있습니다)")
+
+future = temp_models.retrain_future()
+if future is not None and not future.done():
+    retrain_progress()
+elif future is not None and future.exception() is not None:
+    st.error(f"❌ 모델 재학습 실패: {future.exception()}")
+
+if temperature_models:
+    st.success(f"✅ 모델 로드 완료 ({', '.join(temperature_models)})")
+else:
+    st.error("❌ 사용할 수 있는 모델이 없습니다. 사이드바의 '모델 다시 학습하기'를 눌러주세요.")
 
 st.sidebar.title("📅 예측 기간 설정")
 today = datetime.today()
@@ -101,8 +64,10 @@ if st.button("예측하기"):
         st.error("❌ 모든 날짜의 최고기온과 최저기온을 입력해주세요.")
     else:
         X_pred = edited_df[['최고기온', '최저기온']]
-        edited_df['평균기온(선형회귀)'] = temp_model_linear.predict(X_pred).round(1)
-        edited_df['평균기온(랜덤포레스트)'] = temp_model_rf.predict(X_pred).round(1)
+        if 'linear' in temperature_models:
+            edited_df['평균기온(선형회귀)'] = temperature_models['linear'].predict(X_pred).round(1)
+        if 'rf' in temperature_models:
+            edited_df['평균기온(랜덤포레스트)'] = temperature_models['rf'].predict(X_pred).round(1)
 
         st.session_state['result_temp_df'] = edited_df.copy()
 
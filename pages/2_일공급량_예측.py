@@ -1,93 +1,20 @@
-import os
 import streamlit as st
-from pathlib import Path
 import pandas as pd
-import holidays
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.pipeline import make_pipeline
+import numpy as np
+import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from data_store import get_daily
+from features import input_features
+from response_tables import get_response_table, predict as predict_from_table
+from scenario_forecast import forecast as scenario_forecast, shift_scenarios
+from supply_models import MODEL_NAMES
+from training_jobs import get_queue
 
 st.set_page_config(layout="wide")
 st.title("일별 공급량 예측")
 
-# ✅ 프로젝트 루트 디렉토리 기준 상대경로 설정
-BASE_DIR = Path(os.getcwd())  
-DATA_PATH = BASE_DIR / "data" / "weather_supply.csv"
-
-# ✅ 1️⃣ 데이터 로드 함수 (CSV 파일 사용, 컬럼명을 한국어로 변경)
-@st.cache_data
-def load_data():
-    """CSV 파일에서 데이터 로드 및 컬럼명 한국어로 변경"""
-    df = pd.read_csv(DATA_PATH, encoding='utf-8', sep=',')
-    
-    column_mapping = {
-        'date': '날짜',
-        'avg_temp': '평균기온',
-        'max_temp': '최고기온',
-        'min_temp': '최저기온',
-        'supply_m3': '공급량(M3)',
-        'supply_mj': '공급량(MJ)',
-    }
-    
-    df.rename(columns=column_mapping, inplace=True)
-    return df[['날짜', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']]
-
-# ✅ 2️⃣ 컬럼 추가 함수
-def add_columns(df):
-    """데이터프레임에 연, 월, 일, 요일, 공휴일 컬럼 추가"""
-    df = df.copy()
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    df['연'] = df['날짜'].dt.year
-    df['월'] = df['날짜'].dt.month
-    df['일'] = df['날짜'].dt.day
-
-    weekday_map = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
-    df['요일'] = df['날짜'].dt.weekday.map(weekday_map)
-    
-    kr_holidays = holidays.KR(years=df['연'].unique())
-    df['공휴일'] = df['날짜'].apply(lambda x: kr_holidays.get(x, ""))
-
-    return df
-
-# ✅ 데이터 로드 및 컬럼 추가 적용
-data = load_data()
-data = add_columns(data)
-
-# ✅ 2️⃣ 모델 학습 및 저장 함수
-def train_models():
-    """선택된 모델 학습 및 저장"""
-    selected_years = st.session_state.get("selected_years", sorted(data['연'].unique()))
-    selected_months = st.session_state.get("selected_months", list(range(1, 13)))
-    selected_days = st.session_state.get("selected_days", data['요일'].unique())
-
-    train_data = data[
-        (data['연'].isin(selected_years)) &
-        (data['월'].isin(selected_months)) &
-        (data['요일'].isin(selected_days))
-    ].dropna(subset=['평균기온', '공급량(M3)', '공급량(MJ)'])
-
-    X_train = train_data[['평균기온']]
-    y_train_m3 = train_data['공급량(M3)']
-    y_train_mj = train_data['공급량(MJ)']
-
-    models = {
-        "다항회귀": lambda: make_pipeline(PolynomialFeatures(3), LinearRegression()),
-        "랜덤포레스트": lambda: RandomForestRegressor(random_state=42),
-        "KNN": lambda: KNeighborsRegressor(),
-        "결정트리": lambda: DecisionTreeRegressor(random_state=42),
-        "그레디언트부스팅": lambda: GradientBoostingRegressor(random_state=42)
-    }
-
-    trained_models = {}
-    for name, model_fn in models.items():
-        trained_models[name + "_m3"] = model_fn().fit(X_train, y_train_m3)
-        trained_models[name + "_mj"] = model_fn().fit(X_train, y_train_mj)
-
-    return trained_models
+# ✅ 공용 데이터 저장소에서 일별 데이터 로드 (연/월/일/요일/공휴일 포함)
+data = get_daily()
 
 # ✅ 3️⃣ UI - 사이드바 설정
 st.sidebar.title("📚 학습 데이터 설정")
@@ -106,23 +33,68 @@ if start_date > end_date:
 # ✅ 4️⃣ 모델 선택
 selected_models = st.sidebar.multiselect(
     "모델 선택",
-    ["다항회귀", "랜덤포레스트", "KNN", "결정트리", "그레디언트부스팅"],
-    default=["다항회귀", "랜덤포레스트", "KNN", "결정트리", "그레디언트부스팅"]
+    MODEL_NAMES,
+    default=MODEL_NAMES
+)
+use_response_table = st.sidebar.toggle(
+    "⚡ 빠른 예측 (기온-공급량 응답표)", value=False,
+    help="모델별로 달력 조합마다 0.1℃ 간격 응답표를 한 번 만들어 두고 보간으로 예측합니다."
 )
 
-# ✅ 5️⃣ 세션 상태 관리 및 모델 학습
-if "trained_models" not in st.session_state or \
+# ✅ 5️⃣ 모델 학습 요청 (백그라운드 큐에서 학습, 같은 조건은 모든 세션을 통틀어 한 번만 학습)
+training_queue = get_queue()
+retrain = st.sidebar.button("모델 다시 학습하기")
+if "training_job_id" not in st.session_state or \
    st.session_state.get("selected_years") != selected_years or \
    st.session_state.get("selected_months") != selected_months or \
    st.session_state.get("selected_days") != selected_days or \
-   st.sidebar.button("모델 다시 학습하기"):
-    
+   retrain:
+
     st.session_state["selected_years"] = selected_years
     st.session_state["selected_months"] = selected_months
     st.session_state["selected_days"] = selected_days
-    st.session_state["trained_models"] = train_models()
-    st.session_state["training_info"] = f"학습 데이터 연도: {', '.join(map(str, selected_years))}, 월: {selected_months}, 요일: {selected_days}"
-    st.success("✅ 모델 학습 완료")
+    job = training_queue.submit(data, selected_years, selected_months, selected_days, force=retrain)
+    st.session_state["training_job_id"] = job.job_id
+    st.session_state["pending_training_info"] = f"학습 데이터 연도: {', '.join(map(str, selected_years))}, 월: {selected_months}, 요일: {selected_days}"
+
+def adopt_finished_job(job):
+    """끝난 작업의 모델을 세션에 반영, 새로 반영했으면 True"""
+    if st.session_state.get("trained_job") == (job.job_id, job.finished_at):
+        return False
+    st.session_state["trained_models"] = job.result
+    st.session_state["trained_models_key"] = job.job_id
+    st.session_state["trained_job"] = (job.job_id, job.finished_at)
+    st.session_state["training_info"] = st.session_state["pending_training_info"]
+    return True
+
+@st.fragment(run_every=1)
+def training_progress():
+    """학습 진행률 표시, 끝나면 페이지 전체를 다시 실행해 새 모델 반영"""
+    job = training_queue.get(st.session_state["training_job_id"])
+    if job is None or job.status == 'done':
+        st.rerun()
+    elif job.status == 'failed':
+        st.error(f"❌ 모델 학습 실패: {job.error}")
+    else:
+        text = f"⏳ 모델 학습 중... ({job.done}/{job.total})" + (f" - {job.last_model} 완료" if job.last_model else "")
+        st.progress(job.progress, text=text)
+
+current_job = training_queue.get(st.session_state["training_job_id"])
+if current_job is not None and current_job.status == 'done':
+    if adopt_finished_job(current_job):
+        st.success("✅ 모델 학습 완료")
+else:
+    # 새 모델이 학습되는 동안 가장 최근에 끝난 모델로 예측
+    if "trained_models" not in st.session_state:
+        latest = training_queue.latest_completed()
+        if latest is not None:
+            st.session_state["trained_models"] = latest.result
+            st.session_state["trained_models_key"] = latest.job_id
+            st.session_state["training_info"] = "이전 학습 모델 사용 중 (새 모델 학습 중)"
+    if current_job is None:
+        st.warning("⚠️ 학습 작업을 찾을 수 없습니다. '모델 다시 학습하기'를 눌러주세요.")
+    else:
+        training_progress()
 
 # ✅ 6️⃣ 사용자 입력 데이터 생성 (예측 기간에 따라 갱신)
 def update_pred_df(start_date, end_date):
@@ -150,20 +122,32 @@ edited_df = st.data_editor(
 if st.button("예측하기"):
     st.session_state["pred_df"].update(edited_df)
 
-    if st.session_state["pred_df"]['평균기온'].isnull().any():
-        st.error("❌ 모든 날짜의 평균기온을 입력해주세요.")
+    if "trained_models" not in st.session_state:
+        st.error("❌ 모델 학습이 끝난 뒤 다시 시도해주세요.")
+    elif st.session_state["pred_df"][['날짜', '평균기온']].isnull().any(axis=None):
+        st.error("❌ 모든 행의 날짜와 평균기온을 입력해주세요.")
     else:
-        X_pred = st.session_state["pred_df"][['평균기온']]
+        # 모델 입력: 평균기온 + 날짜에서 만든 HDD/요일/공휴일 피처
+        X_pred = input_features(st.session_state["pred_df"]['날짜'], st.session_state["pred_df"]['평균기온'].astype(float))
 
         result_df = st.session_state["pred_df"].copy()
         result_df['날짜'] = result_df['날짜'].dt.strftime('%Y-%m-%d')
 
-        for model_name in selected_models:
-            model_m3 = st.session_state["trained_models"][model_name + "_m3"]
-            model_mj = st.session_state["trained_models"][model_name + "_mj"]
+        trained_models = st.session_state["trained_models"]
+        if use_response_table:
+            table = get_response_table(st.session_state["trained_models_key"], trained_models)
+            keys = [f"{model_name}_{unit}" for model_name in selected_models for unit in ('m3', 'mj')]
+            predictions = predict_from_table(table, trained_models, X_pred, keys)
+        else:
+            predictions = {}
+            for model_name in selected_models:
+                for unit in ('m3', 'mj'):
+                    key = f"{model_name}_{unit}"
+                    predictions[key] = trained_models[key].predict(X_pred)
 
-            result_df[model_name + '_M3'] = model_m3.predict(X_pred).astype(int)
-            result_df[model_name + '_MJ'] = model_mj.predict(X_pred).astype(int)
+        for model_name in selected_models:
+            result_df[model_name + '_M3'] = predictions[model_name + "_m3"].astype(int)
+            result_df[model_name + '_MJ'] = predictions[model_name + "_mj"].astype(int)
 
         # 예측 결과 데이터프레임에 필요한 열들만 포함
         result_df_m3 = result_df[['날짜', '평균기온'] + [f"{model}_M3" for model in selected_models]]
@@ -183,4 +167,50 @@ if "result_df_m3" in st.session_state and "result_df_mj" in st.session_state:
     st.write("### 예측 결과 - 열량 (MJ)")
     st.dataframe(st.session_state["result_df_mj"])
 
+# ✅ 🔟 기온 시나리오 일괄 예측 (입력 기온 ±k℃ 이동 시나리오 × 선택 모델)
+with st.expander("🌡 기온 시나리오 예측"):
+    max_shift = st.number_input("최대 기온 변화 (±℃)", min_value=0.0, max_value=15.0, value=3.0, step=0.5)
+    shift_step = st.number_input("시나리오 간격 (℃)", min_value=0.1, max_value=5.0, value=0.5, step=0.1)
+    scenario_unit = st.radio("단위", ['M3', 'MJ'], horizontal=True, key="scenario_unit")
+
+    if st.button("시나리오 예측하기"):
+        st.session_state["pred_df"].update(edited_df)
+        if "trained_models" not in st.session_state:
+            st.error("❌ 모델 학습이 끝난 뒤 다시 시도해주세요.")
+        elif st.session_state["pred_df"][['날짜', '평균기온']].isnull().any(axis=None):
+            st.error("❌ 모든 행의 날짜와 평균기온을 입력해주세요.")
+        else:
+            trained_models = st.session_state["trained_models"]
+            base = st.session_state["pred_df"]['평균기온'].astype(float).to_numpy()
+            shifts = np.round(np.arange(-max_shift, max_shift + shift_step / 2, shift_step), 1)
+            scenarios, scenario_names = shift_scenarios(base, shifts)
+            table = get_response_table(st.session_state["trained_models_key"], trained_models) if use_response_table else None
+            st.session_state["scenario_result"] = scenario_forecast(
+                trained_models, scenarios, st.session_state["pred_df"]['날짜'],
+                names=[f"{model_name}_{unit}" for model_name in selected_models for unit in ('m3', 'mj')],
+                table=table, scenario_names=scenario_names,
+            )
+
+    if "scenario_result" in st.session_state:
+        result = st.session_state["scenario_result"]
+        suffix = "_" + scenario_unit.lower()
+        summary = result.summary()
+        summary = summary[summary['모델'].str.endswith(suffix)].copy()
+        summary['모델'] = summary['모델'].str.removesuffix(suffix)
+
+        band_fig = go.Figure()
+        for model_name, model_summary in summary.groupby('모델', sort=False):
+            band_fig.add_trace(go.Scatter(
+                x=list(model_summary['날짜']) + list(model_summary['날짜'][::-1]),
+                y=list(model_summary['p90']) + list(model_summary['p10'][::-1]),
+                fill='toself', opacity=0.2, line=dict(width=0), name=f"{model_name} p10~p90", showlegend=False,
+            ))
+            band_fig.add_trace(go.Scatter(x=model_summary['날짜'], y=model_summary['p50'], mode='lines', name=f"{model_name} 중앙값"))
+        band_fig.update_layout(
+            title=f"시나리오 {len(result.scenarios)}개 공급량({scenario_unit}) 분포",
+            yaxis_title=f"공급량({scenario_unit})", height=450,
+        )
+        st.plotly_chart(band_fig, use_container_width=True)
+        st.dataframe(summary.round({'p10': 0, 'p50': 0, 'p90': 0}))
+
 st.markdown(f"**🔍 현재 학습 데이터 설정:** {st.session_state.get('training_info', '아직 학습 안됨')}")
\ No newline at end of file
@@ -1,10 +1,14 @@
-import os
-import streamlit as st
 import pandas as pd
-from pathlib import Path
-import holidays
+import streamlit as st
 import plotly.graph_objects as go
 from datetime import datetime
+from daily_charts import (
+    category_array, is_long_range, points_per_trace, prepare_daily_series, reduce_scatter, reduce_series,
+)
+from data_quality import rejected_days
+from data_store import DEFAULT_STATION, dataset_version, station_csv_path
+from figure_cache import cached_figure
+from partitioned_store import available_years, load_daily as load_partitions, stations
 
 st.set_page_config(layout="wide")
 
@@ -16,132 +20,117 @@ st.markdown("""
 - **공휴일 데이터**: Python `holidays` 패키지 활용
 """)
 
-# ✅ 프로젝트 루트 디렉토리 기준 상대경로 설정
-BASE_DIR = Path(os.getcwd())  
-DATA_PATH = BASE_DIR / "data" / "weather_supply.csv"
-
-# ✅ 1️⃣ 데이터 로드 함수 (CSV 파일 사용, 컬럼명을 한국어로 변경)
-@st.cache_data
-def load_data():
-    """CSV 파일에서 데이터 로드 및 컬럼명 한국어로 변경"""
-    df = pd.read_csv(DATA_PATH, encoding='utf-8', sep=',')
-    
-    column_mapping = {
-        'date': '날짜',
-        'avg_temp': '평균기온',
-        'max_temp': '최고기온',
-        'min_temp': '최저기온',
-        'supply_m3': '공급량(M3)',
-        'supply_mj': '공급량(MJ)',
-    }
-    
-    df.rename(columns=column_mapping, inplace=True)
-    return df[['날짜', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']]
-
-# ✅ 2️⃣ 컬럼 추가 함수
-def add_columns(df):
-    """데이터프레임에 연, 월, 일, 요일, 공휴일 컬럼 추가"""
-    df = df.copy()
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    df['연'] = df['날짜'].dt.year
-    df['월'] = df['날짜'].dt.month
-    df['일'] = df['날짜'].dt.day
-
-    weekday_map = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
-    df['요일'] = df['날짜'].dt.weekday.map(weekday_map)
-    
-    kr_holidays = holidays.KR(years=df['연'].unique())
-    df['공휴일'] = df['날짜'].apply(lambda x: kr_holidays.get(x, ""))
-
-    return df
-
-# ✅ 데이터 로드 및 컬럼 추가 적용
-data = load_data()
-data = add_columns(data)
-
 st.sidebar.title("🗓 필터 선택")
+station_list = stations()
+station = st.sidebar.selectbox("관측 지점", station_list) if len(station_list) > 1 else DEFAULT_STATION
 default_years = [2024, 2025]
 current_month = datetime.today().month
 
-selected_years = st.sidebar.multiselect("연도 선택", sorted(data['연'].unique()), default=default_years)
-selected_months = st.sidebar.multiselect("월 선택", sorted(data['월'].unique()), default=[current_month])
+year_options = available_years(station)
+selected_years = st.sidebar.multiselect("연도 선택", year_options, default=[y for y in default_years if y in year_options])
+selected_months = st.sidebar.multiselect("월 선택", list(range(1, 13)), default=[current_month])
+
+# ✅ 지점 × 연도 파티션 저장소에서 선택한 연/월 구간만 읽기 (연/월/일/요일/공휴일 포함)
+data = load_partitions(station, selected_years, selected_months)
+data_version = dataset_version(station_csv_path(station))
 
 st.sidebar.title("🗒 마커 표시 설정")
 show_day_info = st.sidebar.checkbox("요일/공휴일 표시", value=True)
 
-filtered_data = data[(data['연'].isin(selected_years)) & (data['월'].isin(selected_months))]
-filtered_data['월일'] = filtered_data['월'].astype(str) + '-' + filtered_data['일'].astype(str)
+# ✅ 연도별 트레이스 배열을 한 번에 준비 (라벨/마커 크기/누적 공급량)
+year_series = prepare_daily_series(data, selected_years, selected_months, show_day_info)
+
+# ✅ 장기간 모드: 점이 많으면 서버에서 다운샘플링하고 WebGL로 렌더링
+long_range = st.sidebar.toggle(
+    "🚀 장기간 모드 (다운샘플링 + WebGL)", value=is_long_range(year_series),
+    help="선택한 기간이 길면 자동으로 켜집니다. 선은 LTTB, 막대는 구간별 최소/최대로 점을 줄이고 라벨은 공휴일 위주로만 표시합니다."
+)
+Scatter = go.Scattergl if long_range else go.Scatter
+max_points = points_per_trace(year_series)
 
 color_map = {2023: 'blue', 2024: 'deepskyblue', 2025: 'red'}
 
-# (1) 일별 평균기온 변화 그래프
-temp_fig = go.Figure()
-# (2) 일별 공급량 변화 그래프
-supply_fig = go.Figure()
-# (3) 기온 vs 공급량 상관관계 그래프
-scatter_fig = go.Figure()
-# (4) 공급량 누적 그래프
-cumulative_fig = go.Figure()
-
-# ✅ 요일 및 공휴일 표시 개선
-if not filtered_data.empty:
-    for year in selected_years:
-        year_data = filtered_data[filtered_data['연'] == year].copy()
-        year_data['누적공급량(M3)'] = year_data['공급량(M3)'].cumsum()
-
-        # ✅ 마커 설정
-        marker_texts = []  # 요일 또는 공휴일 텍스트
-        marker_sizes = []  # 마커 크기 조정 (공휴일 강조)
-
-        for _, row in year_data.iterrows():
-            if show_day_info:
-                if row['공휴일']:  # 공휴일이 있으면 공휴일 이름을 표시
-                    marker_texts.append(row['공휴일'])
-                    marker_sizes.append(12)  # 공휴일 강조 (크기 증가)
-                else:
-                    marker_texts.append(row['요일'])
-                    marker_sizes.append(8)  # 일반 요일 (기본 크기)
-
-            else:
-                marker_texts.append("")  # 표시하지 않음
-                marker_sizes.append(8)
-
-        # (1) 평균기온 변화 그래프 (꺾은선 + 마커)
-        temp_fig.add_trace(go.Scatter(
-            x=year_data['월일'], y=year_data['평균기온'],
+# ✅ 그림 캐시: 그림마다 영향을 주는 필터 값만 키로 써서 세션 간에 재사용
+filter_state = dict(
+    version=data_version, station=station, years=selected_years, months=selected_months, long_range=long_range,
+)
+
+
+def fix_category_order(fig):
+    """점을 줄이면 연도마다 남은 날짜가 달라지므로 x축 순서를 날짜 순으로 고정"""
+    if long_range:
+        fig.update_xaxes(categoryorder='array', categoryarray=category_array(year_series))
+    return fig
+
+
+# (1) 일별 평균기온 변화 그래프 (꺾은선 + 마커, 요일/공휴일 표시)
+def build_temp_fig():
+    fig = go.Figure()
+    for series in year_series:
+        year = series.year
+        temp_series = reduce_series(series, 'temperature', max_points) if long_range else series
+        fig.add_trace(Scatter(
+            x=temp_series.x, y=temp_series.temperature,
             mode='lines+markers+text' if show_day_info else 'lines+markers',
             name=f"{year} 평균기온",
             line=dict(color=color_map.get(year)),
-            marker=dict(size=marker_sizes, symbol='circle'),
-            text=marker_texts, textposition='top center', textfont=dict(size=9)
+            marker=dict(size=temp_series.sizes, symbol='circle'),
+            text=temp_series.texts, textposition='top center', textfont=dict(size=9)
         ))
+    return fix_category_order(fig)
 
-        # (2) 공급량 변화 그래프 (막대그래프)
-        supply_fig.add_trace(go.Bar(
-            x=year_data['월일'], y=year_data['공급량(M3)'],
+
+# (2) 일별 공급량 변화 그래프 (막대그래프)
+def build_supply_fig():
+    fig = go.Figure()
+    for series in year_series:
+        year = series.year
+        supply_series = reduce_series(series, 'supply', max_points, method='minmax') if long_range else series
+        fig.add_trace(go.Bar(
+            x=supply_series.x, y=supply_series.supply,
             name=f"{year} 공급량(M3)",
             marker=dict(color=color_map.get(year), opacity=0.5),
             width=0.3
         ))
+    return fix_category_order(fig)
+
 
-        # (3) 기온 vs 공급량 상관관계 그래프
-        scatter_fig.add_trace(go.Scatter(
-            x=year_data['평균기온'], y=year_data['공급량(M3)'],
+# (3) 기온 vs 공급량 상관관계 그래프
+def build_scatter_fig():
+    fig = go.Figure()
+    for series in year_series:
+        year = series.year
+        scatter_series = reduce_scatter(series) if long_range else series
+        fig.add_trace(Scatter(
+            x=scatter_series.temperature, y=scatter_series.supply,
             mode='markers+text' if show_day_info else 'markers',
             name=f"{year} 상관관계",
             marker=dict(size=10, color=color_map.get(year), line=dict(width=0.5, color='black')),
-            text=marker_texts, textposition='top center', textfont=dict(size=9)
+            text=scatter_series.texts, textposition='top center', textfont=dict(size=9)
         ))
+    return fig
+
 
-        # (4) 공급량 누적 그래프
-        cumulative_fig.add_trace(go.Scatter(
-            x=year_data['월일'], y=year_data['누적공급량(M3)'],
+# (4) 공급량 누적 그래프
+def build_cumulative_fig():
+    fig = go.Figure()
+    for series in year_series:
+        year = series.year
+        cumulative_series = reduce_series(series, 'cumulative', max_points) if long_range else series
+        fig.add_trace(Scatter(
+            x=cumulative_series.x, y=cumulative_series.cumulative,
             mode='lines+markers',
             name=f"{year} 누적공급량",
             line=dict(color=color_map.get(year), width=2),
             marker=dict(size=6)
         ))
+    return fix_category_order(fig)
+
 
+temp_fig = cached_figure('daily_temperature', build_temp_fig, labels=show_day_info, **filter_state)
+supply_fig = cached_figure('daily_supply', build_supply_fig, **filter_state)
+scatter_fig = cached_figure('daily_scatter', build_scatter_fig, labels=show_day_info, **filter_state)
+cumulative_fig = cached_figure('daily_cumulative', build_cumulative_fig, **filter_state)
 
 col1, col2 = st.columns(2)
 with col1:
@@ -150,4 +139,13 @@ with col1:
 
 with col2:
     st.plotly_chart(supply_fig, use_container_width=True)
-    st.plotly_chart(cumulative_fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(cumulative_fig, use_container_width=True)
+
+# ✅ 수집 때 품질 검사로 저장하지 않은 날짜 (다음 수집 때 다시 받음)
+rejected = rejected_days(station_csv_path(station))
+if rejected:
+    with st.expander(f"🩺 수집 때 제외된 날짜 {len(rejected)}개 (다음 수집 때 다시 받습니다)"):
+        st.dataframe(pd.DataFrame([
+            {'날짜': day, '위반 규칙': ', '.join(entry['checks']), **entry['values'], '수집 시각': entry['fetched']}
+            for day, entry in rejected.items()
+        ]), hide_index=True, use_container_width=True)
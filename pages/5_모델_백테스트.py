@@ -0,0 +1,75 @@
+import streamlit as st
+import plotly.graph_objects as go
+from backtest import DEFAULT_FEATURE_SET, DEFAULT_FOLDS, DEFAULT_LOOKBACK, FILTERS, metric_table, run_backtest, summarize
+from data_store import dataset_version, get_daily
+from features import DAY_AHEAD_SETS, FEATURE_SETS
+from supply_models import MODEL_NAMES
+
+st.set_page_config(layout="wide")
+st.title("공급량 모델 백테스트")
+
+# ✅ 공용 데이터 저장소에서 일별 데이터 로드
+data = get_daily()
+
+# ✅ 1️⃣ 백테스트 설정
+st.sidebar.title("🧪 백테스트 설정")
+n_folds = st.sidebar.slider("검증 개월 수", 3, 36, DEFAULT_FOLDS)
+lookback = st.sidebar.slider("학습 기간 (기준일 이전 연수)", 1, 5, DEFAULT_LOOKBACK)
+FEATURE_LABELS = {
+    '기온': '평균기온만',
+    '기온+달력': '평균기온 + HDD/달력 (운영 모델과 같은 입력·모델)',
+    '확장': '확장 (시차 기온/HDD/달력)',
+    '확장+전일공급량': '확장 + 전날 공급량 (1일 앞 예측)',
+}
+feature_set = st.sidebar.radio("입력 피처", list(FEATURE_SETS), index=list(FEATURE_SETS).index(DEFAULT_FEATURE_SET),
+                               format_func=FEATURE_LABELS.get)
+filter_name = st.sidebar.selectbox("학습 조건", list(FILTERS))
+unit = st.sidebar.radio("단위 선택", ['m3', 'mj'], format_func=lambda u: '부피 (M3)' if u == 'm3' else '열량 (MJ)')
+metric = st.sidebar.radio("지표", ['MAPE', 'MAE'], format_func=lambda m: 'MAPE (%)' if m == 'MAPE' else 'MAE')
+
+if feature_set in DAY_AHEAD_SETS:
+    st.caption("매월 1일을 기준일로, 기준일 이전 데이터로 학습한 모델이 그 달의 매일을 **전날 실제 공급량**을 받아 예측한 오차입니다 "
+               "(1일 앞 예측). 1개월 앞 예측인 다른 피처 묶음과 직접 비교할 수 없습니다.")
+else:
+    st.caption("매월 1일을 기준일로, 기준일 이전 데이터로 학습해 그 달을 예측한 오차입니다 (rolling-origin, 1개월 앞 예측).")
+
+# ✅ 2️⃣ 백테스트 실행 (fold 결과는 모델 저장소에 캐시되어 데이터가 바뀐 fold만 다시 계산)
+@st.cache_data(show_spinner=False)
+def load_backtest(version, n_folds, lookback, feature_set):
+    return run_backtest(data, n_folds, lookback, feature_set=feature_set)
+
+with st.spinner("⏳ 백테스트 실행 중... (처음 실행하거나 데이터가 갱신된 경우 시간이 걸립니다)"):
+    errors = load_backtest(dataset_version(), n_folds, lookback, feature_set)
+
+if errors.empty:
+    st.warning("검증할 데이터가 없습니다.")
+    st.stop()
+
+# ✅ 3️⃣ 모델별 전체 성능
+overall = summarize(errors[errors['단위'] == unit])
+overall_table = overall.pivot(index='필터', columns='모델', values=metric)[MODEL_NAMES]
+st.write(f"### 📊 학습 조건별 {metric}")
+st.dataframe(overall_table.style.format("{:,.2f}").highlight_min(axis=1, color='#c6efce'))
+
+# ✅ 4️⃣ 월별 / 날짜유형별 성능
+by_month = metric_table(errors, '월', metric, filter_name, unit)
+by_day_type = metric_table(errors, '날짜유형', metric, filter_name, unit)
+
+fig = go.Figure()
+for name in MODEL_NAMES:
+    fig.add_trace(go.Scatter(x=by_month.index, y=by_month[name], mode='lines+markers', name=name))
+fig.update_layout(
+    title=f"월별 {metric} ({filter_name})",
+    xaxis=dict(title="월", tickmode='linear'),
+    yaxis=dict(title=metric),
+    height=450
+)
+st.plotly_chart(fig, use_container_width=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    st.write(f"### 📅 월별 {metric}")
+    st.dataframe(by_month.style.format("{:,.2f}").highlight_min(axis=1, color='#c6efce'))
+with col2:
+    st.write(f"### 🎌 날짜유형별 {metric}")
+    st.dataframe(by_day_type.style.format("{:,.2f}").highlight_min(axis=1, color='#c6efce'))
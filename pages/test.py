@@ -1,124 +1,89 @@
-import os
 import streamlit as st
-import pandas as pd
-import holidays
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
-from pathlib import Path
+from daily_charts import (
+    category_array, is_long_range, points_per_trace, prepare_daily_series, reduce_scatter, reduce_series,
+)
+from data_store import DEFAULT_STATION, dataset_version, station_csv_path
+from figure_cache import cached_figure
+from partitioned_store import available_years, load_daily as load_partitions, stations
 
 st.set_page_config(layout="wide")
 
 st.title("일별 기온 및 공급량 분석 (리눅스 & 윈도우 호환)")
 
-# ✅ 프로젝트 루트 디렉토리 기준 상대경로 설정
-BASE_DIR = Path(os.getcwd())  
-DATA_PATH = BASE_DIR / "data" / "weather_supply.csv"
-
-# ✅ 1️⃣ 데이터 로드 함수 (CSV 파일 사용, 컬럼명을 한국어로 변경)
-@st.cache_data
-def load_data():
-    """CSV 파일에서 데이터 로드 및 컬럼명 한국어로 변경"""
-    df = pd.read_csv(DATA_PATH, encoding='utf-8', sep=',')
-    
-    column_mapping = {
-        'date': '날짜',
-        'avg_temp': '평균기온',
-        'max_temp': '최고기온',
-        'min_temp': '최저기온',
-        'supply_m3': '공급량(M3)',
-        'supply_mj': '공급량(MJ)',
-    }
-    
-    df.rename(columns=column_mapping, inplace=True)
-    return df[['날짜', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)']]
-
-# ✅ 2️⃣ 컬럼 추가 함수
-def add_columns(df):
-    """데이터프레임에 연, 월, 일, 요일, 공휴일 컬럼 추가"""
-    df = df.copy()
-    df['날짜'] = pd.to_datetime(df['날짜'])
-    df['연'] = df['날짜'].dt.year
-    df['월'] = df['날짜'].dt.month
-    df['일'] = df['날짜'].dt.day
-
-    weekday_map = {0: "월", 1: "화", 2: "수", 3: "목", 4: "금", 5: "토", 6: "일"}
-    df['요일'] = df['날짜'].dt.weekday.map(weekday_map)
-    
-    kr_holidays = holidays.KR(years=df['연'].unique())
-    df['공휴일'] = df['날짜'].apply(lambda x: kr_holidays.get(x, ""))
-
-    return df
-
-# ✅ 데이터 로드 및 컬럼 추가 적용
-data = load_data()
-data = add_columns(data)
-
-# ✅ 사이드바 필터
+# ✅ 사이드바 필터 (지점이 여러 개 저장돼 있으면 지점 선택)
 st.sidebar.title("🗓 필터 선택")
+station_list = stations()
+station = st.sidebar.selectbox("관측 지점", station_list) if len(station_list) > 1 else DEFAULT_STATION
 default_years = [2023, 2024, 2025]
 current_month = datetime.today().month
 
-selected_years = st.sidebar.multiselect("연도 선택", sorted(data['연'].unique()), default=default_years)
-selected_months = st.sidebar.multiselect("월 선택", sorted(data['월'].unique()), default=[current_month])
+year_options = available_years(station)
+selected_years = st.sidebar.multiselect("연도 선택", year_options, default=[y for y in default_years if y in year_options])
+selected_months = st.sidebar.multiselect("월 선택", list(range(1, 13)), default=[current_month])
+
+# ✅ 지점 × 연도 파티션 저장소에서 선택한 연/월 구간만 읽기 (연/월/일/요일/공휴일 포함)
+data = load_partitions(station, selected_years, selected_months)
+data_version = dataset_version(station_csv_path(station))
 
 show_day_info = st.sidebar.checkbox("📌 요일/공휴일 마커 표시", value=True)
 
-filtered_data = data[(data['연'].isin(selected_years)) & (data['월'].isin(selected_months))]
-filtered_data['월일'] = filtered_data['월'].astype(str) + '-' + filtered_data['일'].astype(str)
+# ✅ 연도별 트레이스 배열을 한 번에 준비 (라벨/마커 크기/누적 공급량)
+year_series = prepare_daily_series(data, selected_years, selected_months, show_day_info)
+
+# ✅ 장기간 모드: 점이 많으면 서버에서 다운샘플링하고 WebGL로 렌더링
+long_range = st.sidebar.toggle(
+    "🚀 장기간 모드 (다운샘플링 + WebGL)", value=is_long_range(year_series),
+    help="선택한 기간이 길면 자동으로 켜집니다. 선은 LTTB, 막대는 구간별 최소/최대로 점을 줄이고 라벨은 공휴일 위주로만 표시합니다."
+)
+Scatter = go.Scattergl if long_range else go.Scatter
+max_points = points_per_trace(year_series)
 
 color_map = {2023: 'blue', 2024: 'deepskyblue', 2025: 'red'}
 
-# 📊 그래프 생성 (총 4개)
-fig = make_subplots(
-    rows=4, cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.1,
-    subplot_titles=(
-        "평균기온(°C) 변화", "공급량(M3) 변화", "누적 공급량(M3)", "기온 vs 공급량 상관관계"
+# 📊 그래프 생성 (총 4개) - 같은 조건의 그림은 세션 간에 재사용
+def build_fig():
+    fig = make_subplots(
+        rows=4, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        subplot_titles=(
+            "평균기온(°C) 변화", "공급량(M3) 변화", "누적 공급량(M3)", "기온 vs 공급량 상관관계"
+        )
     )
-)
 
-if not filtered_data.empty:
-    for year in selected_years:
-        year_data = filtered_data[filtered_data['연'] == year].copy()
-
-        # ✅ 요일/공휴일 마커 설정
-        marker_texts = []
-        marker_sizes = []
-        for _, row in year_data.iterrows():
-            if show_day_info:
-                text = row['공휴일'] if row['공휴일'] else row['요일']
-                marker_texts.append(text)
-                marker_sizes.append(12 if row['공휴일'] else 8)
-            else:
-                marker_texts.append("")
-                marker_sizes.append(8)
+    for series in year_series:
+        year = series.year
+        temp_series = reduce_series(series, 'temperature', max_points) if long_range else series
+        supply_series = reduce_series(series, 'supply', max_points, method='minmax') if long_range else series
+        cumulative_series = reduce_series(series, 'cumulative', max_points) if long_range else series
+        scatter_series = reduce_scatter(series) if long_range else series
 
         # (1) 평균기온 변화 그래프
-        fig.add_trace(go.Scatter(
-            x=year_data['월일'], y=year_data['평균기온'],
+        fig.add_trace(Scatter(
+            x=temp_series.x, y=temp_series.temperature,
             mode='lines+markers+text' if show_day_info else 'lines+markers',
             name=f"{year} 평균기온",
             line=dict(color=color_map.get(year), width=2),
-            marker=dict(size=marker_sizes),
-            text=marker_texts if show_day_info else None,
+            marker=dict(size=temp_series.sizes),
+            text=temp_series.texts if show_day_info else None,
             textposition='top center' if show_day_info else None,
         ), row=1, col=1)
 
         # (2) 공급량 변화 그래프
         fig.add_trace(go.Bar(
-            x=year_data['월일'], y=year_data['공급량(M3)'],
+            x=supply_series.x, y=supply_series.supply,
             name=f"{year} 공급량(M3)",
             marker=dict(color=color_map.get(year), opacity=0.7),
-            text=marker_texts if show_day_info else None,
+            text=supply_series.texts if show_day_info else None,
             textposition='outside' if show_day_info else None,
         ), row=2, col=1)
 
         # (3) 누적 공급량 그래프
-        year_data['누적공급량(M3)'] = year_data['공급량(M3)'].cumsum()
-        fig.add_trace(go.Scatter(
-            x=year_data['월일'], y=year_data['누적공급량(M3)'],
+        fig.add_trace(Scatter(
+            x=cumulative_series.x, y=cumulative_series.cumulative,
             mode='lines+markers',
             name=f"{year} 누적공급량",
             line=dict(color=color_map.get(year), width=2),
@@ -126,13 +91,24 @@ if not filtered_data.empty:
         ), row=3, col=1)
 
         # (4) 기온 vs 공급량 산점도
-        fig.add_trace(go.Scatter(
-            x=year_data['평균기온'], y=year_data['공급량(M3)'],
+        fig.add_trace(Scatter(
+            x=scatter_series.temperature, y=scatter_series.supply,
             mode='markers',
             name=f"{year} 상관관계",
             marker=dict(size=10, color=color_map.get(year), line=dict(width=0.5, color='black')),
         ), row=4, col=1)
 
-fig.update_layout(title="일별 기온 및 공급량 분석", height=1300, showlegend=True, hovermode='x unified')
+    # ✅ 점을 줄이면 연도마다 남은 날짜가 달라지므로 x축 순서를 날짜 순으로 고정
+    if long_range:
+        fig.update_xaxes(categoryorder='array', categoryarray=category_array(year_series))
+
+    fig.update_layout(title="일별 기온 및 공급량 분석", height=1300, showlegend=True, hovermode='x unified')
+    return fig
+
+
+fig = cached_figure(
+    'daily_subplots', build_fig, version=data_version, station=station,
+    years=selected_years, months=selected_months, labels=show_day_info, long_range=long_range,
+)
 
 st.plotly_chart(fig, use_container_width=True)
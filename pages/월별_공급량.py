@@ -1,22 +1,16 @@
-import os
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
+from aggregate_cube import get_cube, monthly_summary as monthly_summary_from_cube
+from data_store import dataset_version, get_daily
+from figure_cache import cached_figure
+from ingest_excel import EXCEL_DATA_PATH, ensure_converted
     
 st.title("월별 공급량 및 기온 분석")
 st.markdown("데이터 출처: [기상자료개방포털](https://data.kma.go.kr/climate/RankState/selectRankStatisticsDivisionList.do?pgmNo=179)")
 
-@st.cache_data
-def load_data():
-    file_path = os.path.join("data", "weather_suply.xlsx")
-    sheet_name = "일별기온공급량"
-    df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
-    df = df[['날짜', '평균기온', '연', '월', '공급량(M3)', '공급량(MJ)']]
-    df['연'] = df['연'].astype(int)
-    df['월'] = df['월'].astype(int)
-    return df
-
-data = load_data()
+# ✅ 엑셀 원본은 ingest_excel.py로 변환된 데이터를 공용 저장소에서 로드 (변환본이 없거나 오래됐으면 먼저 변환)
+ensure_converted()
+data = get_daily(EXCEL_DATA_PATH)
 
 # 연도 선택 필터
 default_years = [2020, 2021, 2022, 2023, 2024, 2025]
@@ -26,54 +20,56 @@ selected_years = st.multiselect("연도 선택", sorted(data['연'].unique()), d
 months = sorted(data['월'].unique())
 selected_month = st.selectbox("월 선택", months, index=months.index(2))
 
-# 필터링 적용
-filtered_data = data[
-    (data['연'].isin(selected_years)) & (data['월'] == selected_month)
+# 월별 데이터 집계 (피벗테이블 유사 형태) - 미리 집계된 큐브를 잘라 사용
+monthly_summary = monthly_summary_from_cube(get_cube(EXCEL_DATA_PATH), selected_years, [selected_month])[
+    ['연', '월', '평균기온', '공급량_M3']
 ]
 
-# 월별 데이터 집계 (피벗테이블 유사 형태)
-monthly_summary = filtered_data.groupby(['연', '월']).agg(
-    평균기온=('평균기온', 'mean'),
-    공급량_M3=('공급량(M3)', 'sum')
-).reset_index()
+# 그래프 그리기 (엑셀처럼 막대+선 그래프) - 같은 조건의 그림은 세션 간에 재사용
+def build_fig():
+    fig = go.Figure()
+
+    # 막대그래프: 공급량(M3)
+    fig.add_trace(go.Bar(
+        x=monthly_summary['연'].astype(str),
+        y=monthly_summary['공급량_M3'],
+        name='공급량(M3)',
+        yaxis='y1',
+        marker_color='orange'
+    ))
 
-# 그래프 그리기 (엑셀처럼 막대+선 그래프)
-fig = go.Figure()
+    # 선그래프: 평균기온
+    fig.add_trace(go.Scatter(
+        x=monthly_summary['연'].astype(str),
+        y=monthly_summary['평균기온'],
+        name='평균기온',
+        yaxis='y2',
+        mode='lines+markers',
+        marker=dict(color='blue')
+    ))
 
-# 막대그래프: 공급량(M3)
-fig.add_trace(go.Bar(
-    x=monthly_summary['연'].astype(str),
-    y=monthly_summary['공급량_M3'],
-    name='공급량(M3)',
-    yaxis='y1',
-    marker_color='orange'
-))
+    # 레이아웃 설정 (이중 축)
+    fig.update_layout(
+        title=f"{selected_month}월 연도별 공급량 및 평균기온",
+        xaxis_title='연도',
+        yaxis=dict(
+            title='공급량(M3)',
+            side='left'
+        ),
+        yaxis2=dict(
+            title='평균기온(℃)',
+            side='right',
+            overlaying='y',
+            showgrid=False
+        ),
+        barmode='group'
+    )
+    return fig
 
-# 선그래프: 평균기온
-fig.add_trace(go.Scatter(
-    x=monthly_summary['연'].astype(str),
-    y=monthly_summary['평균기온'],
-    name='평균기온',
-    yaxis='y2',
-    mode='lines+markers',
-    marker=dict(color='blue')
-))
 
-# 레이아웃 설정 (이중 축)
-fig.update_layout(
-    title=f"{selected_month}월 연도별 공급량 및 평균기온",
-    xaxis_title='연도',
-    yaxis=dict(
-        title='공급량(M3)',
-        side='left'
-    ),
-    yaxis2=dict(
-        title='평균기온(℃)',
-        side='right',
-        overlaying='y',
-        showgrid=False
-    ),
-    barmode='group'
+fig = cached_figure(
+    'excel_month_by_year', build_fig,
+    version=dataset_version(EXCEL_DATA_PATH), years=selected_years, month=selected_month,
 )
 
 st.plotly_chart(fig)
@@ -0,0 +1,218 @@
+"""지점 × 연도로 나눈 일별 데이터 저장소 (파티션 선택 + 월 범위 색인)
+
+지점별 CSV(대구 143은 weather_supply.csv, 나머지는 weather_<지점>.csv)를
+data/partitions/stn=<지점>/year=<연도>-<해시>/ 아래 컬럼별 .npy로 나눠 둔다.
+index.json에 파티션마다 행 수, 날짜 범위, 월별 행 구간(시작, 끝)을 기록해
+- 연도 조건 → 해당 연도 파티션 디렉토리만 열고
+- 월 조건 → 색인된 행 구간만 잘라 읽고 (파티션 안은 날짜순 정렬)
+- 컬럼 조건 → 필요한 .npy만 memmap으로 연다
+사이드바에서 고른 범위만큼만 읽으므로 지점/연도가 늘어도 읽는 양은 선택에 비례한다.
+
+원본 CSV가 바뀌면(columnar_cache 버전 비교) 내용 해시가 달라진 연도 파티션만
+새로 쓰고 index.json을 원자적으로 교체한다. 여러 프로세스(페이지, 수집 스케줄)가
+동시에 다른 지점을 갱신해도 서로의 항목을 덮어쓰지 않도록, index.json의
+읽기-수정-쓰기는 옆의 index.lock 파일에 flock을 잡은 채로 한다.
+
+사용 예)
+    python partitioned_store.py                 # 모든 지점 CSV 파티션 갱신
+    python partitioned_store.py --stations 143 108
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import columnar_cache
+import imputation
+from data_store import (
+    BASE_COLUMNS, COLUMN_MAPPING, DATA_DIR, DEFAULT_STATION, add_columns, station_csv_path,
+)
+
+PARTITION_DIR = DATA_DIR / "partitions"
+INDEX_NAME = "index.json"
+LOCK_NAME = "index.lock"
+RAW_COLUMNS = {korean: raw for raw, korean in COLUMN_MAPPING.items()}
+
+_lock = threading.Lock()
+
+
+def _read_index(root=PARTITION_DIR):
+    try:
+        with open(root / INDEX_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'stations': {}}
+
+
+def _write_index(index, root=PARTITION_DIR):
+    with columnar_cache.atomic_write(root / INDEX_NAME, encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+
+
+@contextmanager
+def _index_lock(root=PARTITION_DIR):
+    """index.json 갱신을 프로세스 사이에서 한 번에 하나씩 (index.lock에 배타 flock)"""
+    with open(root / LOCK_NAME, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _station_csvs():
+    """DATA_DIR에 있는 지점 CSV → {지점번호: 경로}"""
+    found = {DEFAULT_STATION: station_csv_path(DEFAULT_STATION)}
+    for path in DATA_DIR.glob("weather_*.csv"):
+        station = path.stem.split("_", 1)[1]
+        if station.isdigit():
+            found[station] = path
+    return {station: path for station, path in found.items() if path.exists()}
+
+
+def _partition_hash(columns, rows):
+    digest = hashlib.sha256()
+    for col in columnar_cache.COLUMN_DTYPES:
+        digest.update(np.ascontiguousarray(columns[col][rows]).tobytes())
+    return digest.hexdigest()
+
+
+def _month_ranges(dates):
+    """정렬된 날짜 배열에서 월별 [시작, 끝) 행 구간"""
+    months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+    starts = np.searchsorted(months, np.arange(1, 13), side='left')
+    ends = np.searchsorted(months, np.arange(1, 13), side='right')
+    return {str(m): [int(s), int(e)] for m, s, e in zip(range(1, 13), starts, ends) if e > s}
+
+
+def build_station(station, root=PARTITION_DIR):
+    """지점 CSV를 연도 파티션으로 갱신하고 (새로 쓴 파티션 수, 전체 파티션 수) 반환"""
+    station = str(station)
+    csv_path = station_csv_path(station)
+    pointer = columnar_cache.ensure(csv_path)
+    columns = columnar_cache.load_columns(csv_path)
+
+    order = np.argsort(columns['date'], kind='stable')
+    dates = np.asarray(columns['date'])[order]
+    years = dates.astype('datetime64[Y]').astype(int) + 1970
+    station_dir = root / f"stn={station}"
+    station_dir.mkdir(parents=True, exist_ok=True)
+
+    entries, written = {}, 0
+    for year in np.unique(years):
+        lo, hi = np.searchsorted(years, year, side='left'), np.searchsorted(years, year, side='right')
+        rows = order[lo:hi]
+        digest = _partition_hash(columns, rows)
+        name = f"year={year}-{digest[:12]}"
+        if not (station_dir / name).is_dir():
+            tmp_dir = columnar_cache.make_build_dir(station_dir)
+            for col, dtype in columnar_cache.COLUMN_DTYPES.items():
+                np.save(tmp_dir / f"{col}.npy", np.asarray(columns[col][rows], dtype=dtype))
+            try:
+                os.rename(tmp_dir, station_dir / name)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            written += 1
+        year_dates = dates[lo:hi]
+        entries[str(year)] = {
+            'dir': f"stn={station}/{name}",
+            'rows': int(len(rows)),
+            'start': str(year_dates[0]),
+            'end': str(year_dates[-1]),
+            'months': _month_ranges(year_dates),
+        }
+
+    # 파티션은 rename으로 공개돼 잠금이 필요 없고, 색인은 잠근 채 최신 내용을 읽어 이 지점만 바꿈
+    with _index_lock(root):
+        index = _read_index(root)
+        index['stations'][station] = {
+            'source': csv_path.name,
+            'source_version': pointer['version'],
+            'years': entries,
+        }
+        _write_index(index, root)
+
+        # 더 이상 색인에 없는 옛 파티션 정리
+        live = {entry['dir'].split('/', 1)[1] for entry in entries.values()}
+        for old in station_dir.iterdir():
+            if old.is_dir() and old.name not in live and not old.name.startswith("."):
+                shutil.rmtree(old, ignore_errors=True)
+    return written, len(entries)
+
+
+def ensure(station=DEFAULT_STATION, root=PARTITION_DIR):
+    """지점 파티션이 원본 CSV 버전과 맞는지 확인하고 필요하면 갱신, 지점 색인 반환"""
+    station = str(station)
+    root.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        entry = _read_index(root)['stations'].get(station)
+        version = columnar_cache.ensure(station_csv_path(station))['version']
+        if entry is None or entry['source_version'] != version:
+            build_station(station, root)
+            entry = _read_index(root)['stations'][station]
+    return entry
+
+
+def stations():
+    """원본 CSV가 있는 지점 목록"""
+    return sorted(_station_csvs())
+
+
+def available_years(station=DEFAULT_STATION):
+    return sorted(int(year) for year in ensure(station)['years'])
+
+
+def read(station=DEFAULT_STATION, years=None, months=None, columns=None, root=PARTITION_DIR):
+    """조건에 맞는 파티션/월 구간/컬럼만 읽어 원본 스키마(한국어 컬럼) 데이터프레임 반환
+
+    years/months: None이면 전체, columns: BASE_COLUMNS 중 일부 (날짜는 항상 포함)
+    """
+    entry = ensure(station, root)
+    wanted = ['날짜'] + [col for col in (columns or BASE_COLUMNS) if col != '날짜']
+    selected_years = entry['years'] if years is None else {
+        str(int(y)): entry['years'][str(int(y))] for y in years if str(int(y)) in entry['years']
+    }
+    month_keys = None if months is None else {str(int(m)) for m in months}
+
+    parts = {col: [] for col in wanted}
+    for year in sorted(selected_years, key=int):
+        part = selected_years[year]
+        ranges = [
+            part['months'][m] for m in sorted(part['months'], key=int)
+            if month_keys is None or m in month_keys
+        ]
+        if not ranges:
+            continue
+        for col in wanted:
+            values = np.load(root / part['dir'] / f"{RAW_COLUMNS[col]}.npy", mmap_mode='r')
+            parts[col].extend(values[start:end] for start, end in ranges)
+
+    data = {
+        col: np.concatenate(chunks) if chunks
+        else np.array([], dtype=columnar_cache.COLUMN_DTYPES[RAW_COLUMNS[col]])
+        for col, chunks in parts.items()
+    }
+    return pd.DataFrame(data, columns=wanted)
+
+
+def load_daily(station=DEFAULT_STATION, years=None, months=None):
+    """선택한 지점/연/월만 읽어 get_daily()와 같은 컬럼(연/월/일/달력 피처/보간 포함)으로 반환"""
+    return imputation.apply(add_columns(read(station, years, months)), station_csv_path(station))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="지점 × 연도 파티션 저장소 갱신")
+    parser.add_argument("--stations", nargs="+", help="지점번호 목록 (기본: data/의 모든 지점 CSV)")
+    args = parser.parse_args()
+
+    PARTITION_DIR.mkdir(parents=True, exist_ok=True)
+    for station in args.stations or sorted(_station_csvs()):
+        written, total = build_station(station)
+        print(f"✅ 지점 {station}: 연도 파티션 {total}개 (새로 쓴 파티션 {written}개)")
@@ -0,0 +1,100 @@
+"""기온 → 공급량 응답표 (룩업 테이블) 기반 빠른 예측
+
+공급량 모델의 입력은 평균기온과 날짜에서 나온 달력 피처(features.input_features)라,
+학습된 모델은 달력 조합(요일/공휴일/징검다리/명절연휴)마다 기온에 대한
+1차원 곡선이다. 달력 범위에 나오는 조합마다 0.1℃ 간격 격자에서 한 번만
+예측해 표로 저장해 두고, 이후 예측은 모든 모델을 한 번에 선형 보간(gather)으로
+계산한다. 격자 범위를 벗어난 기온(또는 표에 없는 조합)만 원래 모델로 예측한다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from calendar_table import build_calendar
+from features import CALENDAR_FEATURES, input_features
+from model_registry import get_registry, make_key
+
+GRID_MIN = -20.0
+GRID_MAX = 40.0
+GRID_STEP = 0.1
+
+
+def profile_codes(X):
+    """입력 피처 프레임의 달력 피처 조합 → 정수 코드 (비트 묶음)"""
+    # 열을 하나씩 읽는 편이 X[CALENDAR_FEATURES]로 잘라 내는 것보다 훨씬 빠름 (요청 경로)
+    codes = np.zeros(len(X), dtype='int64')
+    for i, col in enumerate(CALENDAR_FEATURES):
+        codes |= X[col].to_numpy(dtype=bool).astype('int64') << i
+    return codes
+
+
+@dataclass
+class ResponseTable:
+    """달력 조합 × 균일 기온 격자 위의 모델별 예측값 (values: 모델 수 × 조합 수 × 격자 수)"""
+    names: list
+    grid_min: float
+    step: float
+    profiles: np.ndarray  # 달력 조합 코드 (정렬)
+    values: np.ndarray
+
+    @property
+    def grid_max(self):
+        return self.grid_min + self.step * (self.values.shape[-1] - 1)
+
+    def _profile_index(self, X):
+        codes = profile_codes(X)
+        pos = np.minimum(np.searchsorted(self.profiles, codes), len(self.profiles) - 1)
+        return pos, self.profiles[pos] == codes
+
+    def predict(self, X, names=None):
+        """입력 피처 프레임에 대해 (모델 수 × 행 수) 예측 배열 반환 (in_range 행만 유효)"""
+        rows = self.values if names is None else self.values[[self.names.index(n) for n in names]]
+        temps = X['평균기온'].to_numpy(dtype='float64')
+        profile, _ = self._profile_index(X)
+        # 격자점 위의 기온(0.1℃ 단위 입력)이 부동소수 오차로 보간되지 않도록 반올림
+        n_grid = rows.shape[-1]
+        pos = np.clip(np.round((temps - self.grid_min) / self.step, 6), 0, n_grid - 1)
+        lower = np.minimum(np.floor(pos).astype(np.intp), n_grid - 2)
+        weight = pos - lower
+        return rows[:, profile, lower] * (1 - weight) + rows[:, profile, lower + 1] * weight
+
+    def in_range(self, X):
+        temps = X['평균기온'].to_numpy(dtype='float64')
+        _, known = self._profile_index(X)
+        return known & (temps >= self.grid_min) & (temps <= self.grid_max)
+
+
+def build_table(models, grid_min=GRID_MIN, grid_max=GRID_MAX, step=GRID_STEP):
+    """학습된 모델 dict({'이름': 모델})을 달력 조합 × 격자에서 한 번씩 평가해 응답표 생성"""
+    grid = np.round(np.arange(grid_min, grid_max + step / 2, step), 10)
+    dates = build_calendar().index
+    profiles, first = np.unique(profile_codes(input_features(dates, np.zeros(len(dates)))), return_index=True)
+    # 조합마다 대표 날짜 하나로 격자 전체를 평가
+    X_grid = input_features(np.repeat(dates[first], len(grid)), np.tile(grid, len(profiles)))
+    names = list(models)
+    # 공급량(MJ)은 억 단위라 float32로 줄이면 정수 자리 오차가 생기므로 float64 유지
+    values = np.stack([
+        models[name].predict(X_grid).reshape(len(profiles), len(grid)) for name in names
+    ]).astype('float64')
+    return ResponseTable(names, float(grid[0]), step, profiles, values)
+
+
+def get_response_table(models_key, models, registry=None):
+    """모델 저장소 키별 응답표 (저장소에 캐시, 없으면 생성)"""
+    registry = registry or get_registry()
+    key = make_key(kind='response_table', models=models_key, grid=[GRID_MIN, GRID_MAX, GRID_STEP])
+    return registry.get_or_create(key, lambda: build_table(models))
+
+
+def predict(table, models, X, names):
+    """응답표로 예측하고 격자 밖 기온·표에 없는 조합은 원래 모델로 보정, {이름: 예측 배열} 반환
+
+    X: features.input_features로 만든 입력 피처 프레임
+    """
+    result = table.predict(X, names)
+    outside = ~table.in_range(X)
+    if outside.any():
+        X_outside = X[outside]
+        for row, name in enumerate(names):
+            result[row, outside] = models[name].predict(X_outside)
+    return dict(zip(names, result))
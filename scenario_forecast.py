@@ -0,0 +1,85 @@
+"""기온 시나리오 일괄 공급량 예측
+
+N개의 기온 시나리오(앙상블 멤버, 분위 밴드, ±k℃ 이동) × 예측 기간 ×
+모델(M3/MJ 포함)을 한 번에 평가해 3차원 배열로 돌려준다. 시나리오와
+날짜 전체에서 중복을 뺀 (기온, 달력 조합) 입력만 모델별로 한 번씩 예측(또는
+응답표 보간)하므로 시나리오 수가 수백 개여도 모델 호출 횟수는 모델 수와 같다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from features import INPUT_FEATURES, input_features
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+@dataclass
+class ScenarioForecast:
+    """시나리오 예측 결과 (values: 시나리오 × 날짜 × 모델)"""
+    values: np.ndarray
+    scenarios: list
+    dates: pd.DatetimeIndex
+    models: list
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        """시나리오 축 분위수, (분위 수 × 날짜 × 모델) 배열"""
+        return np.quantile(self.values, qs, axis=0)
+
+    def summary(self, qs=DEFAULT_QUANTILES):
+        """날짜 × 모델별 분위수 요약표 (long 형식)"""
+        q = self.quantiles(qs)
+        index = pd.MultiIndex.from_product([self.dates, self.models], names=['날짜', '모델'])
+        return pd.DataFrame(
+            {f"p{round(level * 100)}": q[i].reshape(-1) for i, level in enumerate(qs)},
+            index=index,
+        ).reset_index()
+
+    def to_frame(self):
+        """시나리오 × 날짜 × 모델 전체를 long 형식 데이터프레임으로"""
+        index = pd.MultiIndex.from_product([self.scenarios, self.dates, self.models], names=['시나리오', '날짜', '모델'])
+        return pd.DataFrame({'예측값': self.values.reshape(-1)}, index=index).reset_index()
+
+
+def shift_scenarios(base_temps, shifts):
+    """기준 기온에 ±k℃를 더한 시나리오, (시나리오 × 날짜) 배열과 이름 반환"""
+    base = np.asarray(base_temps, dtype='float64')
+    shifts = np.asarray(shifts, dtype='float64')
+    return base[None, :] + shifts[:, None], [f"{s:+.1f}℃" for s in shifts]
+
+
+def percentile_scenarios(members, qs=DEFAULT_QUANTILES):
+    """앙상블 멤버(멤버 × 날짜)에서 날짜별 분위 기온 시나리오 생성"""
+    members = np.asarray(members, dtype='float64')
+    return np.quantile(members, qs, axis=0), [f"p{round(q * 100)}" for q in qs]
+
+
+def forecast(models, scenarios, dates, names=None, table=None, scenario_names=None):
+    """시나리오 × 날짜 기온 배열을 모든 모델로 일괄 예측
+
+    models: {'모델명_m3': 모델, ...}
+    scenarios: (시나리오 수 × 날짜 수) 기온 배열
+    table: response_tables.ResponseTable을 주면 격자 범위 안은 보간으로 계산
+    """
+    scenarios = np.atleast_2d(np.asarray(scenarios, dtype='float64'))
+    names = list(names or models)
+    dates = pd.DatetimeIndex(dates)
+    inputs = input_features(np.tile(dates, len(scenarios)), scenarios.reshape(-1)).to_numpy(dtype='float64')
+    unique_inputs, inverse = np.unique(inputs, axis=0, return_inverse=True)
+    X = pd.DataFrame(unique_inputs, columns=INPUT_FEATURES)
+
+    if table is not None:
+        from response_tables import predict as predict_from_table
+        unique_values = np.vstack(list(predict_from_table(table, models, X, names).values()))
+    else:
+        unique_values = np.vstack([models[name].predict(X) for name in names])
+
+    # (모델 × 고유 입력) → (시나리오 × 날짜 × 모델)
+    values = unique_values[:, inverse.reshape(-1)].T.reshape(scenarios.shape + (len(names),))
+    return ScenarioForecast(
+        values=values,
+        scenarios=list(scenario_names or [f"S{i + 1}" for i in range(len(scenarios))]),
+        dates=dates,
+        models=names,
+    )
@@ -0,0 +1,133 @@
+"""평균기온 + 달력 → 공급량(M3/MJ) 예측 모델 정의 및 학습
+
+일공급량 예측 페이지와 다른 도구들이 같은 모델 구성을 쓰도록
+모델 팩토리와 학습 함수를 한곳에 모아 둔다. 학습 결과는 필터/데이터
+버전/하이퍼파라미터별로 model_registry에 저장돼 재사용된다.
+
+모델 입력은 예측 시점에 주어지는 날짜와 평균기온에서 features.input_features로
+만든다 (평균기온, HDD, 요일/공휴일/징검다리/명절연휴). 학습과 예측 모두 같은 함수를 쓴다.
+"""
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.tree import DecisionTreeRegressor
+
+from calendar_table import WEEKDAY_NAMES
+from data_quality import RULES, valid_rows
+from data_store import dataset_version
+from features import FEATURE_SETS, input_features
+from model_registry import get_registry, make_key
+from online_models import supply_stats
+
+MODEL_FACTORIES = {
+    "다항회귀": lambda: make_pipeline(PolynomialFeatures(3), LinearRegression()),
+    "랜덤포레스트": lambda: RandomForestRegressor(random_state=42),
+    "KNN": lambda: KNeighborsRegressor(),
+    "결정트리": lambda: DecisionTreeRegressor(random_state=42),
+    "그레디언트부스팅": lambda: GradientBoostingRegressor(random_state=42),
+}
+MODEL_NAMES = list(MODEL_FACTORIES)
+FEATURES = FEATURE_SETS['기온+달력']
+TARGETS = {'m3': '공급량(M3)', 'mj': '공급량(MJ)'}
+# 충분통계량으로 증분 갱신하는 모델 (online_models)
+ONLINE_MODELS = ["다항회귀"]
+# 모델 10개를 코어 수만큼 동시에 학습 (-1: 전체 코어)
+N_JOBS = -1
+
+
+def normalize_filter(years, months, days):
+    """필터 값을 정렬된 기본 타입 리스트로 정리 (선택 순서와 무관한 캐시 키용)"""
+    return {
+        'years': sorted(int(y) for y in years),
+        'months': sorted(int(m) for m in months),
+        'days': sorted((str(d) for d in days), key=WEEKDAY_NAMES.index),
+    }
+
+
+def select_training_data(data, years, months, days):
+    """필터에 맞고 기온/공급량이 모두 있으며 품질 검사를 통과한 학습 행 선택"""
+    data = valid_rows(data)
+    return data[
+        (data['연'].isin(years)) &
+        (data['월'].isin(months)) &
+        (data['요일'].isin(days))
+    ].dropna(subset=['평균기온'] + list(TARGETS.values()))
+
+
+def model_params():
+    """모델별 하이퍼파라미터 (캐시 키용)"""
+    return {name: repr(sorted(factory().get_params().items())) for name, factory in MODEL_FACTORIES.items()}
+
+
+def _fit(name, unit, X_train, y_train):
+    """워커 프로세스에서 모델 하나 학습 (팩토리는 이름으로 찾아 pickle 부담을 줄임)"""
+    return f"{name}_{unit}", MODEL_FACTORIES[name]().fit(X_train, y_train)
+
+
+def iter_train_models(data, years, months, days, n_jobs=N_JOBS):
+    """모델 × 단위(M3/MJ)를 학습하고, 끝나는 순서대로 (키, 모델) 반환
+
+    다항회귀는 (연, 월, 요일) 칸별 충분통계량을 합쳐 바로 풀고,
+    나머지 모델은 프로세스 풀에서 동시에 학습한다.
+    """
+    stats = supply_stats(data)
+    weekdays = [WEEKDAY_NAMES.index(str(d)) for d in days]
+    for name in ONLINE_MODELS:
+        for unit, target in TARGETS.items():
+            yield f"{name}_{unit}", stats.model(list(years), list(months), weekdays, target)
+
+    train_data = select_training_data(data, years, months, days)
+    X_train = input_features(train_data['날짜'], train_data['평균기온'])
+    tasks = (
+        delayed(_fit)(name, unit, X_train, train_data[target])
+        for name in MODEL_FACTORIES if name not in ONLINE_MODELS
+        for unit, target in TARGETS.items()
+    )
+    yield from Parallel(n_jobs=n_jobs, backend='loky', return_as='generator_unordered')(tasks)
+
+
+def train_models(data, years, months, days, n_jobs=N_JOBS, on_result=None):
+    """모델 × 단위(M3/MJ) 전체 학습, {'모델명_m3': 모델, ...} 반환
+
+    on_result(키, 모델, 완료 수, 전체 수)는 모델 하나가 끝날 때마다 호출된다.
+    """
+    total = len(MODEL_FACTORIES) * len(TARGETS)
+    finished = {}
+    for key, model in iter_train_models(data, years, months, days, n_jobs):
+        finished[key] = model
+        if on_result:
+            on_result(key, model, len(finished), total)
+    # 결과 순서를 모델 정의 순서로 고정
+    return {
+        f"{name}_{unit}": finished[f"{name}_{unit}"]
+        for name in MODEL_FACTORIES
+        for unit in TARGETS
+    }
+
+
+def registry_key(years, months, days, version=None):
+    """학습 조건 + 데이터 버전 + 하이퍼파라미터 해시"""
+    return make_key(
+        kind='supply_models',
+        filter=normalize_filter(years, months, days),
+        features=FEATURES,
+        dataset=version or dataset_version(),
+        params=model_params(),
+        online=ONLINE_MODELS,
+        quality=RULES,
+        sklearn=sklearn.__version__,
+    )
+
+
+def get_trained_models(data, years, months, days, force=False, registry=None, on_result=None):
+    """저장소에 같은 조건의 모델이 있으면 불러오고, 없거나 force면 학습 후 저장"""
+    registry = registry or get_registry()
+    key = registry_key(years, months, days)
+    build = lambda: train_models(data, years, months, days, on_result=on_result)
+    if force:
+        return registry.save(key, build())
+    return registry.get_or_create(key, build)
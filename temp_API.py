@@ -1,64 +1,236 @@
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
+"""기상청 ASOS 일자료 증분 수집
+
+weather_supply.csv에 없는 날짜 구간을 모두 찾아 API에서 페이지 단위
+(numOfRows/pageNo)로 받아오고, 새 날짜만 추가한다. 품질 검사에서 빠진
+날짜도 빈 구간으로 남으므로 다음 수집 때 다시 받는다. 빠진 날짜는 RuntimeWarning으로
+알리고, 위반 규칙과 값은 data_quality.record_rejected로 기록해 분석 페이지에서 보여 준다.
+- 중복 확인: 바이너리 캐시의 정렬된 날짜 배열에 대한 이진 탐색 (O(log n))
+- 마지막 날짜 이후만 추가하는 경우: 파일 끝에 새 행만 append (O(새 행))
+- 중간 공백을 메우는 경우: 임시 파일에 정렬된 전체를 쓴 뒤 rename
+
+사용 예)
+    python temp_API.py                              # 저장된 첫 날짜 ~ 어제의 빈 날짜
+    python temp_API.py --start 2013-01-01           # 2013-01-01부터 빈 날짜 백필
+"""
+import argparse
+import csv
+import io
 import os
+import warnings
+from datetime import datetime, timedelta
 
-# 어제 날짜 구하기
-yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
-yesterday_hyphen = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+import numpy as np
+import pandas as pd
+import requests
 
-# 기상청 ASOS API 요청 및 데이터 가져오기
-service_key = "oBHTNIKevpXpwRCwxrdKSjd6FmUe1ix0zzu+QudQCzhlV8v4ZziSpv4qcXke0hAH+ha6wO7OeHlM8CeImAbnNQ=="
+import columnar_cache
+from data_quality import check_rows, record_rejected
+from data_store import COLUMN_MAPPING, DATA_PATH, DEFAULT_STATION, station_csv_path
 
+# 기상청 ASOS API 요청 설정
+service_key = os.environ.get(
+    "KMA_SERVICE_KEY",
+    "oBHTNIKevpXpwRCwxrdKSjd6FmUe1ix0zzu+QudQCzhlV8v4ZziSpv4qcXke0hAH+ha6wO7OeHlM8CeImAbnNQ==",
+)
 url = "http://apis.data.go.kr/1360000/AsosDalyInfoService/getWthrDataList"
+PAGE_SIZE = 999
+TIMEOUT = 30
+
+CSV_COLUMNS = ['date', 'avg_temp', 'max_temp', 'min_temp', 'supply_mj', 'supply_m3']
+API_COLUMNS = {'tm': 'date', 'avgTa': 'avg_temp', 'minTa': 'min_temp', 'maxTa': 'max_temp'}
+
+
+class ApiError(RuntimeError):
+    """API가 정상 코드('00')가 아닌 응답을 돌려준 경우"""
+
+
+def build_params(start, end, page_no=1, station=DEFAULT_STATION, page_size=PAGE_SIZE):
+    """ASOS 일자료 요청 파라미터 (start/end는 YYYYMMDD 문자열)"""
+    return {
+        'serviceKey': service_key,
+        'pageNo': str(page_no),
+        'numOfRows': str(page_size),
+        'dataType': 'JSON',
+        'dataCd': 'ASOS',
+        'dateCd': 'DAY',
+        'startDt': start,
+        'endDt': end,
+        'stnIds': station,
+    }
+
+
+def parse_response(data):
+    """API 응답 JSON → (item 리스트, 전체 건수)"""
+    header = data['response']['header']
+    if header['resultCode'] != '00':
+        raise ApiError(f"API 호출 실패: {header['resultMsg']}")
+    body = data['response']['body']
+    items = body.get('items') or {}
+    items = items.get('item', []) if isinstance(items, dict) else []
+    return items, int(body.get('totalCount', len(items)))
+
+
+def items_to_frame(items):
+    """API item 리스트 → CSV 스키마 데이터프레임 (공급량 컬럼은 비움)"""
+    df = pd.DataFrame(items, columns=list(API_COLUMNS)).rename(columns=API_COLUMNS)
+    df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+    for col in ['avg_temp', 'min_temp', 'max_temp']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['supply_mj'] = np.nan
+    df['supply_m3'] = np.nan
+    return df[CSV_COLUMNS]
+
+
+def fetch_range(start, end, station=DEFAULT_STATION, session=None, throttle=None):
+    """start~end(날짜) 구간을 페이지 단위로 모두 받아 데이터프레임으로 반환
+
+    throttle: 페이지 요청마다 먼저 호출할 함수 (속도 제한용)
+    """
+    session = session or requests.Session()
+    start_str, end_str = start.strftime('%Y%m%d'), end.strftime('%Y%m%d')
+    items, page_no = [], 1
+    while True:
+        if throttle:
+            throttle()
+        response = session.get(url, params=build_params(start_str, end_str, page_no, station), timeout=TIMEOUT)
+        response.raise_for_status()
+        page_items, total = parse_response(response.json())
+        items.extend(page_items)
+        if not page_items or len(items) >= total:
+            break
+        page_no += 1
+    return items_to_frame(items)
+
+
+def existing_dates(csv_path=DATA_PATH):
+    """저장된 날짜의 정렬된 datetime64[D] 배열 (바이너리 캐시 사용)"""
+    if not os.path.exists(csv_path):
+        return np.array([], dtype='datetime64[D]')
+    dates = columnar_cache.load_columns(csv_path)['date']
+    return np.sort(np.asarray(dates))
+
+
+def isin_sorted(sorted_dates, dates):
+    """dates 각각이 정렬된 날짜 배열에 있는지 이진 탐색으로 확인 (O(m log n))"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if len(sorted_dates) == 0:
+        return np.zeros(len(dates), dtype=bool)
+    idx = np.searchsorted(sorted_dates, dates)
+    return sorted_dates[np.minimum(idx, len(sorted_dates) - 1)] == dates
+
+
+def missing_ranges(sorted_dates, start, end):
+    """start~end 중 저장되지 않은 날짜를 연속 구간 [(시작, 끝), ...]으로 반환"""
+    wanted = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    missing = wanted[~isin_sorted(sorted_dates, wanted)]
+    if len(missing) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(missing).astype(int) != 1)
+    starts = np.r_[missing[0], missing[breaks + 1]]
+    ends = np.r_[missing[breaks], missing[-1]]
+    return [(s.astype(object), e.astype(object)) for s, e in zip(starts, ends)]
+
+
+def _to_csv_text(df, header=False):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=header, encoding='utf-8', sep=',', quoting=csv.QUOTE_ALL)
+    return buffer.getvalue()
+
+
+def _write_atomic(csv_path, text):
+    """임시 파일에 쓴 뒤 rename으로 교체 (기존 파일 권한 유지)"""
+    with columnar_cache.atomic_write(csv_path, encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def select_new_rows(df_new, sorted_dates, csv_path=None):
+    """저장할 행만 (아직 없는 날짜 + 품질 검사 통과, 날짜순)
+
+    csv_path를 주면 검사 결과(빠진 날짜와 이유, 통과한 날짜)를 그 CSV의 수집 품질 기록에 반영한다.
+    """
+    new_days = pd.to_datetime(df_new['date']).to_numpy().astype('datetime64[D]')
+    df_new = df_new[~isin_sorted(sorted_dates, new_days)].drop_duplicates('date').sort_values('date')
+    # 품질 검사(기온 범위/순서 등)를 통과하지 못한 행은 저장하지 않음 (다음 수집 때 다시 받음)
+    renamed = df_new.rename(columns=COLUMN_MAPPING)
+    flags = check_rows(renamed)
+    rejected = flags.to_numpy().any(axis=1)
+    if rejected.any():
+        warnings.warn(f"품질 검사 실패 {int(rejected.sum())}행 제외: {', '.join(df_new['date'][rejected])}",
+                      RuntimeWarning)
+    if csv_path is not None:
+        record_rejected(csv_path, renamed, flags, accepted=df_new['date'][~rejected])
+    return df_new[~rejected]
+
+
+def append_rows(df_new, csv_path=DATA_PATH, sorted_dates=None):
+    """품질 검사를 통과한 새 날짜 행만 저장, 추가된 행 수 반환
+
+    모든 새 날짜가 기존 마지막 날짜 이후면 파일 끝에 append하고,
+    그렇지 않으면 정렬된 전체 파일을 임시 파일에 쓴 뒤 rename으로 교체한다.
+    """
+    if sorted_dates is None:
+        sorted_dates = existing_dates(csv_path)
+    df_new = select_new_rows(df_new, sorted_dates, csv_path)
+    if df_new.empty:
+        return 0
+
+    if not os.path.exists(csv_path):
+        _write_atomic(csv_path, _to_csv_text(df_new, header=True))
+    elif len(sorted_dates) == 0 or pd.Timestamp(df_new['date'].iloc[0]) > pd.Timestamp(sorted_dates[-1]):
+        text = _to_csv_text(df_new)
+        with open(csv_path, 'rb+') as f:
+            # 마지막 줄이 개행 없이 끝난 경우 보정
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    text = "\n" + text
+            f.write(text.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        df_existing = pd.read_csv(csv_path, encoding='utf-8', sep=',', dtype=str, keep_default_na=False)
+        df_text = df_new.astype(object).where(df_new.notna(), '').astype(str)
+        df_combined = pd.concat([df_existing, df_text], ignore_index=True)
+        df_combined = df_combined.sort_values('date', kind='stable')
+        _write_atomic(csv_path, _to_csv_text(df_combined[CSV_COLUMNS], header=True))
+    return len(df_new)
+
+
+def ingest(start=None, end=None, station=DEFAULT_STATION, csv_path=DATA_PATH, session=None):
+    """빠진 날짜 구간을 모두 받아와 저장, 추가된 행 수 반환
+
+    start를 생략하면 저장된 첫 날짜부터(파일이 없으면 어제), end를 생략하면 어제까지.
+    그 사이 빈 날짜(품질 검사에서 빠졌던 날짜 포함)를 모두 다시 받는다.
+    """
+    sorted_dates = existing_dates(csv_path)
+    yesterday = (datetime.now() - timedelta(days=1)).date()
+    end = end or yesterday
+    if start is None:
+        start = sorted_dates[0].astype(object) if len(sorted_dates) else yesterday
+
+    session = session or requests.Session()
+    added = 0
+    for range_start, range_end in missing_ranges(sorted_dates, start, end):
+        df_new = select_new_rows(fetch_range(range_start, range_end, station, session), sorted_dates, csv_path)
+        count = append_rows(df_new, csv_path, sorted_dates)
+        # 실제로 저장한 날짜만 반영 (품질 검사에서 빠진 날짜는 빈 날짜로 남김)
+        sorted_dates = np.union1d(sorted_dates, pd.to_datetime(df_new['date']).to_numpy().astype('datetime64[D]'))
+        print(f"✅ {range_start} ~ {range_end}: {count}행 추가")
+        added += count
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기상청 ASOS 일자료 증분 수집")
+    parser.add_argument("--start", type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(), help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=lambda s: datetime.strptime(s, '%Y-%m-%d').date(), help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--station", default=DEFAULT_STATION, help="지점번호 (기본: 143 대구)")
+    parser.add_argument("--csv", help="저장할 CSV (기본: 지점별 경로, 143은 weather_supply.csv)")
+    args = parser.parse_args()
 
-params = {
-    'serviceKey': service_key,
-    'pageNo': '1',
-    'numOfRows': '10',
-    'dataType': 'JSON',
-    'dataCd': 'ASOS',
-    'dateCd': 'DAY',
-    'startDt': yesterday,
-    'endDt': yesterday,
-    'stnIds': '143'  # 대구 지점번호
-}
-
-response = requests.get(url, params=params)
-data = response.json()
-
-result_code = data['response']['header']['resultCode']
-result_msg = data['response']['header']['resultMsg']
-
-if result_code != '00':
-    print(f"API 호출 실패: {result_msg}")
-else:
-    items = data['response']['body']['items']['item']
-    df_new = pd.DataFrame(items)
-    
-    # 필요한 컬럼만 선택하고 영어 컬럼명 적용
-    df_new = df_new[['tm', 'avgTa', 'minTa', 'maxTa']]
-    df_new.rename(columns={'tm': 'date', 'avgTa': 'avg_temp', 'minTa': 'min_temp', 'maxTa': 'max_temp'}, inplace=True)
-    df_new[['avg_temp', 'min_temp', 'max_temp']] = df_new[['avg_temp', 'min_temp', 'max_temp']].astype(float)
-
-    # CSV 파일 경로
-    csv_path = r'D:\1_Project\기온및공급량웹앱\data\weather_supply.csv'
-
-    # 기존 CSV 파일이 존재하면 불러와서 이어붙이기
-    if os.path.exists(csv_path):
-        df_existing = pd.read_csv(csv_path, encoding='utf-8', sep=',', on_bad_lines='skip')
-
-        # CSV 컬럼명 확인 및 '날짜' 컬럼명 변환
-        df_existing.rename(columns={'날짜': 'date'}, inplace=True)
-
-        # 중복 방지
-        if 'date' in df_existing.columns and yesterday_hyphen in df_existing['date'].values:
-            print(f"{yesterday_hyphen} 데이터가 이미 존재합니다.")
-        else:
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-            df_combined.to_csv(csv_path, index=False, encoding='utf-8', sep=',', quoting=1)
-            print(f"✅ {yesterday_hyphen} 데이터 추가 완료! CSV 파일 업데이트 완료.")
+    try:
+        total = ingest(args.start, args.end, args.station, args.csv or station_csv_path(args.station))
+    except ApiError as e:
+        print(e)
     else:
-        # CSV 파일이 없으면 새로 생성 (쉼표 강제 적용)
-        df_new.to_csv(csv_path, index=False, encoding='utf-8', sep=',', quoting=1)
-        print(f"✅ {csv_path} 파일 생성 및 {yesterday_hyphen} 데이터 저장 완료!")
+        print(f"✅ 총 {total}행 추가 완료" if total else "추가할 데이터가 없습니다.")
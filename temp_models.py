@@ -0,0 +1,165 @@
+"""기온 예측 모델(최고/최저기온 → 평균기온) 아티팩트 관리
+
+- 학습 결과는 models/temperature/ 아래에 버전 번호가 붙은 joblib 파일로 저장하고,
+  manifest.json에 파일별 sha256/데이터 버전/sklearn 버전을 기록한다.
+- 불러올 때 해시와 모델 형태(입력 피처 2개, predict 보유)를 확인해 손상된 파일은 건너뛴다.
+- manifest가 없으면 저장소 루트의 기존 pickle(temp_model_linear.pkl 등)을 읽는다.
+- 선형 모델은 online_models의 충분통계량에서 바로 풀고, 랜덤포레스트는 기본적으로 2차원 룩업 격자(compact_forest)로 압축해 저장한다.
+- 재학습은 요청 경로에서 하지 않고, start_retrain()으로 백그라운드 스레드에서 한 번만 실행한다.
+"""
+import hashlib
+import json
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from columnar_cache import atomic_write
+from compact_forest import accuracy_report, compile_forest
+from data_quality import valid_rows
+from data_store import BASE_DIR, dataset_version
+from online_models import temperature_stats
+
+ARTIFACT_DIR = BASE_DIR / "models" / "temperature"
+MANIFEST_PATH = ARTIFACT_DIR / "manifest.json"
+LEGACY_FILES = {'linear': BASE_DIR / 'temp_model_linear.pkl', 'rf': BASE_DIR / 'temp_model_rf.pkl'}
+FEATURES = ['최고기온', '최저기온']
+TARGET = '평균기온'
+MODEL_FACTORIES = {
+    'linear': lambda: LinearRegression(),
+    'rf': lambda: RandomForestRegressor(random_state=42),
+}
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="temp-retrain")
+_retrain_lock = threading.Lock()
+_retrain_future = None
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def current_version():
+    """현재 아티팩트 버전 식별자 (캐시 무효화 키)"""
+    manifest = read_manifest()
+    if manifest:
+        return manifest.get('version', 0)
+    return tuple(
+        (name, path.stat().st_mtime_ns) for name, path in LEGACY_FILES.items() if path.exists()
+    )
+
+
+def _check_model(model):
+    if not hasattr(model, 'predict') or getattr(model, 'n_features_in_', len(FEATURES)) != len(FEATURES):
+        raise ValueError("입력 피처 수가 맞지 않는 모델입니다.")
+    return model
+
+
+def load_models():
+    """(모델 dict, 문제 목록) 반환 - 검증에 실패한 모델은 dict에서 빠진다"""
+    models, problems = {}, []
+    manifest = read_manifest()
+    if manifest:
+        for name, entry in manifest.get('models', {}).items():
+            path = ARTIFACT_DIR / entry['file']
+            try:
+                if _sha256(path) != entry['sha256']:
+                    raise ValueError("파일 해시가 manifest와 다릅니다.")
+                models[name] = _check_model(joblib.load(path))
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+                problems.append(f"{name}: {e}")
+        return models, problems
+
+    for name, path in LEGACY_FILES.items():
+        if not path.exists():
+            problems.append(f"{name}: 모델 파일이 없습니다 ({path.name})")
+            continue
+        try:
+            with open(path, 'rb') as f:
+                models[name] = _check_model(pickle.load(f))
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+            problems.append(f"{name}: {e}")
+    return models, problems
+
+
+def training_rows(data):
+    """품질 검사를 통과하고 입력/목표가 모두 있는 학습 행 (FEATURES + TARGET 컬럼)"""
+    return valid_rows(data)[FEATURES + [TARGET]].dropna()
+
+
+def train_and_save_models(data, compact_rf=True):
+    """두 모델을 학습해 새 버전으로 저장하고 manifest를 원자적으로 교체, 새 manifest 반환
+
+    compact_rf면 랜덤포레스트를 2차원 룩업 격자로 압축해 저장하고
+    원래 모델 대비 정확도 보고서를 manifest에 함께 기록한다.
+    """
+    data_clean = training_rows(data)
+    X_temp = data_clean[FEATURES]
+    y_temp = data_clean[TARGET]
+
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest()
+    version = previous.get('version', 0) + 1
+    entries = {}
+    for name, factory in MODEL_FACTORIES.items():
+        if name == 'linear':
+            # 선형 모델은 충분통계량을 증분 갱신해 두고 다시 풀기만 한다
+            model = temperature_stats(data).all_cells(TARGET)
+        else:
+            model = factory().fit(X_temp, y_temp)
+        extra = {}
+        if name == 'rf' and compact_rf:
+            compact = compile_forest(model, FEATURES)
+            extra = {'format': 'grid', 'accuracy': accuracy_report(model, compact, X_temp)}
+            model = compact
+        filename = f"temp_model_{name}-v{version}.joblib"
+        with atomic_write(ARTIFACT_DIR / filename, 'wb') as f:
+            joblib.dump(model, f)
+        entries[name] = {'file': filename, 'sha256': _sha256(ARTIFACT_DIR / filename), **extra}
+
+    manifest = {
+        'version': version,
+        'dataset': dataset_version(),
+        'sklearn': sklearn.__version__,
+        'trained_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'models': entries,
+    }
+    with atomic_write(MANIFEST_PATH, encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 이전 버전 파일 정리
+    for entry in previous.get('models', {}).values():
+        (ARTIFACT_DIR / entry['file']).unlink(missing_ok=True)
+    return manifest
+
+
+def start_retrain(data):
+    """백그라운드 재학습 시작 (이미 진행 중이면 그 작업을 반환)"""
+    global _retrain_future
+    with _retrain_lock:
+        if _retrain_future is None or _retrain_future.done():
+            _retrain_future = _executor.submit(train_and_save_models, data)
+        return _retrain_future
+
+
+def retrain_future():
+    """진행 중이거나 마지막으로 끝난 재학습 작업 (없으면 None)"""
+    with _retrain_lock:
+        return _retrain_future
@@ -0,0 +1,127 @@
+"""공용 테스트 설정: 프로젝트 루트를 import 경로에 추가하고 합성 일별 데이터와 ASOS API 스텁 서버 제공"""
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_store import add_columns  # noqa: E402
+
+
+@pytest.fixture
+def daily_frame():
+    """(시작일, 종료일, seed) → 합성 일별 데이터프레임을 만드는 함수
+
+    기온은 seed별 난수(0.1℃ 단위), 공급량(M3)은 기온의 2차식 + 잡음(표준편차 1e3),
+    MJ는 M3 × 43이며, data_store.add_columns로 연/월/요일/공휴일/품질이상 컬럼까지 붙인다.
+    """
+    def make(start, end, seed=0):
+        rng = np.random.default_rng(seed)
+        dates = pd.date_range(start, end, freq='D')
+        temp = np.round(rng.uniform(-10, 30, len(dates)), 1)
+        m3 = 1e6 - 3e4 * temp + 200 * temp ** 2 + rng.normal(0, 1e3, len(dates))
+        return add_columns(pd.DataFrame({
+            '날짜': dates,
+            '평균기온': temp,
+            '최고기온': np.round(temp + rng.uniform(2, 8, len(dates)), 1),
+            '최저기온': np.round(temp - rng.uniform(2, 8, len(dates)), 1),
+            '공급량(M3)': m3,
+            '공급량(MJ)': m3 * 43,
+        }))
+
+    return make
+
+
+def fake_temperature(day):
+    """날짜별로 항상 같은 (평균, 최저, 최고) 기온"""
+    avg = round(10 + 10 * ((day.toordinal() % 365) / 365 - 0.5), 1)
+    return avg, round(avg - 5, 1), round(avg + 5, 1)
+
+
+class AsosStub:
+    """기상청 ASOS 일자료 API를 흉내 내는 로컬 HTTP 서버
+
+    - 페이지당 최대 page_cap행만 돌려줌 (numOfRows가 더 커도)
+    - fail_first[(지점, 시작일)] = n이면 그 조각의 처음 n번 요청은 503
+    - delays[(지점, 시작일)] = 초만큼 응답을 늦춤 (조각 완료 순서 뒤섞기용)
+    - overrides[날짜] = (평균, 최저, 최고)로 그날 기온을 바꿈 (품질 검사 실패 재현용)
+    - requests에 (도착 시각, 쿼리) 기록
+    """
+
+    def __init__(self, page_cap=50):
+        self.page_cap = page_cap
+        self.fail_first = {}
+        self.delays = {}
+        self.overrides = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/getWthrDataList"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def handle(self, handler):
+        query = {k: v[0] for k, v in parse_qs(urlparse(handler.path).query).items()}
+        chunk = (query['stnIds'], query['startDt'])
+        with self._lock:
+            self.requests.append((time.monotonic(), query))
+            remaining = self.fail_first.get(chunk, 0)
+            if remaining:
+                self.fail_first[chunk] = remaining - 1
+        time.sleep(self.delays.get(chunk, 0))
+        if remaining:
+            handler.send_response(503)
+            handler.end_headers()
+            return
+
+        start = datetime.strptime(query['startDt'], '%Y%m%d').date()
+        end = datetime.strptime(query['endDt'], '%Y%m%d').date()
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        size = min(int(query['numOfRows']), self.page_cap)
+        page = days[(int(query['pageNo']) - 1) * size:int(query['pageNo']) * size]
+        items = []
+        for day in page:
+            avg, low, high = self.overrides.get(day) or fake_temperature(day)
+            items.append({'tm': day.isoformat(), 'avgTa': str(avg), 'minTa': str(low), 'maxTa': str(high)})
+        body = json.dumps({'response': {
+            'header': {'resultCode': '00', 'resultMsg': 'NORMAL_SERVICE'},
+            'body': {'items': {'item': items}, 'totalCount': len(days)},
+        }}).encode()
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def pages_for(self, station, start_dt):
+        return [q for _, q in self.requests if q['stnIds'] == station and q['startDt'] == start_dt]
+
+
+@pytest.fixture
+def asos_stub(monkeypatch):
+    """스텁 서버를 띄우고 temp_API가 그쪽으로 요청하도록 바꿈"""
+    import temp_API
+
+    stub = AsosStub()
+    stub.thread.start()
+    monkeypatch.setattr(temp_API, 'url', stub.url)
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregate_cube
+import data_store
+from aggregate_cube import build_cube, get_cube
+from data_store import COLUMN_MAPPING, get_daily
+
+RAW_COLUMNS = {name: raw for raw, name in COLUMN_MAPPING.items()}
+
+
+def write_csv(path, frame):
+    raw = frame[list(RAW_COLUMNS)].rename(columns=RAW_COLUMNS)
+    raw['date'] = raw['date'].dt.strftime('%Y-%m-%d')
+    raw['avg_temp'] = raw['avg_temp'].round(1)
+    raw.to_csv(path, index=False)
+    data_store.clear_cache()
+
+
+@pytest.fixture
+def cube_builds(monkeypatch):
+    """큐브 캐시를 테스트마다 비우고, build_cube가 집계한 행 수를 기록"""
+    monkeypatch.setattr(aggregate_cube, '_cache', aggregate_cube.pickle_cache())
+    built = []
+
+    def counted(rows):
+        built.append(len(rows))
+        return build_cube(rows)
+
+    monkeypatch.setattr(aggregate_cube, 'build_cube', counted)
+    return built
+
+
+def assert_cube_is_full_rebuild(path):
+    full = build_cube(get_daily(path))
+    pd.testing.assert_frame_equal(get_cube(path), full, check_dtype=False)
+
+
+def test_appended_days_are_aggregated_incrementally(tmp_path, daily_frame, cube_builds):
+    path = tmp_path / 'weather_supply.csv'
+    data = daily_frame('2023-01-01', '2023-03-31')
+    data.loc[data['날짜'] == '2023-01-15', '공급량(M3)'] = np.nan  # MJ로 보간되는 날
+    write_csv(path, data)
+    get_cube(path)
+    assert cube_builds == [90]
+
+    more = daily_frame('2023-04-01', '2023-04-30', seed=1)
+    more.loc[more['날짜'] == '2023-04-10', '공급량(M3)'] = np.nan
+    write_csv(path, pd.concat([data, more], ignore_index=True))
+
+    assert get_daily(path)['공급량(M3)_보간'].sum() == 2
+    assert_cube_is_full_rebuild(path)
+    assert cube_builds[1] == 30  # 4월 행만 집계
+
+
+def test_changed_existing_day_rebuilds_the_cube(tmp_path, daily_frame, cube_builds):
+    path = tmp_path / 'weather_supply.csv'
+    data = daily_frame('2023-01-01', '2023-03-31')
+    write_csv(path, data)
+    get_cube(path)
+
+    data.loc[data['날짜'] == '2023-02-10', '공급량(M3)'] += 5e4
+    write_csv(path, pd.concat([data, daily_frame('2023-04-01', '2023-04-30', seed=1)], ignore_index=True))
+
+    assert_cube_is_full_rebuild(path)
+    assert cube_builds[1] == 120
+
+
+def test_appended_days_that_change_an_imputed_value_rebuild_the_cube(tmp_path, daily_frame, cube_builds):
+    # 마지막 날의 M3는 열량비(앞뒤 30일 중앙값)로 채워지므로, 열량비가 다른 날이 뒤에 붙으면 값이 바뀜
+    path = tmp_path / 'weather_supply.csv'
+    data = daily_frame('2023-01-01', '2023-03-31')
+    data.loc[data['날짜'] == '2023-03-31', '공급량(M3)'] = np.nan
+    write_csv(path, data)
+    get_cube(path)
+    before = get_daily(path).set_index('날짜').loc['2023-03-31', '공급량(M3)']
+
+    more = daily_frame('2023-04-01', '2023-04-30', seed=1)
+    more['공급량(MJ)'] = more['공급량(M3)'] * 50
+    write_csv(path, pd.concat([data, more], ignore_index=True))
+
+    assert get_daily(path).set_index('날짜').loc['2023-03-31', '공급량(M3)'] != before
+    assert_cube_is_full_rebuild(path)
+    assert cube_builds[1] == 120
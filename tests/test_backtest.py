@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+import online_models
+from backtest import DEFAULT_FEATURE_SET, FILTERS, _run_fold, fold_origins, fold_rows, metric_table, run_backtest
+from calendar_table import WEEKDAY_NAMES
+from features import FEATURE_COLUMNS, FeatureMatrix, build_features, input_features
+from model_registry import ModelRegistry
+from supply_models import FEATURES, MODEL_NAMES, TARGETS, train_models
+
+ALL_DAYS = {'전체': FILTERS['전체']}
+
+
+def feature_matrix(data):
+    dates, values = build_features(data)
+    return FeatureMatrix('test', dates, list(FEATURE_COLUMNS), values)
+
+
+@pytest.fixture
+def data(daily_frame):
+    return daily_frame('2022-10-01', '2024-01-31')
+
+
+def test_fold_models_match_production_models(data, tmp_path, monkeypatch):
+    monkeypatch.setattr(online_models, 'STATS_DIR', tmp_path)
+    monkeypatch.setattr(online_models, '_cache', online_models.pickle_cache())
+    # 2024-01-01 기준 1년 = 운영 필터 2023년 전체와 같은 학습 행
+    train, test = fold_rows(data, pd.Timestamp('2024-01-01'), FILTERS['전체'], 1, feature_matrix(data), FEATURES)
+    assert DEFAULT_FEATURE_SET == '기온+달력' and train['날짜'].dt.year.unique().tolist() == [2023]
+
+    predictions = _run_fold(train[FEATURES].astype('float64'), train[list(TARGETS.values())].to_numpy(dtype='float64'),
+                            test[FEATURES].astype('float64'))
+    production = train_models(data, [2023], list(range(1, 13)), WEEKDAY_NAMES, n_jobs=1)
+
+    X_test = input_features(test['날짜'], test['평균기온'])
+    assert predictions.keys() == production.keys()
+    for key, model in production.items():
+        np.testing.assert_allclose(predictions[key], model.predict(X_test), rtol=1e-6, err_msg=key)
+
+
+def counting_run_fold(monkeypatch):
+    """실제 _run_fold를 감싸 계산한 fold 수를 세는 리스트 반환"""
+    calls = []
+    run_fold = backtest._run_fold
+
+    def counted(X_train, y_train, X_test):
+        calls.append(len(X_test))
+        return run_fold(X_train, y_train, X_test)
+
+    monkeypatch.setattr(backtest, '_run_fold', counted)
+    return calls
+
+
+def test_fold_boundaries_follow_the_origin(data):
+    origins = fold_origins(data, 3)
+    assert origins == list(pd.to_datetime(['2023-11-01', '2023-12-01', '2024-01-01']))
+
+    for origin in origins:
+        train, test = fold_rows(data, origin, FILTERS['전체'], 1, feature_matrix(data), FEATURES)
+        assert train['날짜'].min() == origin - pd.DateOffset(years=1)
+        assert train['날짜'].max() == origin - pd.Timedelta(days=1)
+        assert test['날짜'].min() == origin
+        assert test['날짜'].max() == origin + pd.offsets.MonthEnd(0)
+
+
+def test_month_ahead_sets_ignore_actual_supply_in_the_test_month(data, tmp_path):
+    matrix = feature_matrix(data)
+    changed = data.copy()
+    january = changed['날짜'] >= '2024-01-01'
+    changed.loc[january, '공급량(M3)'] *= 2
+    changed.loc[january, '공급량(MJ)'] *= 2
+
+    def predictions(frame, feature_set):
+        matrix = feature_matrix(frame)
+        errors = run_backtest(frame, 1, 1, ALL_DAYS, n_jobs=1, registry=ModelRegistry(tmp_path),
+                              feature_set=feature_set, matrix=matrix)
+        return errors.sort_values(['모델', '단위', '날짜'])['예측'].to_numpy()
+
+    month_ahead = run_backtest(data, 1, 1, ALL_DAYS, n_jobs=1, registry=ModelRegistry(tmp_path), matrix=matrix)
+    assert (month_ahead['예측범위'] == '1개월 앞').all()
+    # 검증 달의 실제 공급량이 바뀌어도 1개월 앞 예측은 그대로, 전날 공급량을 쓰는 묶음은 달라짐
+    np.testing.assert_array_equal(predictions(data, '기온+달력'), predictions(changed, '기온+달력'))
+    assert not np.array_equal(predictions(data, '확장+전일공급량'), predictions(changed, '확장+전일공급량'))
+
+
+def test_folds_are_cached_per_fold(data, daily_frame, tmp_path, monkeypatch):
+    calls = counting_run_fold(monkeypatch)
+    registry = ModelRegistry(tmp_path)
+    first = run_backtest(data, 2, 1, ALL_DAYS, n_jobs=1, registry=registry, matrix=feature_matrix(data))
+    assert len(calls) == 2
+
+    # 같은 데이터면 모든 fold가 저장소에서 나옴
+    again = run_backtest(data, 2, 1, ALL_DAYS, n_jobs=1, registry=ModelRegistry(tmp_path), matrix=feature_matrix(data))
+    assert len(calls) == 2
+    pd.testing.assert_frame_equal(again, first)
+
+    # 한 달이 늘면 새 달 fold만 계산 (12월 fold는 학습·검증 행이 그대로)
+    longer = pd.concat([data, daily_frame('2024-02-01', '2024-02-29', seed=1)], ignore_index=True)
+    run_backtest(longer, 2, 1, ALL_DAYS, n_jobs=1, registry=registry, matrix=feature_matrix(longer))
+    assert len(calls) == 3 and calls[-1] == 29
+
+
+def test_metric_table_is_months_by_models(data, tmp_path):
+    errors = run_backtest(data, 2, 1, ALL_DAYS, n_jobs=1, registry=ModelRegistry(tmp_path), matrix=feature_matrix(data))
+
+    table = metric_table(errors, '월')
+    assert table.index.tolist() == [1, 12]
+    assert table.columns.tolist() == MODEL_NAMES
+    assert table.notna().all().all()
+    assert metric_table(errors, '날짜유형', 'MAE', unit='mj').columns.tolist() == MODEL_NAMES
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from calendar_table import build_calendar
+
+
+def test_chuseok_on_gaecheonjeol_is_an_anchor():
+    # 2028년 추석은 개천절과 겹쳐 '개천절; 추석'으로 이름이 붙는다
+    calendar = build_calendar().loc['2028-10-02':'2028-10-05']
+
+    assert calendar['공휴일'].tolist() == ['추석 전날', '개천절; 추석', '추석 다음날', '추석 대체 휴일']
+    assert calendar['추석까지'].tolist()[:2] == [1, 0]
+    assert calendar['추석이후'].tolist() == [383, 0, 1, 2]
+    assert calendar.loc[pd.Timestamp('2028-10-05'), '공휴일여부']
+
+
+def test_chuseok_eve_on_gaecheonjeol_is_not_an_anchor():
+    # 2017년은 '개천절; 추석 전날' → 추석 당일은 다음 날(10/4)
+    calendar = build_calendar().loc['2017-10-03':'2017-10-06']
+
+    assert calendar['추석까지'].tolist()[:2] == [1, 0]
+    assert calendar['추석이후'].tolist()[1:] == [0, 1, 2]
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+
+from columnar_cache import FILE_MODE, VersionedCache, atomic_write, make_build_dir, npz_cache, pickle_cache
+from model_registry import ModelRegistry
+
+
+def mode_of(path):
+    return os.stat(path).st_mode & 0o777
+
+
+def test_new_file_is_world_readable(tmp_path):
+    target = tmp_path / "out.json"
+
+    with atomic_write(target, encoding='utf-8') as f:
+        f.write("{}")
+
+    assert target.read_text(encoding='utf-8') == "{}"
+    assert mode_of(target) == FILE_MODE
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_existing_permissions_are_kept(tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_text("old")
+    os.chmod(target, 0o640)
+
+    with atomic_write(target) as f:
+        f.write("new")
+
+    assert target.read_text() == "new"
+    assert mode_of(target) == 0o640
+
+
+def test_failed_write_leaves_original_and_no_temp_file(tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(target) as f:
+            f.write("half")
+            raise RuntimeError("boom")
+
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["data.csv"]
+
+
+def test_build_dir_is_world_readable(tmp_path):
+    assert mode_of(make_build_dir(tmp_path)) == 0o755
+
+
+def test_registry_files_are_readable_by_other_users(tmp_path):
+    registry = ModelRegistry(root=tmp_path)
+
+    registry.save("key", {'weights': np.arange(5)})
+
+    assert mode_of(registry.path_for("key")) == FILE_MODE
+    loaded = ModelRegistry(root=tmp_path).load("key")
+    np.testing.assert_array_equal(loaded['weights'], np.arange(5))
+
+
+def counting(compute):
+    calls = []
+
+    def wrapped(previous):
+        calls.append(previous)
+        return compute(previous)
+    return wrapped, calls
+
+
+def test_versioned_cache_computes_once_per_version(tmp_path):
+    cache = pickle_cache()
+    compute, calls = counting(lambda previous: (previous or 0) + 1)
+    target = tmp_path / "value.pkl"
+
+    assert cache.get(target, 'v1', compute) == 1
+    assert cache.get(target, 'v1', compute) == 1
+    assert cache.get(target, 'v2', compute) == 2  # 이전 값을 받아 증분 갱신
+    assert calls == [None, 1]
+
+
+def test_versioned_cache_reads_disk_from_another_process(tmp_path):
+    target = tmp_path / "arrays.npz"
+    npz_cache().get(target, 'v1', lambda previous: {'a': np.arange(3)})
+
+    compute, calls = counting(lambda previous: {'a': np.zeros(3)})
+    loaded = npz_cache().get(target, 'v1', compute)
+
+    np.testing.assert_array_equal(loaded['a'], np.arange(3))
+    assert calls == []
+    assert mode_of(target) == FILE_MODE
+
+
+def test_versioned_cache_recovers_from_corrupt_file(tmp_path):
+    target = tmp_path / "value.pkl"
+    target.write_bytes(b"not a pickle")
+
+    with pytest.warns(RuntimeWarning, match="읽지 못해"):
+        assert pickle_cache().get(target, 'v1', lambda previous: 'fresh') == 'fresh'
+    assert pickle_cache().get(target, 'v1', lambda previous: 'again') == 'fresh'
+
+
+def test_versioned_cache_warns_when_it_cannot_save(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = VersionedCache(lambda f: None, lambda f, version, value: None)
+
+    with pytest.warns(RuntimeWarning) as record:
+        assert cache.get(blocker / "sub" / "value", 'v1', lambda previous: 42) == 42
+    assert any("저장하지 못했습니다" in str(w.message) for w in record)
+    assert cache.get(blocker / "sub" / "value", 'v1', lambda previous: 0) == 42
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from compact_forest import GridRegressor, compile_forest
+
+FEATURES = ['최고기온', '최저기온']
+
+
+class PlaneModel:
+    """평균기온 = 0.6 × 최고 + 0.4 × 최저 (쌍선형 보간으로 정확히 재현되는 평면)"""
+
+    def predict(self, X):
+        X = np.asarray(X, dtype='float64')
+        return 0.6 * X[:, 0] + 0.4 * X[:, 1]
+
+
+def test_bilinear_interpolation_between_grid_points():
+    # 2 × 2 격자: (0,0)=0, (1,0)=10, (0,1)=20, (1,1)=40
+    grid = GridRegressor(FEATURES, (0.0, 0.0), 1.0, [[0.0, 20.0], [10.0, 40.0]])
+
+    X = pd.DataFrame({'최고기온': [0.0, 1.0, 0.5, 0.5, 0.25], '최저기온': [0.0, 1.0, 0.0, 0.5, 0.75]})
+
+    np.testing.assert_allclose(grid.predict(X), [0.0, 40.0, 5.0, 17.5, 19.375], rtol=1e-6)
+
+
+def test_inputs_outside_the_grid_are_clamped():
+    grid = GridRegressor(FEATURES, (0.0, 0.0), 1.0, [[0.0, 20.0], [10.0, 40.0]])
+
+    np.testing.assert_allclose(grid.predict([[-5.0, -5.0], [9.0, 9.0], [9.0, -3.0]]), [0.0, 40.0, 10.0])
+
+
+def test_compiled_grid_matches_model_on_and_between_grid_points():
+    grid = compile_forest(PlaneModel(), FEATURES, max_range=(-5.0, 5.0), min_range=(-10.0, 0.0))
+
+    X = pd.DataFrame({'최고기온': [-5.0, 0.3, 2.25, 4.99], '최저기온': [-10.0, -7.1, -0.05, -3.333]})
+
+    assert grid.values.shape == (101, 101)
+    np.testing.assert_allclose(grid.predict(X), PlaneModel().predict(X), atol=1e-5)
@@ -0,0 +1,95 @@
+import numpy as np
+
+import daily_charts
+from daily_charts import (
+    HOLIDAY_MARKER_SIZE, lttb_indices, minmax_indices, prepare_daily_series, reduce_series,
+    scatter_indices, thin_labels,
+)
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    y = np.zeros(1000)
+    y[333], y[700] = 50.0, -40.0
+
+    picked = lttb_indices(y, 50)
+
+    assert picked[0] == 0 and picked[-1] == 999
+    assert len(picked) <= 50
+    assert np.all(np.diff(picked) > 0)
+    assert {333, 700} <= set(picked.tolist())
+
+
+def test_lttb_returns_everything_when_small():
+    assert lttb_indices(np.arange(10.0), 20).tolist() == list(range(10))
+    assert lttb_indices(np.arange(10.0), 2).tolist() == list(range(10))
+
+
+def test_lttb_tolerates_missing_values():
+    y = np.linspace(0, 10, 200)
+    y[50:60] = np.nan
+
+    picked = lttb_indices(y, 20)
+
+    assert picked[0] == 0 and picked[-1] == 199
+
+
+def test_minmax_keeps_bucket_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=500)
+    y[123] = 99.0
+    y[456] = -99.0
+    y[10] = np.nan
+
+    picked = minmax_indices(y, 40)
+
+    assert len(picked) <= 40
+    assert {123, 456} <= set(picked.tolist())
+    assert 10 not in picked.tolist()
+
+
+def test_scatter_keeps_one_point_per_cell():
+    x = np.repeat(np.arange(5.0), 100)
+    y = np.tile(np.arange(4.0), 125)
+
+    picked = scatter_indices(x, y, bins=5)
+
+    assert len(picked) == 20  # 5 × 4 칸
+    assert len({(x[i], y[i]) for i in picked}) == 20
+
+
+def test_prepare_daily_series_splits_years_with_cumulative(daily_frame):
+    data = daily_frame('2020-12-30', '2021-01-03')
+    data['공급량(M3)'] = np.arange(len(data), dtype='float64') + 1
+
+    series = prepare_daily_series(data, [2021, 2020, 2019], [1, 12])
+
+    assert [s.year for s in series] == [2021, 2020, 2019]
+    jan, dec, empty = series
+    assert jan.x.tolist() == ['1-1', '1-2', '1-3']
+    assert jan.cumulative.tolist() == [3.0, 7.0, 12.0]
+    assert dec.cumulative.tolist() == [1.0, 3.0]
+    assert jan.texts[0] == '신정연휴' and jan.sizes[0] == HOLIDAY_MARKER_SIZE
+    assert len(empty.x) == 0
+
+
+def test_thin_labels_drops_weekday_labels_first(daily_frame):
+    data = daily_frame('2020-01-01', '2021-12-31')
+    series = prepare_daily_series(data, [2020, 2021], range(1, 13))[0]
+
+    thinned = thin_labels(series, limit=100)
+
+    labels = set(thinned.texts.tolist()) - {''}
+    assert labels and labels <= set(data['공휴일'][data['공휴일여부']])
+    assert thin_labels(series, limit=0).texts.tolist() == [''] * len(series.texts)
+
+
+def test_reduce_series_keeps_arrays_aligned(daily_frame):
+    series = prepare_daily_series(daily_frame('2015-01-01', '2020-12-31'), [2016], range(1, 13))[0]
+
+    reduced = reduce_series(series, 'temperature', 100)
+
+    assert len(reduced.x) <= 100
+    for field in ('temperature', 'supply', 'cumulative', 'texts', 'sizes', 'codes'):
+        assert len(getattr(reduced, field)) == len(reduced.x)
+    assert np.all(np.diff(reduced.codes) > 0)
+    assert reduced.texts.tolist().count('') >= len(reduced.x) - daily_charts.LABEL_DENSITY_LIMIT
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import DAY_AHEAD_SETS, FEATURE_COLUMNS, FEATURE_SETS, INPUT_FEATURES, LAG_FEATURES, build_features, input_features
+
+
+def test_input_features_match_feature_matrix(daily_frame):
+    data = daily_frame('2023-09-01', '2024-03-31')  # 추석·설날 연휴 포함
+
+    dates, values = build_features(data)
+    X = input_features(data['날짜'], data['평균기온'])
+
+    matrix = pd.DataFrame(values, columns=FEATURE_COLUMNS)[INPUT_FEATURES]
+    np.testing.assert_allclose(X.to_numpy(dtype='float64'), matrix.to_numpy(dtype='float64'), rtol=1e-6)
+    assert X['명절연휴'].any() and X['공휴일여부'].any()
+
+
+def test_only_day_ahead_sets_use_actual_supply():
+    for name, columns in FEATURE_SETS.items():
+        assert bool(set(columns) & set(LAG_FEATURES)) == (name in DAY_AHEAD_SETS)
+
+
+def test_input_features_rejects_dates_outside_calendar():
+    with pytest.raises(ValueError, match='달력 범위'):
+        input_features(pd.to_datetime(['1990-01-01']), [1.0])
@@ -0,0 +1,174 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import forecast_service
+from features import INPUT_FEATURES
+from forecast_service import MicroBatcher, ModelCache, validate_supply_request
+from response_tables import build_table
+
+
+class LinearModel:
+    def __init__(self, slope):
+        self.slope = slope
+
+    def predict(self, X):
+        return np.asarray(X, dtype='float64')[:, 0] * self.slope
+
+
+class StubCache:
+    """모델 하나(KNN_m3 = 기온 × 2)만 돌려주는 캐시"""
+
+    def __init__(self):
+        self.models = {'KNN_m3': LinearModel(2.0), 'KNN_mj': LinearModel(3.0)}
+        self.table = build_table(self.models)
+        self.calls = 0
+
+    def supply(self, model_filter=None):
+        self.calls += 1
+        return 'key', self.models, self.table
+
+
+def test_bad_request_does_not_fail_the_batch():
+    batcher = MicroBatcher(StubCache(), window=0.05)
+
+    good = batcher.submit(['2025-01-06', '2025-01-07'], [1.0, 2.0], ['KNN_m3'])
+    with pytest.raises(ValueError, match='nope_m3'):
+        batcher.submit(['2025-01-06'], [3.0], ['nope_m3'])
+    other = batcher.submit(['2025-01-08'], [5.0], ['KNN_mj'])
+
+    np.testing.assert_allclose(good.result(timeout=5)['KNN_m3'], [2.0, 4.0])
+    np.testing.assert_allclose(other.result(timeout=5)['KNN_mj'], [15.0])
+
+
+def test_failed_prediction_only_fails_its_own_request():
+    cache = StubCache()
+    batcher = MicroBatcher(cache, window=0.05)
+    cache.table.names = ['KNN_m3']  # KNN_mj는 응답표에 없음 → 이 요청만 실패
+
+    good = batcher.submit(['2025-01-06'], [1.0], ['KNN_m3'])
+    bad = batcher.submit(['2025-01-06'], [1.0], ['KNN_mj'])
+
+    np.testing.assert_allclose(good.result(timeout=5)['KNN_m3'], [2.0])
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+
+
+@pytest.mark.parametrize('dates, temps, names, model_filter', [
+    (['2025-01-06'], [[1.0, 2.0]], None, None),
+    (['2025-01-06'], [float('nan')], None, None),
+    (['2025-01-06'], ['warm'], None, None),
+    (['2025-01-06'], [1.0, 2.0], None, None),
+    (['someday'], [1.0], None, None),
+    (['1990-01-01'], [1.0], None, None),
+    (['2025-01-06'], [1.0], ['KNN_m3', 'nope'], None),
+    (['2025-01-06'], [1.0], None, {'weeks': [1]}),
+    (['2025-01-06'], [1.0], None, {'months': [13]}),
+    (['2025-01-06'], [1.0], None, {'days': ['Mon']}),
+    (['2025-01-06'], [1.0], None, {'years': []}),
+])
+def test_validate_rejects_bad_requests(dates, temps, names, model_filter):
+    with pytest.raises(ValueError):
+        validate_supply_request(dates, temps, names, model_filter)
+
+
+def test_validate_normalizes_filter():
+    X, names, model_filter = validate_supply_request(['2025-01-06'], [1], None, {'years': ['2024'], 'months': [1.0]})
+
+    assert list(X.columns) == INPUT_FEATURES
+    assert X['평균기온'].dtype == np.float64
+    assert X['요일_월'].tolist() == [True]
+    assert names == forecast_service.SUPPLY_KEYS
+    assert model_filter == {'years': [2024], 'months': [1]}
+
+
+def test_model_cache_reloads_data_when_version_changes(monkeypatch):
+    state = {'version': 'v1', 'years': [2020, 2021, 2022]}
+    monkeypatch.setattr(forecast_service, 'dataset_version', lambda: state['version'])
+    monkeypatch.setattr(forecast_service, 'get_daily', lambda: pd.DataFrame({'연': state['years']}))
+    monkeypatch.setattr(forecast_service.temp_models, 'load_models', lambda: ({}, []))
+    trained = []
+    monkeypatch.setattr(
+        forecast_service, 'get_trained_models',
+        lambda data, years, months, days: trained.append(list(data['연'])) or {'KNN_m3': LinearModel(1.0)},
+    )
+    monkeypatch.setattr(forecast_service, 'get_response_table', lambda key, models: None)
+    keys = []
+    monkeypatch.setattr(forecast_service, 'registry_key', lambda years, months, days, version: keys.append(version) or version)
+
+    cache = ModelCache(version_ttl=0)
+    assert cache.supply()[0] == 'v1'
+    cache.supply()
+    state.update(version='v2', years=[2021, 2022, 2023])
+    assert cache.supply()[0] == 'v2'
+
+    assert trained == [[2020, 2021, 2022], [2021, 2022, 2023]]
+    assert cache.default_filter['years'] == [2021, 2022, 2023]
+
+
+def test_model_cache_rejects_untrained_filters(monkeypatch):
+    monkeypatch.setattr(forecast_service, 'dataset_version', lambda: 'v1')
+    monkeypatch.setattr(forecast_service, 'get_daily', lambda: pd.DataFrame({'연': [2022, 2023, 2024]}))
+    monkeypatch.setattr(forecast_service.temp_models, 'load_models', lambda: ({}, []))
+
+    def no_training(*args):
+        raise AssertionError("기본 조건이 아닌데 학습함")
+
+    monkeypatch.setattr(forecast_service, 'get_trained_models', no_training)
+    monkeypatch.setattr(forecast_service, 'get_registry', lambda: type('Empty', (), {'load': lambda self, key: None})())
+
+    with pytest.raises(ValueError, match='학습된 모델'):
+        ModelCache().supply({'years': [2023]})
+
+
+def test_lone_request_does_not_wait_for_the_batch_window():
+    batcher = MicroBatcher(StubCache(), window=1.0)
+
+    start = time.monotonic()
+    future = batcher.submit(['2025-01-06'], [1.0], ['KNN_m3'])
+    np.testing.assert_allclose(future.result(timeout=5)['KNN_m3'], [2.0])
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_model_cache_checks_dataset_version_once_per_ttl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(forecast_service, 'dataset_version', lambda: calls.append(1) or 'v1')
+    monkeypatch.setattr(forecast_service, 'get_daily', lambda: pd.DataFrame({'연': [2024]}))
+    monkeypatch.setattr(forecast_service, 'get_trained_models', lambda *args: {'KNN_m3': LinearModel(1.0)})
+    monkeypatch.setattr(forecast_service, 'get_response_table', lambda key, models: None)
+
+    cache = ModelCache(version_ttl=60)
+    for _ in range(5):
+        cache.supply()
+
+    assert len(calls) == 1
+
+
+def test_temperature_models_load_lazily(monkeypatch):
+    loads = []
+    monkeypatch.setattr(forecast_service.temp_models, 'load_models', lambda: loads.append(1) or ({'linear': LinearModel(0.5)}, []))
+    monkeypatch.setattr(forecast_service, 'dataset_version', lambda: pytest.fail("공급량 모델 준비를 시작함"))
+
+    service = forecast_service.ForecastService(warm=False)
+    assert loads == []
+    np.testing.assert_allclose(service.temperature([4.0], [0.0])['linear'], [2.0])
+    with pytest.raises(ValueError, match='같은 길이'):
+        service.temperature([4.0, 5.0], [0.0])
+    assert loads == [1]
+
+
+def test_temperature_cli_rejects_mismatched_lengths():
+    root = Path(forecast_service.__file__).parent
+    result = subprocess.run(
+        [sys.executable, 'forecast_service.py', 'temperature', '--max', '5', '6', '--min', '1'],
+        cwd=root, capture_output=True, text=True, timeout=60,
+    )
+
+    assert result.returncode == 2
+    assert '--max와 --min' in result.stderr
@@ -0,0 +1,47 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from hourly_store import SUPPLY_M3, TEMP, daily_rollup, monthly_rollup, read_month, write_hourly
+
+
+def test_write_hourly_splits_months(tmp_path):
+    hours = pd.date_range('2020-01-31 22:00', periods=4, freq='h').to_numpy()
+
+    assert write_hourly(hours, TEMP, [1, 2, 3, 4], root=tmp_path) == 2
+
+    january, february = read_month(2020, 1, root=tmp_path), read_month(2020, 2, root=tmp_path)
+    assert january.shape == (31 * 24, 3) and february.shape == (29 * 24, 3)
+    assert january[-2:, TEMP].tolist() == [1, 2]
+    assert february[:2, TEMP].tolist() == [3, 4]
+    assert np.isnan(february[2:, TEMP]).all()
+
+
+def test_daily_rollup_ignores_missing_hours(tmp_path):
+    hours = pd.date_range('2020-03-01', periods=48, freq='h').to_numpy()
+    temps = np.r_[np.arange(24.0), np.full(24, np.nan)]
+    temps[5] = np.nan
+    write_hourly(hours, TEMP, temps, root=tmp_path)
+    write_hourly(hours[:24], SUPPLY_M3, np.full(24, 10.0), root=tmp_path)
+
+    daily = daily_rollup(date(2020, 3, 1), date(2020, 3, 2), root=tmp_path)
+
+    first, second = daily.iloc[0], daily.iloc[1]
+    assert first['최고기온'] == 23 and first['최저기온'] == 0
+    assert first['평균기온'] == round((276 - 5) / 23, 1)
+    assert first['공급량(M3)'] == 240
+    assert np.isnan(second['평균기온']) and np.isnan(second['공급량(M3)'])
+
+
+def test_monthly_rollup_keeps_months_without_supply_missing(tmp_path):
+    january = pd.date_range('2021-01-01', periods=24, freq='h').to_numpy()
+    february = pd.date_range('2021-02-01', periods=24, freq='h').to_numpy()
+    write_hourly(january, SUPPLY_M3, np.ones(24), root=tmp_path)
+    write_hourly(np.r_[january, february], TEMP, np.full(48, 3.0), root=tmp_path)
+
+    monthly = monthly_rollup(date(2021, 1, 1), date(2021, 2, 28), root=tmp_path).set_index('월')
+
+    assert monthly.loc[1, '공급량_M3'] == 24
+    assert np.isnan(monthly.loc[2, '공급량_M3'])
+    assert monthly.loc[2, '평균기온'] == 3.0
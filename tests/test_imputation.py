@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+import imputation
+from imputation import calorific_ratio, fill_short_gaps, impute_columns
+
+
+def days(start, n):
+    return np.arange(np.datetime64(start), np.datetime64(start) + n)
+
+
+def test_fill_short_gaps_interpolates_by_date_distance():
+    dates = np.array(['2020-01-01', '2020-01-02', '2020-01-03', '2020-01-05'], dtype='datetime64[D]')
+    values = np.array([0.0, np.nan, np.nan, 8.0])
+
+    filled, mask = fill_short_gaps(dates, values, max_gap=3)
+
+    # 1/4는 행이 없어도 날짜 간격으로 보간: 1/2 → 2.0, 1/3 → 4.0
+    assert filled.tolist() == [0.0, 2.0, 4.0, 8.0]
+    assert mask.tolist() == [False, True, True, False]
+
+
+def test_fill_short_gaps_leaves_long_gaps_and_edges():
+    values = np.array([np.nan, 1.0, np.nan, np.nan, np.nan, np.nan, 6.0, np.nan])
+
+    filled, mask = fill_short_gaps(days('2020-01-01', 8), values, max_gap=3)
+
+    assert not mask.any()
+    np.testing.assert_array_equal(np.isnan(filled), np.isnan(values))
+
+
+def test_calorific_ratio_uses_neighbouring_days():
+    dates = days('2020-01-01', 10)
+    m3 = np.full(10, 100.0)
+    mj = np.full(10, 4200.0)
+    m3[4] = np.nan
+
+    ratio = calorific_ratio(dates, m3, mj, window=5, min_periods=2)
+
+    np.testing.assert_allclose(ratio, 42.0)
+
+
+def test_impute_columns_fills_supply_from_the_other_unit():
+    n = 20
+    columns = {
+        'date': days('2020-01-01', n)[::-1],  # 정렬되지 않은 입력
+        'avg_temp': np.linspace(0, 19, n).astype('float32'),
+        'max_temp': np.full(n, 25, dtype='float32'),
+        'min_temp': np.full(n, -5, dtype='float32'),
+        'supply_m3': np.full(n, 100.0),
+        'supply_mj': np.full(n, 4200.0),
+    }
+    columns['supply_m3'][3] = np.nan    # 날짜순으로 16번째
+    columns['supply_mj'][10] = np.nan   # 날짜순으로 9번째
+    columns['avg_temp'][5] = np.nan
+
+    out = impute_columns(columns)
+
+    assert (np.diff(out['date']).astype(int) == 1).all()
+    assert out['supply_m3'][16] == 100.0 and out['supply_m3_mask'][16]
+    assert out['supply_mj'][9] == 4200.0 and out['supply_mj_mask'][9]
+    assert out['supply_m3_mask'].sum() == 1 and out['supply_mj_mask'].sum() == 1
+    assert out['avg_temp_mask'][14] and not np.isnan(out['avg_temp'][14])
+
+
+def test_apply_fills_frame_and_adds_masks(tmp_path):
+    csv_path = tmp_path / "weather.csv"
+    avg_temp = np.arange(1.0, 11.0)
+    avg_temp[1] = np.nan
+    supply_m3 = np.full(10, 100.0)
+    supply_m3[2] = np.nan
+    pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=10).strftime('%Y-%m-%d'),
+        'avg_temp': avg_temp,
+        'max_temp': 12.0,
+        'min_temp': -4.0,
+        'supply_mj': 4200.0,
+        'supply_m3': supply_m3,
+    }).to_csv(csv_path, index=False)
+    df = pd.DataFrame({
+        '날짜': pd.to_datetime(['2020-01-02', '2020-01-03']),
+        '평균기온': [np.nan, 3.0],
+        '최고기온': [6.0, 6.0],
+        '최저기온': [-4.0, -4.0],
+        '공급량(M3)': [100.0, np.nan],
+        '공급량(MJ)': [4200.0, 4200.0],
+    })
+
+    out = imputation.apply(df, csv_path)
+
+    assert out['평균기온'].tolist() == [2.0, 3.0]
+    assert out['공급량(M3)'].tolist() == [100.0, 100.0]
+    assert out['평균기온_보간'].tolist() == [True, False]
+    assert out['공급량(M3)_보간'].tolist() == [False, True]
+    assert np.isnan(df.loc[0, '평균기온'])  # 원본은 그대로
@@ -0,0 +1,41 @@
+import os
+from datetime import datetime
+
+from openpyxl import Workbook
+
+import ingest_excel
+from data_store import read_csv
+
+
+def write_workbook(path):
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = ingest_excel.EXCEL_SHEET
+    sheet.append(['날짜', '비고', '평균기온', '최고기온', '최저기온', '공급량(M3)', '공급량(MJ)'])
+    sheet.append([datetime(2025, 1, 1), 'x', -1.5, 3.0, -6.0, 1000.0, 43000.0])
+    sheet.append([datetime(2025, 1, 2), None, 0.5, None, -4.0, None, 42000.0])
+    sheet.append([None, '합계', None, None, None, 1000.0, 85000.0])
+    wb.save(path)
+
+
+def test_ensure_converted_builds_missing_csv_and_skips_fresh_one(tmp_path, monkeypatch):
+    excel, output = tmp_path / 'supply.xlsx', tmp_path / 'supply_excel.csv'
+    write_workbook(excel)
+
+    ingest_excel.ensure_converted(excel, output)
+
+    df = read_csv(output)
+    assert df['날짜'].tolist() == ['2025-01-01', '2025-01-02']
+    assert df['공급량(M3)'].isna().tolist() == [False, True]
+    assert df.loc[0, '공급량(MJ)'] == 43000.0
+
+    calls = []
+    monkeypatch.setattr(ingest_excel, 'convert', lambda *args: calls.append(args))
+    ingest_excel.ensure_converted(excel, output)
+    assert calls == []
+
+    # 엑셀이 더 새로우면 다시 변환
+    newer = os.stat(output).st_mtime_ns + 10**9
+    os.utime(excel, ns=(newer, newer))
+    ingest_excel.ensure_converted(excel, output)
+    assert calls == [(excel, output)]
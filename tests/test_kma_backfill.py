@@ -0,0 +1,99 @@
+import asyncio
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+import requests
+
+import kma_backfill
+import temp_API
+from conftest import fake_temperature
+
+
+@pytest.fixture
+def station_csvs(tmp_path, monkeypatch):
+    """지점 CSV를 임시 디렉토리에 쓰도록 경로를 바꿈"""
+    path_for = lambda station: tmp_path / f"weather_{station}.csv"
+    monkeypatch.setattr(kma_backfill, 'station_csv_path', path_for)
+    monkeypatch.setattr(kma_backfill, 'BACKOFF_BASE', 0.01)
+    return path_for
+
+
+def read_dates(path):
+    return pd.read_csv(path)['date'].tolist()
+
+
+def test_fetch_range_follows_pages(asos_stub):
+    df = temp_API.fetch_range(date(2020, 1, 1), date(2020, 4, 30), '143')
+
+    assert len(df) == 121
+    assert df['date'].is_monotonic_increasing
+    assert [q['pageNo'] for q in asos_stub.pages_for('143', '20200101')] == ['1', '2', '3']
+    avg, low, high = fake_temperature(date(2020, 2, 15))
+    row = df[df['date'] == '2020-02-15'].iloc[0]
+    assert (row['avg_temp'], row['min_temp'], row['max_temp']) == (avg, low, high)
+
+
+def test_backfill_retries_5xx_with_backoff(asos_stub, station_csvs):
+    asos_stub.fail_first[('143', '20200101')] = 2
+
+    added = asyncio.run(kma_backfill.backfill(['143'], date(2020, 1, 1), date(2020, 3, 31), rate=100))
+
+    assert added == {'143': 91}
+    first_page = [q for q in asos_stub.pages_for('143', '20200101') if q['pageNo'] == '1']
+    assert len(first_page) == 3  # 503 두 번 + 성공
+    assert len(read_dates(station_csvs('143'))) == 91
+
+
+def test_backfill_gives_up_after_max_retries(asos_stub, station_csvs):
+    asos_stub.fail_first[('143', '20200101')] = kma_backfill.MAX_RETRIES + 1
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(kma_backfill.backfill(['143'], date(2020, 1, 1), date(2020, 1, 31), rate=100))
+    assert not station_csvs('143').exists()
+
+
+def test_token_bucket_limits_request_rate():
+    async def take(n):
+        bucket = kma_backfill.TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 첫 토큰은 바로, 나머지 10개는 초당 20개씩
+    assert asyncio.run(take(11)) >= 0.45
+
+
+def test_backfill_respects_rate_limit(asos_stub, station_csvs):
+    asyncio.run(kma_backfill.backfill(['143', '108'], date(2018, 1, 1), date(2021, 1, 31), concurrency=8, rate=10))
+
+    arrivals = sorted(t for t, _ in asos_stub.requests)
+    assert len(arrivals) > 10
+    # 토큰 버킷 용량(=rate)만큼 한꺼번에 나간 뒤에는 초당 rate개를 넘지 않음
+    span = arrivals[-1] - arrivals[0]
+    assert span >= (len(arrivals) - 10) / 10 * 0.9
+
+
+def test_backfill_appends_chunks_in_date_order(asos_stub, station_csvs):
+    # 앞 연도 조각이 가장 늦게 끝나도 파일에는 날짜 순서대로 쌓여야 함
+    asos_stub.delays[('143', '20190101')] = 0.5
+
+    added = asyncio.run(kma_backfill.backfill(['143'], date(2019, 1, 1), date(2021, 12, 31), concurrency=4, rate=100))
+
+    dates = read_dates(station_csvs('143'))
+    assert added == {'143': len(dates)} and len(dates) == 365 + 366 + 365
+    assert dates == sorted(dates)
+    assert len(set(dates)) == len(dates)
+
+
+def test_backfill_only_requests_missing_ranges(asos_stub, station_csvs):
+    asyncio.run(kma_backfill.backfill(['143'], date(2020, 1, 1), date(2020, 1, 31), rate=100))
+    asos_stub.requests.clear()
+
+    added = asyncio.run(kma_backfill.backfill(['143'], date(2020, 1, 1), date(2020, 2, 29), rate=100))
+
+    assert added == {'143': 29}
+    assert {q['startDt'] for _, q in asos_stub.requests} == {'20200201'}
+    assert read_dates(station_csvs('143')) == sorted(read_dates(station_csvs('143')))
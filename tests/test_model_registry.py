@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+def test_corrupt_file_is_a_miss_and_gets_rebuilt(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    registry.path_for('k').write_bytes(b'not a joblib file')
+
+    with pytest.warns(RuntimeWarning, match='읽지 못해'):
+        assert registry.get_or_create('k', lambda: {'model': 1}) == {'model': 1}
+
+    assert ModelRegistry(tmp_path).load('k') == {'model': 1}
+
+
+def test_load_survives_lru_touch_permission_error(tmp_path, monkeypatch):
+    ModelRegistry(tmp_path).save('k', [1, 2, 3])
+
+    def denied(*args, **kwargs):
+        raise PermissionError("다른 사용자의 파일")
+
+    monkeypatch.setattr(os, 'utime', denied)
+    assert ModelRegistry(tmp_path).load('k') == [1, 2, 3]
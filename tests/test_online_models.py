@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+import online_models
+from features import input_features
+from online_models import SufficientStats, get_stats, linear_design, poly_design, supply_design, supply_stats
+
+
+def poly_stats():
+    return SufficientStats(['평균기온'], ['공급량(M3)'], poly_design)
+
+
+def lstsq(phi, y):
+    return np.linalg.lstsq(phi, y, rcond=None)[0]
+
+
+def test_solve_matches_direct_least_squares_for_selected_cells(daily_frame):
+    data = daily_frame('2020-01-01', '2021-12-31')
+    stats = poly_stats()
+    stats.refresh(data)
+
+    coef = stats.solve([2021], [1, 2], [5, 6], '공급량(M3)')
+
+    rows = data[(data['연'] == 2021) & data['월'].isin([1, 2]) & data['요일코드'].isin([5, 6])]
+    expected = lstsq(poly_design(rows['평균기온']), rows['공급량(M3)'].to_numpy())
+    np.testing.assert_allclose(coef, expected, rtol=1e-6)
+
+
+def test_supply_stats_use_calendar_features(tmp_path, monkeypatch, daily_frame):
+    monkeypatch.setattr(online_models, 'STATS_DIR', tmp_path)
+    monkeypatch.setattr(online_models, '_cache', online_models.pickle_cache())
+    data = daily_frame('2021-01-01', '2021-12-31')
+    data['공급량(M3)'] += np.where(data['요일코드'] >= 5, -2e5, 0)
+    data['공급량(MJ)'] = data['공급량(M3)'] * 43
+
+    model = supply_stats(data).all_cells('공급량(M3)')
+
+    X = input_features(data['날짜'], data['평균기온'])
+    np.testing.assert_allclose(model.coef_, lstsq(supply_design(X), data['공급량(M3)'].to_numpy()), rtol=1e-6)
+    np.testing.assert_allclose(model.predict(X), data['공급량(M3)'], atol=5e3)  # 잡음 표준편차 1e3
+
+
+def test_linear_design_all_cells(daily_frame):
+    data = daily_frame('2021-01-01', '2021-06-30')
+    stats = SufficientStats(['최고기온', '최저기온'], ['평균기온'], linear_design)
+    stats.refresh(data)
+
+    model = stats.all_cells('평균기온')
+
+    X = data[['최고기온', '최저기온']].to_numpy()
+    np.testing.assert_allclose(model.coef_, lstsq(linear_design(X), data['평균기온'].to_numpy()), rtol=1e-6)
+    assert model.predict(X[:3]).shape == (3,)
+
+
+def test_refresh_adds_new_rows_and_replaces_changed_ones(daily_frame):
+    data = daily_frame('2021-01-01', '2021-03-31')
+    stats = poly_stats()
+    assert stats.refresh(data.iloc[:60]) == (60, 0)
+
+    changed = data.copy()
+    changed.loc[10, '공급량(M3)'] += 5e4
+    changed.loc[20, '품질이상'] = True  # 품질이상이 된 행은 빠져야 함
+
+    assert stats.refresh(changed) == (len(data) - 60 + 1, 2)
+
+    fresh = poly_stats()
+    fresh.refresh(changed)
+    np.testing.assert_allclose(stats.xtx, fresh.xtx, atol=1e-6)
+    np.testing.assert_allclose(stats.xty, fresh.xty, rtol=1e-9, atol=1e-3)
+    np.testing.assert_array_equal(stats.count, fresh.count)
+
+
+def test_refresh_is_noop_for_same_data(daily_frame):
+    data = daily_frame('2021-01-01', '2021-02-28')
+    stats = poly_stats()
+    stats.refresh(data)
+
+    assert stats.refresh(data) == (0, 0)
+
+
+def test_solve_raises_for_empty_selection(daily_frame):
+    stats = poly_stats()
+    stats.refresh(daily_frame('2021-01-01', '2021-01-31'))
+
+    with pytest.raises(ValueError):
+        stats.solve([2021], [7], [0, 1, 2], '공급량(M3)')
+    with pytest.raises(ValueError):
+        poly_stats().all_cells('공급량(M3)')
+
+
+def test_cell_index_rejects_out_of_range_years():
+    with pytest.raises(ValueError):
+        SufficientStats.cell_index([1999], [1], [0])
+
+
+def test_get_stats_follows_the_data_passed_in(tmp_path, monkeypatch, daily_frame):
+    monkeypatch.setattr(online_models, 'STATS_DIR', tmp_path)
+    monkeypatch.setattr(online_models, '_cache', online_models.pickle_cache())
+    full = daily_frame('2021-01-01', '2021-03-31')
+    args = (['평균기온'], ['공급량(M3)'], poly_design)
+
+    stats = get_stats('test', full.iloc[:31], *args)
+    assert len(stats.dates) == 31
+    assert get_stats('test', full.iloc[:31], *args) is stats
+
+    assert len(get_stats('test', full, *args).dates) == len(full)
+    assert (tmp_path / 'test.joblib').exists()
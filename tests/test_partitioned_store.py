@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import partitioned_store
+
+
+def write_csv(path, start, end, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq='D')
+    avg = np.round(rng.uniform(-5, 30, len(dates)), 1)
+    df = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'avg_temp': avg,
+        'max_temp': avg + 5,
+        'min_temp': avg - 5,
+        'supply_mj': np.round(rng.uniform(1e8, 3e8, len(dates))),
+        'supply_m3': np.round(rng.uniform(2e6, 7e6, len(dates))),
+    })
+    # 파티션 안에서 다시 날짜순으로 정렬되는지 보려고 뒤섞어 저장
+    df.sample(frac=1, random_state=seed).to_csv(path, index=False)
+    return df
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    csv_path = tmp_path / "weather_999.csv"
+    monkeypatch.setattr(partitioned_store, 'station_csv_path', lambda station: csv_path)
+    root = tmp_path / "partitions"
+    root.mkdir()
+    return csv_path, root
+
+
+def test_read_selects_years_months_and_columns(store):
+    csv_path, root = store
+    source = write_csv(csv_path, '2019-01-01', '2021-12-31')
+
+    df = partitioned_store.read('999', years=[2020, 2021], months=[2, 12], columns=['공급량(M3)'], root=root)
+
+    dates = pd.to_datetime(source['date'])
+    expected = source[dates.dt.year.isin([2020, 2021]) & dates.dt.month.isin([2, 12])].sort_values('date')
+    assert list(df.columns) == ['날짜', '공급량(M3)']
+    assert pd.DatetimeIndex(df['날짜']).strftime('%Y-%m-%d').tolist() == expected['date'].tolist()
+    np.testing.assert_array_equal(df['공급량(M3)'].to_numpy(), expected['supply_m3'].to_numpy())
+
+
+def test_index_records_month_ranges(store):
+    csv_path, root = store
+    write_csv(csv_path, '2020-01-01', '2020-12-31')
+
+    entry = partitioned_store.ensure('999', root)
+
+    year = entry['years']['2020']
+    assert year['rows'] == 366
+    assert year['months']['2'] == [31, 60]
+    assert (year['start'], year['end']) == ('2020-01-01', '2020-12-31')
+
+
+def test_unknown_year_gives_empty_frame(store):
+    csv_path, root = store
+    write_csv(csv_path, '2020-01-01', '2020-03-31')
+
+    df = partitioned_store.read('999', years=[1999], root=root)
+
+    assert len(df) == 0 and list(df.columns) == partitioned_store.BASE_COLUMNS
+
+
+def test_changed_csv_rewrites_only_changed_years(store):
+    csv_path, root = store
+    source = write_csv(csv_path, '2019-01-01', '2021-12-31')
+    before = partitioned_store.ensure('999', root)
+
+    source.loc[source['date'] == '2020-06-15', 'supply_m3'] = 1.0
+    source.to_csv(csv_path, index=False)
+    written, total = partitioned_store.build_station('999', root)
+
+    after = partitioned_store._read_index(root)['stations']['999']
+    assert (written, total) == (1, 3)
+    assert after['years']['2019']['dir'] == before['years']['2019']['dir']
+    assert after['years']['2020']['dir'] != before['years']['2020']['dir']
+    assert not (root / before['years']['2020']['dir']).exists()
+    df = partitioned_store.read('999', years=[2020], months=[6], root=root)
+    assert df.loc[df['날짜'] == '2020-06-15', '공급량(M3)'].item() == 1.0
+
+
+def test_partitions_are_readable_by_other_users(store):
+    csv_path, root = store
+    write_csv(csv_path, '2020-01-01', '2020-01-31')
+
+    entry = partitioned_store.ensure('999', root)
+
+    part = root / entry['years']['2020']['dir']
+    assert os.stat(part).st_mode & 0o777 == 0o755
+    assert os.stat(root / partitioned_store.INDEX_NAME).st_mode & 0o777 == 0o644
+
+
+def test_index_update_rereads_the_index_under_the_lock(store):
+    csv_path, root = store
+    write_csv(csv_path, '2020-01-01', '2020-01-31')
+    partitioned_store.build_station('1', root)
+
+    with partitioned_store._index_lock(root):
+        worker = threading.Thread(target=partitioned_store.build_station, args=('2', root))
+        worker.start()
+        worker.join(0.5)
+        assert worker.is_alive()  # 잠금이 풀릴 때까지 색인을 고치지 않음
+        # 그 사이 다른 프로세스가 색인을 고친 것처럼
+        index = partitioned_store._read_index(root)
+        index['stations']['3'] = index['stations']['1']
+        partitioned_store._write_index(index, root)
+    worker.join()
+
+    assert sorted(partitioned_store._read_index(root)['stations']) == ['1', '2', '3']
+
+
+def build_repeatedly(station, root):
+    for _ in range(5):
+        partitioned_store.build_station(station, root)
+
+
+def test_concurrent_processes_keep_every_station(store):
+    csv_path, root = store
+    write_csv(csv_path, '2020-01-01', '2020-03-31')
+
+    # fork라 자식 프로세스도 station_csv_path 대체를 그대로 씀
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=build_repeatedly, args=(str(i), root)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    assert sorted(partitioned_store._read_index(root)['stations']) == ['0', '1', '2', '3']
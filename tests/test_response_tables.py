@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from features import input_features
+from response_tables import build_table, predict
+from scenario_forecast import forecast
+
+
+class CalendarModel:
+    """기온 × 2 + 토요일 100 + 공휴일 1000"""
+
+    def predict(self, X):
+        return X['평균기온'].to_numpy() * 2 + X['요일_토'].to_numpy() * 100.0 + X['공휴일여부'].to_numpy() * 1000.0
+
+
+def test_table_matches_model_per_calendar_profile():
+    models = {'KNN_m3': CalendarModel()}
+    table = build_table(models)
+    # 평일, 토요일, 공휴일(3/1) + 격자 밖 기온 하나
+    X = input_features(pd.to_datetime(['2024-02-28', '2024-03-02', '2024-03-01', '2024-03-04']), [1.25, -3.0, 7.1, 55.0])
+
+    result = predict(table, models, X, ['KNN_m3'])
+
+    np.testing.assert_allclose(result['KNN_m3'], [2.5, 94.0, 1014.2, 110.0])
+    assert table.in_range(X).tolist() == [True, True, True, False]
+
+
+def test_scenario_forecast_uses_dates_and_matches_direct_prediction():
+    models = {'KNN_m3': CalendarModel()}
+    dates = pd.date_range('2024-02-28', periods=5, freq='D')
+    scenarios = np.array([[0.0, 1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0, 1.0]])
+
+    result = forecast(models, scenarios, dates)
+
+    for i, temps in enumerate(scenarios):
+        expected = CalendarModel().predict(input_features(dates, temps))
+        np.testing.assert_allclose(result.values[i, :, 0], expected)
+    np.testing.assert_allclose(forecast(models, scenarios, dates, table=build_table(models)).values, result.values)
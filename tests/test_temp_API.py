@@ -0,0 +1,56 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import temp_API
+from data_quality import rejected_days
+
+
+def stored_dates(csv_path):
+    return pd.read_csv(csv_path)['date'].tolist()
+
+
+def test_missing_ranges_groups_consecutive_days():
+    stored = np.array(['2020-01-02', '2020-01-03', '2020-01-06'], dtype='datetime64[D]')
+
+    ranges = temp_API.missing_ranges(stored, date(2020, 1, 1), date(2020, 1, 8))
+
+    assert ranges == [
+        (date(2020, 1, 1), date(2020, 1, 1)),
+        (date(2020, 1, 4), date(2020, 1, 5)),
+        (date(2020, 1, 7), date(2020, 1, 8)),
+    ]
+
+
+def test_ingest_appends_new_days_in_order(asos_stub, tmp_path):
+    csv_path = tmp_path / "weather.csv"
+
+    assert temp_API.ingest(date(2020, 1, 1), date(2020, 1, 10), '143', csv_path) == 10
+    assert temp_API.ingest(end=date(2020, 1, 20), station='143', csv_path=csv_path) == 10
+
+    dates = stored_dates(csv_path)
+    assert dates == sorted(dates) and len(dates) == 20
+    assert {q['startDt'] for _, q in asos_stub.requests} == {'20200101', '20200111'}
+
+
+def test_rejected_days_are_fetched_again(asos_stub, tmp_path):
+    csv_path = tmp_path / "weather.csv"
+    asos_stub.overrides[date(2020, 1, 5)] = (10.0, 20.0, 0.0)  # 최저 > 최고
+
+    with pytest.warns(RuntimeWarning, match='품질 검사 실패 1행 제외: 2020-01-05'):
+        assert temp_API.ingest(date(2020, 1, 1), date(2020, 1, 10), '143', csv_path) == 9
+    assert '2020-01-05' not in stored_dates(csv_path)
+    rejected = rejected_days(csv_path)
+    assert list(rejected) == ['2020-01-05'] and rejected['2020-01-05']['checks'] == ['기온순서']
+    assert rejected['2020-01-05']['values']['최저기온'] == 20.0
+
+    asos_stub.overrides.clear()
+    asos_stub.requests.clear()
+    assert temp_API.ingest(end=date(2020, 1, 12), station='143', csv_path=csv_path) == 3
+
+    dates = stored_dates(csv_path)
+    assert dates == sorted(dates) and len(dates) == 12
+    assert sorted(q['startDt'] for _, q in asos_stub.requests) == ['20200105', '20200111']
+    assert rejected_days(csv_path) == {}
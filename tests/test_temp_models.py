@@ -0,0 +1,62 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import temp_models
+from compact_forest import GridRegressor
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(temp_models, 'ARTIFACT_DIR', tmp_path)
+    monkeypatch.setattr(temp_models, 'MANIFEST_PATH', tmp_path / 'manifest.json')
+    return tmp_path
+
+
+def write_artifacts(root, models):
+    entries = {}
+    for name, model in models.items():
+        filename = f"temp_model_{name}-v1.joblib"
+        joblib.dump(model, root / filename)
+        entries[name] = {'file': filename, 'sha256': temp_models._sha256(root / filename)}
+    (root / 'manifest.json').write_text(json.dumps({'version': 1, 'models': entries}), encoding='utf-8')
+
+
+def grid():
+    return GridRegressor(temp_models.FEATURES, (0.0, 0.0), 1.0, np.zeros((2, 2)))
+
+
+def test_manifest_models_load_when_hashes_match(artifact_dir):
+    write_artifacts(artifact_dir, {'linear': grid(), 'rf': grid()})
+
+    models, problems = temp_models.load_models()
+
+    assert sorted(models) == ['linear', 'rf'] and problems == []
+
+
+def test_tampered_artifact_is_skipped(artifact_dir):
+    write_artifacts(artifact_dir, {'linear': grid(), 'rf': grid()})
+    with open(artifact_dir / 'temp_model_rf-v1.joblib', 'ab') as f:
+        f.write(b'\0')
+
+    models, problems = temp_models.load_models()
+
+    assert list(models) == ['linear']
+    assert len(problems) == 1 and problems[0].startswith('rf:') and '해시' in problems[0]
+
+
+def test_training_rows_drop_quality_flagged_days():
+    data = pd.DataFrame({
+        '최고기온': [5.0, 6.0, 7.0, None],
+        '최저기온': [-1.0, 0.0, 1.0, 2.0],
+        '평균기온': [2.0, 3.0, 40.0, 3.0],
+        '품질이상': [False, False, True, False],
+    })
+
+    rows = temp_models.training_rows(data)
+
+    assert rows.index.tolist() == [0, 1]
+    assert list(rows.columns) == temp_models.FEATURES + [temp_models.TARGET]
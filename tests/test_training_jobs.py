@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+import training_jobs
+from model_registry import ModelRegistry
+from training_jobs import TrainingQueue
+
+
+def wait(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, "작업이 끝나지 않음"
+        time.sleep(0.01)
+    return job
+
+
+@pytest.fixture
+def fake_training(monkeypatch):
+    """get_trained_models 대신 호출을 기록하고, release가 set될 때까지 기다리는 가짜 학습"""
+    state = {'calls': [], 'release': threading.Event(), 'fail': set()}
+    state['release'].set()
+
+    def train(data, years, months, days, force=False, registry=None, on_result=None):
+        state['calls'].append((tuple(years), force))
+        state['release'].wait(5)
+        if tuple(years) in state['fail']:
+            raise RuntimeError("학습 실패")
+        on_result('KNN_m3', None, 1, 1)
+        return {'years': list(years)}
+
+    monkeypatch.setattr(training_jobs, 'get_trained_models', train)
+    monkeypatch.setattr(training_jobs, 'registry_key', lambda years, months, days: f"key-{sorted(years)}")
+    return state
+
+
+def test_same_filter_trains_once(tmp_path, fake_training):
+    queue = TrainingQueue(registry=ModelRegistry(tmp_path))
+    fake_training['release'].clear()
+
+    first = queue.submit(None, [2024], [1], ['월'])
+    second = queue.submit(None, [2024], [1], ['월'])
+    fake_training['release'].set()
+
+    assert second is first
+    assert wait(first).status == 'done'
+    assert queue.submit(None, [2024], [1], ['월']) is first
+    assert fake_training['calls'] == [((2024,), False)]
+
+
+def test_force_resubmits_a_finished_job(tmp_path, fake_training):
+    queue = TrainingQueue(registry=ModelRegistry(tmp_path))
+    first = wait(queue.submit(None, [2024], [1], ['월']))
+
+    forced = wait(queue.submit(None, [2024], [1], ['월'], force=True))
+
+    assert forced is not first and forced.status == 'done'
+    assert fake_training['calls'] == [((2024,), False), ((2024,), True)]
+    assert queue.get(first.job_id) is forced
+
+
+def test_registry_hit_completes_without_training(tmp_path, fake_training):
+    registry = ModelRegistry(tmp_path)
+    registry.save('key-[2023]', {'cached': True})
+
+    job = TrainingQueue(registry=registry).submit(None, [2023], [1], ['월'])
+
+    assert job.status == 'done' and job.result == {'cached': True}
+    assert fake_training['calls'] == []
+
+
+def test_failed_job_keeps_latest_completed(tmp_path, fake_training):
+    queue = TrainingQueue(registry=ModelRegistry(tmp_path))
+    fake_training['fail'].add((2025,))
+    assert queue.latest_completed() is None
+
+    good = wait(queue.submit(None, [2024], [1], ['월']))
+    bad = wait(queue.submit(None, [2025], [1], ['월']))
+
+    assert bad.status == 'failed' and bad.error == "RuntimeError: 학습 실패"
+    assert queue.latest_completed() is good
+    # 실패한 작업은 force 없이 다시 요청해도 새로 학습
+    wait(queue.submit(None, [2025], [1], ['월']))
+    assert fake_training['calls'].count(((2025,), False)) == 2
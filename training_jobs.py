@@ -0,0 +1,129 @@
+"""공급량 모델 백그라운드 학습 작업 큐
+
+Streamlit 스크립트 본문에서 학습을 돌리면 페이지 전체가 멈추고,
+학습 중 재실행되면 작업이 버려진다. 이 모듈은 프로세스 공용 스레드
+풀에서 학습을 돌리고 작업 ID(=모델 저장소 키)로 상태를 조회하게 한다.
+- 같은 조건의 요청은 하나의 작업으로 합쳐진다 (여러 세션이 동시에 요청해도 1회 학습)
+- 진행률(완료 모델 수)을 페이지에서 폴링할 수 있다
+- 새 모델이 학습되는 동안 가장 최근에 끝난 모델을 계속 쓸 수 있다
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from model_registry import get_registry
+from supply_models import MODEL_FACTORIES, TARGETS, get_trained_models, registry_key
+
+# 각 작업이 내부에서 loky 프로세스 풀로 모델을 병렬 학습하므로 작업 자체는 하나씩 실행
+MAX_CONCURRENT_JOBS = 1
+KEEP_FINISHED_JOBS = 32
+
+
+@dataclass
+class TrainingJob:
+    """학습 작업 상태"""
+    job_id: str
+    params: dict
+    status: str = 'queued'  # queued → running → done / failed
+    done: int = 0
+    total: int = len(MODEL_FACTORIES) * len(TARGETS)
+    last_model: str = ""
+    result: dict = None
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    finished_at: float = None
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+
+class TrainingQueue:
+    """작업 ID 기준으로 중복을 합치는 백그라운드 학습 큐"""
+
+    def __init__(self, max_workers=MAX_CONCURRENT_JOBS, registry=None):
+        self.registry = registry or get_registry()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="training")
+        self._jobs = {}
+        self._latest = None
+        self._lock = threading.Lock()
+
+    def submit(self, data, years, months, days, force=False):
+        """학습 요청 등록 후 작업 반환 (같은 조건의 미완료 작업이 있으면 그 작업 반환)"""
+        job_id = registry_key(years, months, days)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and (not job.finished or (job.status == 'done' and not force)):
+                return job
+            job = TrainingJob(job_id, {'years': list(years), 'months': list(months), 'days': list(days)})
+            self._jobs[job_id] = job
+            self._trim()
+
+        # 저장소에 이미 있으면 스레드를 거치지 않고 바로 완료 처리
+        if not force:
+            models = self.registry.load(job_id)
+            if models is not None:
+                self._complete(job, models)
+                return job
+
+        self._executor.submit(self._run, job, data, force)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest_completed(self):
+        """가장 최근에 학습이 끝난 작업 (없으면 None)"""
+        with self._lock:
+            return self._latest
+
+    def _run(self, job, data, force):
+        job.status = 'running'
+
+        def on_result(key, model, done, total):
+            job.done, job.total, job.last_model = done, total, key
+
+        try:
+            models = get_trained_models(
+                data, job.params['years'], job.params['months'], job.params['days'],
+                force=force, registry=self.registry, on_result=on_result,
+            )
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = 'failed'
+            job.finished_at = time.time()
+        else:
+            self._complete(job, models)
+
+    def _complete(self, job, models):
+        job.result = models
+        job.done = job.total
+        job.status = 'done'
+        job.finished_at = time.time()
+        with self._lock:
+            self._latest = job
+
+    def _trim(self):
+        """완료된 오래된 작업 기록 정리"""
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(self._jobs) - KEEP_FINISHED_JOBS)]:
+            self._jobs.pop(job.job_id, None)
+
+
+_default_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """프로세스 공용 학습 큐 (모든 세션이 공유)"""
+    global _default_queue
+    with _queue_lock:
+        if _default_queue is None:
+            _default_queue = TrainingQueue()
+        return _default_queue